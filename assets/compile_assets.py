@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+compile_assets.py
+Offline step that pre-bakes slide-ready team assets into assets/compiled/
+- Fan images are circle-cropped (crop_circle.crop_to_circle), sized for their 5"
+  placement on the demographic overview slide, flattened onto the white slide
+  and saved as JPEG
+- Team logos are sized for their 2.2" height on the title slide and saved as PNG
+Writes assets/compiled/manifest.json keyed by team (read by utils/asset_manifest.py).
+Sources that haven't changed since the last run are skipped unless --force is given.
+"""
+
+from pathlib import Path
+from PIL import Image
+import argparse
+import json
+import re
+import sys
+from datetime import datetime
+
+import yaml
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from crop_circle import crop_to_circle
+from utils.asset_manifest import team_asset_key
+from utils.image_budget import TARGET_IMAGE_DPI, IMAGE_JPEG_QUALITY
+
+# Placed sizes in inches (DemographicOverviewSlide._add_fan_image, TitleSlide._add_team_logo)
+FAN_IMAGE_INCHES = 5.0
+TEAM_LOGO_HEIGHT_INCHES = 2.2
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+
+
+def _display_name(stem):
+    """'UtahJazz' / 'utah_jazz' -> 'Utah Jazz' (used for teams not in team_config.yaml)"""
+    if '_' in stem:
+        return ' '.join(word.capitalize() for word in stem.split('_'))
+    return re.sub(r'(?<=[a-z])(?=[A-Z])', ' ', stem)
+
+
+def find_team_sources(project_root):
+    """
+    Collect the source fan image and team logo for every team
+
+    Returns:
+        Dict of manifest key -> {'team_name', 'fan_source', 'logo_source'}
+    """
+    project_root = Path(project_root)
+    logos_dir = project_root / 'assets' / 'logos'
+    teams = {}
+
+    def team(name):
+        return teams.setdefault(team_asset_key(name), {'team_name': name})
+
+    for path in sorted((logos_dir / 'fans').glob('*_Fanpic.*')):
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            team(_display_name(path.stem.replace('_Fanpic', '')))['fan_source'] = path
+
+    for path in sorted((logos_dir / 'teams').glob('*')):
+        if path.suffix.lower() in IMAGE_EXTENSIONS:
+            entry = team(_display_name(path.stem))
+            entry['logo_source'] = path
+            entry['team_name'] = _display_name(path.stem)
+
+    # Configured teams keep their official names
+    config_path = project_root / 'config' / 'team_config.yaml'
+    if config_path.exists():
+        with open(config_path) as f:
+            configured = yaml.safe_load(f).get('teams', {})
+        for team_config in configured.values():
+            if team_config.get('team_name'):
+                team(team_config['team_name'])['team_name'] = team_config['team_name']
+
+    return teams
+
+
+def compile_fan_image(source, output_path):
+    """Circle-crop a fan photo, size it for the slide and save it as JPEG on white"""
+    target = round(FAN_IMAGE_INCHES * TARGET_IMAGE_DPI)
+
+    img = crop_to_circle(Image.open(source))
+    if img.width > target:
+        img = img.resize((target, target), Image.Resampling.LANCZOS)
+
+    flattened = Image.new('RGB', img.size, (255, 255, 255))
+    flattened.paste(img, mask=img.getchannel('A'))
+    flattened.save(output_path, 'JPEG', quality=IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+    return flattened.size
+
+
+def compile_team_logo(source, output_path):
+    """Size a team logo for the title slide, keeping transparency"""
+    target_height = round(TEAM_LOGO_HEIGHT_INCHES * TARGET_IMAGE_DPI)
+
+    img = Image.open(source).convert('RGBA')
+    if img.height > target_height:
+        width = max(1, round(img.width * target_height / img.height))
+        img = img.resize((width, target_height), Image.Resampling.LANCZOS)
+
+    img.save(output_path, 'PNG')
+    return img.size
+
+
+def compile_assets(project_root=None, output_dir=None, force=False):
+    """
+    Compile every team's assets and write the manifest
+
+    Args:
+        project_root: Path to project root (None = parent of this assets folder)
+        output_dir: Where to write compiled assets (None = assets/compiled)
+        force: Recompile even if sources are unchanged
+
+    Returns:
+        The manifest dict
+    """
+    project_root = Path(project_root) if project_root else Path(__file__).resolve().parent.parent
+    output_dir = Path(output_dir) if output_dir else project_root / 'assets' / 'compiled'
+    manifest_path = output_dir / 'manifest.json'
+
+    previous = {}
+    if manifest_path.exists() and not force:
+        with open(manifest_path) as f:
+            previous = json.load(f).get('teams', {})
+
+    compiled = {'fan': 0, 'logo': 0, 'skipped': 0, 'failed': 0}
+    teams = {}
+
+    for key, sources in sorted(find_team_sources(project_root).items()):
+        entry = {'team_name': sources['team_name']}
+        old = previous.get(key, {})
+
+        for kind, source_key, subdir, suffix, compile_fn in (
+                ('fan_image', 'fan_source', 'fans', '.jpg', compile_fan_image),
+                ('team_logo', 'logo_source', 'teams', '.png', compile_team_logo)):
+            source = sources.get(source_key)
+            if source is None:
+                continue
+
+            relative = f"{subdir}/{key}{suffix}"
+            output_path = output_dir / relative
+            source_name = str(source.relative_to(project_root))
+            source_mtime = source.stat().st_mtime
+
+            if (old.get(kind) == relative and old.get(f'{kind}_source') == source_name
+                    and old.get(f'{kind}_source_mtime') == source_mtime and output_path.exists()):
+                entry.update({k: v for k, v in old.items() if k.startswith(kind)})
+                compiled['skipped'] += 1
+                continue
+
+            try:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                size = compile_fn(source, output_path)
+            except Exception as e:
+                print(f"❌ Error compiling {source.name}: {str(e)}")
+                compiled['failed'] += 1
+                continue
+
+            entry.update({
+                kind: relative,
+                f'{kind}_source': source_name,
+                f'{kind}_source_mtime': source_mtime,
+                f'{kind}_size': list(size),
+                f'{kind}_bytes': output_path.stat().st_size
+            })
+            compiled['fan' if kind == 'fan_image' else 'logo'] += 1
+            print(f"✅ {sources['team_name']}: {source.name} -> {relative} "
+                  f"({size[0]}x{size[1]}, {output_path.stat().st_size / 1024:.0f} KB)")
+
+        teams[key] = entry
+
+    manifest = {
+        'generated': datetime.now().isoformat(),
+        'target_dpi': TARGET_IMAGE_DPI,
+        'teams': teams
+    }
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"\n📦 {len(teams)} teams: compiled {compiled['fan']} fan images and {compiled['logo']} logos, "
+          f"{compiled['skipped']} unchanged, {compiled['failed']} failed")
+    print(f"📄 Manifest: {manifest_path}")
+    return manifest
+
+
+def main():
+    """Main function with command line interface"""
+    parser = argparse.ArgumentParser(
+        description='Pre-bake slide-ready fan images and team logos into assets/compiled'
+    )
+
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Recompile every asset even if its source is unchanged'
+    )
+
+    parser.add_argument(
+        '--project-root',
+        type=str,
+        help='Path to project root directory'
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        help='Output directory (default: assets/compiled)'
+    )
+
+    args = parser.parse_args()
+    compile_assets(args.project_root, args.output_dir, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
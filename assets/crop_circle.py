@@ -25,6 +25,65 @@ def create_circular_mask(size):
     return mask
 
 
+def crop_to_circle(img, size=None):
+    """
+    Crop an in-memory image into a circle with transparent background
+
+    Args:
+        img: PIL Image
+        size: Tuple of (width, height) for output size (None = keep original)
+
+    Returns:
+        Square RGBA image with the circle mask applied
+    """
+    img = img.convert('RGBA')
+
+    # Resize if requested
+    if size:
+        # Calculate the aspect ratio preserving resize
+        aspect = min(size[0] / img.width, size[1] / img.height)
+        new_size = (int(img.width * aspect), int(img.height * aspect))
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+
+        # Create a new image with the exact requested size
+        final_img = Image.new('RGBA', size, (0, 0, 0, 0))
+        # Paste the resized image in the center
+        x = (size[0] - new_size[0]) // 2
+        y = (size[1] - new_size[1]) // 2
+        final_img.paste(img, (x, y))
+        img = final_img
+
+    # Get the size for the mask
+    mask_size = img.size
+
+    # Make it square (crop to center)
+    if mask_size[0] != mask_size[1]:
+        # Find the smaller dimension
+        min_dim = min(mask_size)
+
+        # Calculate crop box to center the square
+        left = (mask_size[0] - min_dim) // 2
+        top = (mask_size[1] - min_dim) // 2
+        right = left + min_dim
+        bottom = top + min_dim
+
+        # Crop to square
+        img = img.crop((left, top, right, bottom))
+        mask_size = (min_dim, min_dim)
+
+    # Create circular mask
+    mask = create_circular_mask(mask_size)
+
+    # Create output image with transparent background
+    output = Image.new('RGBA', mask_size, (0, 0, 0, 0))
+    output.paste(img, (0, 0))
+
+    # Apply the circular mask
+    output.putalpha(mask)
+
+    return output
+
+
 def crop_image_circular(image_path, output_path=None, size=None, backup=True):
     """
     Crop an image into a circle with transparent background
@@ -49,48 +108,8 @@ def crop_image_circular(image_path, output_path=None, size=None, backup=True):
         img = Image.open(image_path).convert('RGBA')
         original_size = img.size
 
-        # Resize if requested
-        if size:
-            # Calculate the aspect ratio preserving resize
-            aspect = min(size[0] / img.width, size[1] / img.height)
-            new_size = (int(img.width * aspect), int(img.height * aspect))
-            img = img.resize(new_size, Image.Resampling.LANCZOS)
-
-            # Create a new image with the exact requested size
-            final_img = Image.new('RGBA', size, (0, 0, 0, 0))
-            # Paste the resized image in the center
-            x = (size[0] - new_size[0]) // 2
-            y = (size[1] - new_size[1]) // 2
-            final_img.paste(img, (x, y))
-            img = final_img
-
-        # Get the size for the mask
-        mask_size = img.size
-
-        # Make it square (crop to center)
-        if mask_size[0] != mask_size[1]:
-            # Find the smaller dimension
-            min_dim = min(mask_size)
-
-            # Calculate crop box to center the square
-            left = (mask_size[0] - min_dim) // 2
-            top = (mask_size[1] - min_dim) // 2
-            right = left + min_dim
-            bottom = top + min_dim
-
-            # Crop to square
-            img = img.crop((left, top, right, bottom))
-            mask_size = (min_dim, min_dim)
-
-        # Create circular mask
-        mask = create_circular_mask(mask_size)
-
-        # Create output image with transparent background
-        output = Image.new('RGBA', mask_size, (0, 0, 0, 0))
-        output.paste(img, (0, 0))
-
-        # Apply the circular mask
-        output.putalpha(mask)
+        output = crop_to_circle(img, size)
+        mask_size = output.size
 
         # Determine output path
         if output_path is None:
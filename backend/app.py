@@ -43,9 +43,12 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from flask import Flask, request, jsonify, send_file, Response, send_from_directory
 from flask_cors import CORS
+import atexit
 import threading
 import queue
+import time
 import uuid
+import multiprocessing
 import matplotlib
 
 # Configure matplotlib BEFORE importing pyplot
@@ -67,10 +70,14 @@ from utils.font_manager import font_manager
 from utils.cache_manager import CacheManager  # Add CacheManager import
 
 from utils.team_config_manager import TeamConfigManager
-from report_builder.pptx_builder import PowerPointBuilder
-from data_processors.snowflake_connector import test_connection
+from data_processors.snowflake_connector import (test_connection, warm_pool, close_pool, get_pool_metrics,
+                                                 get_connection_health, start_health_monitor)
 from data_processors.merchant_ranker import MerchantRanker
 from postgresql_job_store import PostgreSQLJobStore
+from job_executor import JobExecutor, QueueFullError, JOB_EXECUTOR_MODE, parse_priority
+from job_worker import build_report, process_job
+from progress_bus import ProgressBus, RESYNC_EVENT, PROGRESS_BUS_NOTIFY, is_terminal
+from hot_brands import HotBrandsPreviewCache, HOT_BRANDS_PREWARM
 
 import os
 
@@ -128,8 +135,20 @@ def initialize_app():
         # Continue running even if fonts fail to load
 
 
-# Initialize fonts at module level (when app starts)
-initialize_app()
+# Spawned job processes run job_worker.process_job and never need app.py, but
+# if one imports it anyway (e.g. as __mp_main__ under `python app.py`) it must
+# not start the app's services
+is_main_process = multiprocessing.current_process().name == 'MainProcess'
+
+if is_main_process:
+    # Initialize fonts at module level (when app starts)
+    initialize_app()
+
+    # Snowflake pool lives as long as the app: warm it in the background now,
+    # close it at shutdown (jobs borrow connections and never close the pool)
+    warm_pool()
+    start_health_monitor()
+    atexit.register(close_pool)
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
@@ -179,12 +198,48 @@ except Exception as e:
         def list_recent_jobs(self, limit=100):
             return list(self.jobs.values())[:limit]
 
+        def enqueue_job(self, job_id, priority=0, owner=None):
+            return self.update_job(job_id, status='queued', priority=priority, queue_position=None,
+                                   progress=0, message='Waiting in queue...')
+
+        def claim_job(self, job_id, owner=None):
+            job = self.jobs.get(job_id)
+            if not job or job.get('status') != 'queued':
+                return False
+            job.update(status='running', queue_position=None)
+            return True
+
+        def heartbeat_jobs(self, job_ids, owner):
+            return 0
+
+        def adopt_stale_jobs(self, owner, stale_seconds):
+            return []  # nothing survives a restart in memory, and only this process holds jobs
+
 
     job_store = InMemoryJobStore()
     logger.warning("Using in-memory job store as fallback")
 
-# Keep job_queues for SSE
-job_queues = {}  # job_id -> queue for progress updates
+# Job executor mode (the executor itself is created below)
+use_process_workers = JOB_EXECUTOR_MODE == 'process'
+if use_process_workers and not isinstance(job_store, PostgreSQLJobStore):
+    logger.warning("JOB_EXECUTOR_MODE=process needs the PostgreSQL job store; using worker threads")
+    use_process_workers = False
+
+# Progress bus for SSE: update_job publishes, progress streams subscribe.
+# Spawned job processes can only reach this process's streams through NOTIFY,
+# so process mode turns it on
+progress_bus = ProgressBus()
+if use_process_workers and not PROGRESS_BUS_NOTIFY and is_main_process:
+    logger.info("JOB_EXECUTOR_MODE=process: relaying job progress through PostgreSQL NOTIFY")
+if (PROGRESS_BUS_NOTIFY or use_process_workers) and is_main_process:
+    if isinstance(job_store, PostgreSQLJobStore):
+        progress_bus.enable_notify(job_store.database_url)
+    else:
+        logger.warning("PROGRESS_BUS_NOTIFY needs the PostgreSQL job store; progress stays in-process")
+
+# SSE streams write a heartbeat when idle and re-read the job from the store now and then
+SSE_HEARTBEAT_SECONDS = 15
+SSE_RESYNC_SECONDS = 60
 
 
 class JobManager:
@@ -208,9 +263,6 @@ class JobManager:
             **options  # Include all options
         })
 
-        # Create progress queue for this job (keep in memory for SSE)
-        job_queues[job_id] = queue.Queue()
-
         return job_id
 
     @staticmethod
@@ -220,110 +272,46 @@ class JobManager:
         success = job_store.update_job(job_id, **kwargs)
 
         if success:
-            # Send update to queue if exists (for SSE)
-            if job_id in job_queues:
-                try:
-                    job_queues[job_id].put_nowait(kwargs)
-                except queue.Full:
-                    pass
+            # Push to any open progress streams
+            progress_bus.publish(job_id, kwargs)
 
 
 def generate_pptx_worker(job_id: str, team_key: str, options: dict):
     """Worker function to generate PowerPoint in background with real progress tracking"""
+    # Register this job for progress tracking
+    register_active_job(job_id, JobManager)
     try:
-        # Register this job for progress tracking
-        register_active_job(job_id, JobManager)
-
-        # Step 1: Load team configuration (5%)
-        JobManager.update_job(job_id,
-                              status='running',
-                              progress=5,
-                              message='Loading team configuration...')
-
-        config_manager = TeamConfigManager()
-        team_config = config_manager.get_team_config(team_key)
-
-        JobManager.update_job(job_id,
-                              team_name=team_config['team_name'],
-                              progress=8,
-                              message=f'Loaded configuration for {team_config["team_name"]}')
-
-        # Step 2: Test database connection (10%)
-        JobManager.update_job(job_id,
-                              progress=10,
-                              message='Connecting to Snowflake database...')
-
-        if not test_connection():
-            raise Exception("Failed to connect to Snowflake")
-
-        JobManager.update_job(job_id,
-                              progress=15,
-                              message='Database connection established successfully')
-
-        # Step 3: Initialize PowerPoint builder (20%)
-        JobManager.update_job(job_id,
-                              progress=20,
-                              message='Initializing PowerPoint builder...')
-
-        def progress_callback(progress: int, message: str):
-            """Callback to update job progress from PowerPointBuilder"""
-            JobManager.update_job(job_id, progress=progress, message=message)
-            logger.debug(f"Progress callback: {progress}% - {message}")
-
-        # Pass job_id, cache_manager, AND progress_callback to PowerPointBuilder
-        builder = PowerPointBuilder(
-            team_key,
-            job_id=job_id,
-            cache_manager=cache_manager,
-            progress_callback=progress_callback
-        )
-
-        # Step 4: Build presentation
-        # The builder will now update progress from 25% to 90%
-        output_path = builder.build_presentation(
-            include_custom_categories=not options.get('skip_custom', False),
-            custom_category_count=options.get('custom_count'),
-            category_mode=options.get('category_mode', 'standard'),
-            custom_categories=options.get('custom_categories')
-        )
-
-        # Step 5: Finalize (90-100%)
-        JobManager.update_job(job_id,
-                              progress=90,
-                              message='Finalizing presentation...')
+        build_report(job_id, team_key, options, JobManager.update_job, cache_manager)
+    finally:
+        # Always unregister the job when done
+        unregister_active_job(job_id)
 
-        # Ensure output_path is a Path object
-        output_path = Path(output_path)
 
-        JobManager.update_job(job_id,
-                              progress=95,
-                              message='Saving presentation metadata...')
+def report_queue_position(job_id: str, position: int):
+    """Push a waiting job's queue position to its progress stream"""
+    JobManager.update_job(job_id,
+                          queue_position=position,
+                          message=f'Waiting in queue (position {position})...')
 
-        # Store both the file path and directory for better tracking
-        JobManager.update_job(job_id,
-                              status='completed',
-                              progress=100,
-                              message='PowerPoint generated successfully!',
-                              completed_at=datetime.now().isoformat(),
-                              output_file=str(output_path),
-                              output_dir=str(output_path.parent))
 
-        logger.info(f"Job {job_id} completed. Output file: {output_path}")
+# Bounded job executor; the queue is persisted in the job store
+# Spawned workers get job_worker.process_job, which sets up its own job store and cache
+job_executor = JobExecutor(process_job if use_process_workers else generate_pptx_worker,
+                           job_store,
+                           use_processes=use_process_workers,
+                           on_position=report_queue_position)
 
-    except Exception as e:
-        logger.error(f"Job {job_id} failed: {str(e)}")
-        logger.error(traceback.format_exc())
+# Hot-brands previews are computed once per team and refreshed in the background
+hot_brands_cache = HotBrandsPreviewCache(cache_manager=cache_manager)
 
-        JobManager.update_job(job_id,
-                              status='failed',
-                              progress=0,
-                              message='Generation failed',
-                              error=str(e),
-                              completed_at=datetime.now().isoformat())
+# Only the main process runs the queue
+if is_main_process:
+    job_executor.start()
+    job_executor.recover()
+    atexit.register(job_executor.shutdown)
 
-    finally:
-        # Always unregister the job when done
-        unregister_active_job(job_id)
+    if HOT_BRANDS_PREWARM:
+        hot_brands_cache.prewarm()
 
 
 # ===== FRONTEND SERVING ROUTES =====
@@ -390,6 +378,10 @@ def health_check():
             'database': 'connected',
             'cache': cache_status,
             'jobs': stats,
+            'snowflake': get_pool_metrics(),
+            'snowflake_connection': get_connection_health(),
+            'job_queue': job_executor.stats(),
+            'progress_streams': progress_bus.stats(),
             'timestamp': datetime.now().isoformat()
         })
     except Exception as e:
@@ -535,6 +527,12 @@ def generate_report():
         if team_key not in config_manager.list_teams():
             return jsonify({'error': f'Team {team_key} not found'}), 404
 
+        # Validate priority before a job exists for it
+        try:
+            priority = parse_priority(data.get('priority'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
         # Create job
         options = {
             'skip_custom': data.get('skip_custom', False),
@@ -545,18 +543,19 @@ def generate_report():
 
         job_id = JobManager.create_job(team_key, options)
 
-        # Start background worker
-        thread = threading.Thread(
-            target=generate_pptx_worker,
-            args=(job_id, team_key, options),
-            daemon=True
-        )
-        thread.start()
+        # Queue for the bounded worker pool
+        try:
+            position = job_executor.submit(job_id, team_key, options, priority=priority)
+        except QueueFullError as e:
+            JobManager.update_job(job_id, status='failed', error=str(e), message='Server busy',
+                                  completed_at=datetime.now().isoformat())
+            return jsonify({'job_id': job_id, 'error': str(e)}), 503
 
         return jsonify({
             'job_id': job_id,
-            'status': 'started',
-            'message': 'Generation started'
+            'status': 'queued',
+            'queue_position': position,
+            'message': 'Generation queued'
         })
 
     except Exception as e:
@@ -674,63 +673,55 @@ def get_job_progress_stream(job_id):
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
+    def send(data):
+        return f"data: {json.dumps(data, default=str)}\n\n".encode('utf-8')
+
     def generate():
-        # Send initial status immediately
-        initial_job = job_store.get_job(job_id)
-        if initial_job:
-            yield f"data: {json.dumps(initial_job)}\n\n".encode('utf-8')
+        # Subscribe before reading the job so no update falls in between
+        subscription = progress_bus.subscribe(job_id)
+        try:
+            current_job = job_store.get_job(job_id)
+            if not current_job:
+                yield send({'error': 'Job not found'})
+                return
+
+            # Send initial status immediately
+            yield send(current_job)
+            last_sync = time.time()
 
-        # Get the queue for this job
-        job_queue = job_queues.get(job_id)
+            # Only write when an update arrives; no time limit for long builds
+            while not is_terminal(current_job):
+                try:
+                    update = subscription.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    update = None
 
-        # Keep track of last sent data to avoid duplicates
-        last_status = None
-        retry_count = 0
-        max_retries = 120  # 2 minutes max
+                if update is None and time.time() - last_sync < SSE_RESYNC_SECONDS:
+                    # SSE comment to keep the connection alive
+                    yield b": heartbeat\n\n"
+                    continue
 
-        while retry_count < max_retries:
-            try:
-                current_job = job_store.get_job(job_id)
-                if not current_job:
-                    yield f"data: {json.dumps({'error': 'Job not found'})}\n\n".encode('utf-8')
-                    break
-
-                # Send update if status changed
-                current_status = current_job.get('status')
-                if current_status != last_status:
-                    yield f"data: {json.dumps(current_job)}\n\n".encode('utf-8')
-                    last_status = current_status
-
-                # Check if job is complete
-                if current_status in ['completed', 'failed']:
-                    # Send final update
-                    yield f"data: {json.dumps(current_job)}\n\n".encode('utf-8')
-                    break
-
-                # Try to get updates from queue
-                if job_queue:
-                    try:
-                        # Non-blocking get
-                        update = job_queue.get_nowait()
-                        # Get latest job state from PostgreSQL
-                        latest_job = job_store.get_job(job_id)
-                        if latest_job:
-                            yield f"data: {json.dumps(latest_job)}\n\n".encode('utf-8')
-                    except queue.Empty:
-                        pass
-
-                # Send heartbeat to keep connection alive
-                yield f": heartbeat\n\n".encode('utf-8')  # SSE comment to keep alive
-
-                # Sleep briefly
-                import time
-                time.sleep(1)
-                retry_count += 1
-
-            except Exception as e:
-                logger.error(f"SSE error for job {job_id}: {str(e)}")
-                yield f"data: {json.dumps({'error': str(e)})}\n\n".encode('utf-8')
-                break
+                if update is None or update is RESYNC_EVENT or update.get('_resync'):
+                    # Periodic (or requested) re-read covers updates from other processes
+                    latest_job = job_store.get_job(job_id)
+                    last_sync = time.time()
+                    if not latest_job:
+                        yield send({'error': 'Job not found'})
+                        return
+                    if latest_job == current_job:
+                        yield b": heartbeat\n\n"
+                        continue
+                    current_job = latest_job
+                else:
+                    current_job = {**current_job, **update}
+
+                yield send(current_job)
+
+        except Exception as e:
+            logger.error(f"SSE error for job {job_id}: {str(e)}")
+            yield send({'error': str(e)})
+        finally:
+            progress_bus.unsubscribe(job_id, subscription)
 
     # Create response with proper headers
     response = Response(
@@ -854,6 +845,7 @@ def admin_cache_stats():
         # Calculate totals
         total_hits = sum(s.get('hits', 0) for s in stats.values())
         total_misses = sum(s.get('misses', 0) for s in stats.values())
+        total_unflushed = sum(s.get('unflushed_hits', 0) + s.get('unflushed_misses', 0) for s in stats.values())
         total_entries = sum(s.get('entries', 0) for s in stats.values())
         total_space_mb = sum(s.get('space_mb', 0) for s in stats.values())
 
@@ -865,6 +857,7 @@ def admin_cache_stats():
                 'hit_rate': overall_hit_rate,
                 'total_hits': total_hits,
                 'total_misses': total_misses,
+                'total_unflushed': total_unflushed,
                 'total_entries': total_entries,
                 'total_space_mb': total_space_mb
             },
@@ -915,13 +908,6 @@ def cleanup_old_files():
         # Clean up expired jobs in PostgreSQL
         jobs_deleted = job_store.cleanup_expired_jobs() if hasattr(job_store, 'cleanup_expired_jobs') else 0
 
-        # Clean up orphaned queues
-        job_ids_in_db = {job['job_id'] for job in job_store.list_recent_jobs(limit=1000)}
-        queues_to_delete = [job_id for job_id in job_queues if job_id not in job_ids_in_db]
-
-        for job_id in queues_to_delete:
-            job_queues.pop(job_id, None)
-
         # Clean up cache if available
         cache_cleaned = {}
         if cache_manager:
@@ -934,7 +920,6 @@ def cleanup_old_files():
             'status': 'success',
             'files_deleted': files_deleted,
             'jobs_cleaned': jobs_deleted,
-            'queues_cleaned': len(queues_to_delete),
             'cache_cleaned': cache_cleaned
         })
 
@@ -945,342 +930,30 @@ def cleanup_old_files():
 
 @app.route('/api/preview/hot-brands/<team_key>', methods=['GET'])
 def preview_hot_brands(team_key):
-    """Get top sponsorship recommendations for preview - with logo support and subcategory filtering"""
+    """Get top sponsorship recommendations for preview (materialized per team, ?refresh=true to recompute)"""
     try:
         # Validate team
         config_manager = TeamConfigManager()
         if team_key not in config_manager.list_teams():
             return jsonify({'error': f'Team {team_key} not found'}), 404
 
-        team_config = config_manager.get_team_config(team_key)
-        logger.info(f"Processing hot brands for {team_config['team_name']}")
-
-        # Initialize cache manager (optional but recommended)
-        cache_manager = None
-        try:
-            from utils.cache_manager import CacheManager
-            from postgresql_job_store import PostgreSQLJobStore
-
-            job_store = PostgreSQLJobStore(os.environ.get('DATABASE_URL'))
-            cache_manager = CacheManager(job_store.pool)
-            logger.info("Cache manager initialized")
-        except Exception as e:
-            logger.warning(f"Cache manager not available: {e}")
-
-        # Initialize LogoManager
-        from utils.logo_manager import LogoManager
-        logo_manager = LogoManager()
-        logger.info("LogoManager initialized")
-
-        # Initialize CategoryAnalyzer with cache manager
-        from data_processors.category_analyzer import CategoryAnalyzer
-
-        analyzer = CategoryAnalyzer(
-            team_name=team_config['team_name'],
-            team_short=team_config.get('team_short', team_config['team_name'].split()[-1]),
-            league=team_config['league'],
-            comparison_population=team_config.get('comparison_population'),
-            audience_name=team_config.get('audience_name'),
-            cache_manager=cache_manager
-        )
-
-        recommendations = []
-        merchants_to_standardize = []
-
-        # Load data from Snowflake
-        from data_processors.snowflake_connector import query_to_dataframe
-
-        view_prefix = team_config['view_prefix']
-
-        # Load all required dataframes
-        category_df = query_to_dataframe(f"SELECT * FROM {view_prefix}_CATEGORY_INDEXING_ALL_TIME")
-        subcategory_df = query_to_dataframe(f"SELECT * FROM {view_prefix}_SUBCATEGORY_INDEXING_ALL_TIME")
-        merchant_df = query_to_dataframe(f"SELECT * FROM {view_prefix}_MERCHANT_INDEXING_ALL_TIME")
+        force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+        payload, cache_status = hot_brands_cache.get(team_key, force_refresh=force_refresh)
+        logger.info(f"Hot brands for {team_key}: {cache_status}")
 
-        # CRITICAL: Strip whitespace from all string columns
-        logger.info("Cleaning data (removing trailing whitespace)...")
-        for df in [category_df, subcategory_df, merchant_df]:
-            string_cols = df.select_dtypes(include=['object']).columns
-            for col in string_cols:
-                df[col] = df[col].str.strip()
-
-        if merchant_df.empty:
-            logger.error("No merchant data found")
-            return jsonify({
-                'team_name': team_config['team_name'],
-                'recommendations': [],
-                'generated_at': datetime.now().isoformat(),
-                'error': 'No merchant data found'
-            })
-
-        logger.info(f"Loaded {len(merchant_df)} merchant records")
-
-        # Process fixed categories with subcategory filtering
-        fixed_categories = ['restaurants', 'athleisure', 'finance', 'gambling', 'travel', 'auto']
-
-        for category_key in fixed_categories:
-            try:
-                if category_key not in analyzer.categories:
-                    continue
-
-                category_config = analyzer.categories[category_key]
-                category_names = category_config.get('category_names_in_data', [])
-
-                # Strip whitespace from expected category names
-                category_names = [name.strip() for name in category_names]
-
-                # Get merchants for this category
-                category_merchant_df = merchant_df[
-                    merchant_df['CATEGORY'].isin(category_names)
-                ].copy()
-
-                if category_merchant_df.empty:
-                    logger.debug(f"No merchants found for category {category_key}")
-                    continue
-
-                # CRITICAL: Apply subcategory filtering
-                filtered_category_merchant_df = analyzer._filter_merchants_by_subcategory(
-                    category_merchant_df,
-                    subcategory_df,
-                    category_config
-                )
-
-                logger.info(f"Category {category_key}: {len(category_merchant_df)} → "
-                           f"{len(filtered_category_merchant_df)} merchants after filtering")
-
-                if filtered_category_merchant_df.empty:
-                    logger.warning(f"All merchants filtered out for category {category_key}")
-                    continue
-
-                # Find top merchant by composite index from FILTERED data
-                team_merchants = filtered_category_merchant_df[
-                    (filtered_category_merchant_df['AUDIENCE'] == analyzer.audience_name) &
-                    (filtered_category_merchant_df['COMPARISON_POPULATION'] == analyzer.comparison_pop) &
-                    (filtered_category_merchant_df['COMPOSITE_INDEX'] > 0) &
-                    (filtered_category_merchant_df['PERC_AUDIENCE'] >= 0.01)
-                ]
-
-                if team_merchants.empty:
-                    logger.debug(f"No qualifying merchants for {category_key} after filters")
-                    continue
-
-                # Get top merchant
-                top_merchant_row = team_merchants.nlargest(1, 'COMPOSITE_INDEX').iloc[0]
-
-                merchants_to_standardize.append({
-                    'original_name': top_merchant_row['MERCHANT'],
-                    'category': category_config['display_name'],
-                    'composite_index': int(top_merchant_row['COMPOSITE_INDEX']),
-                    'audience_pct': float(top_merchant_row['PERC_AUDIENCE']) * 100,
-                    'perc_index': int(top_merchant_row.get('PERC_INDEX', 0)),
-                    'spc_index': int(top_merchant_row.get('SPC_INDEX', 0))
-                })
-
-                logger.info(
-                    f"Fixed category {category_config['display_name']}: {top_merchant_row['MERCHANT']} "
-                    f"(index: {top_merchant_row['COMPOSITE_INDEX']:.0f})")
-
-            except Exception as e:
-                logger.warning(f"Could not analyze category {category_key}: {e}")
-                import traceback
-                logger.debug(traceback.format_exc())
-                continue
-
-        # Get custom categories
-        try:
-            custom_categories = analyzer.get_custom_categories(
-                category_df=category_df,
-                merchant_df=merchant_df,
-                is_womens_team=team_config.get('is_womens_team', False),
-                existing_categories=fixed_categories
-            )
-
-            logger.info(f"Found {len(custom_categories)} custom categories")
-
-            # Process top 4 custom categories
-            for custom_cat in custom_categories[:4]:
-                try:
-                    # Strip whitespace from category names
-                    category_names_clean = [name.strip() for name in custom_cat['category_names_in_data']]
-
-                    # Get merchants for this custom category
-                    custom_merchant_df = merchant_df[
-                        merchant_df['CATEGORY'].isin(category_names_clean)
-                    ].copy()
-
-                    if custom_merchant_df.empty:
-                        continue
-
-                    # Create a minimal category config for custom categories
-                    custom_cat_config = {
-                        'display_name': custom_cat['display_name'],
-                        'category_names_in_data': custom_cat['category_names_in_data'],
-                        'subcategories': custom_cat.get('subcategories', {'include': [], 'exclude': []}),
-                        'is_custom': True
-                    }
-
-                    # Apply subcategory filtering to custom categories too
-                    filtered_custom_merchant_df = analyzer._filter_merchants_by_subcategory(
-                        custom_merchant_df,
-                        subcategory_df,
-                        custom_cat_config
-                    )
-
-                    if filtered_custom_merchant_df.empty:
-                        logger.warning(f"All merchants filtered out for custom category {custom_cat['display_name']}")
-                        continue
-
-                    # Find top merchant from FILTERED data
-                    team_merchants = filtered_custom_merchant_df[
-                        (filtered_custom_merchant_df['AUDIENCE'] == analyzer.audience_name) &
-                        (filtered_custom_merchant_df['COMPARISON_POPULATION'] == analyzer.comparison_pop) &
-                        (filtered_custom_merchant_df['COMPOSITE_INDEX'] > 0) &
-                        (filtered_custom_merchant_df['PERC_AUDIENCE'] >= 0.01)
-                    ]
-
-                    if team_merchants.empty:
-                        continue
-
-                    # Get top merchant
-                    top_merchant_row = team_merchants.nlargest(1, 'COMPOSITE_INDEX').iloc[0]
-
-                    merchants_to_standardize.append({
-                        'original_name': top_merchant_row['MERCHANT'],
-                        'category': custom_cat['display_name'],
-                        'composite_index': int(top_merchant_row['COMPOSITE_INDEX']),
-                        'audience_pct': float(top_merchant_row['PERC_AUDIENCE']) * 100,
-                        'perc_index': int(top_merchant_row.get('PERC_INDEX', 0)),
-                        'spc_index': int(top_merchant_row.get('SPC_INDEX', 0)),
-                        'is_emerging': custom_cat.get('is_emerging', False)
-                    })
-
-                    logger.info(
-                        f"Custom category {custom_cat['display_name']}: {top_merchant_row['MERCHANT']} "
-                        f"(index: {top_merchant_row['COMPOSITE_INDEX']:.0f})")
-
-                except Exception as e:
-                    logger.warning(f"Could not analyze custom category {custom_cat['display_name']}: {e}")
-                    import traceback
-                    logger.debug(traceback.format_exc())
-                    continue
-
-        except Exception as e:
-            logger.warning(f"Could not get custom categories: {e}")
-
-        # Import URL encoding for safe logo URLs
-        from urllib.parse import quote
-
-        # Standardize merchant names and add logo URLs
-        logger.info(f"Standardizing {len(merchants_to_standardize)} merchant names and checking logos...")
-
-        if analyzer.standardizer and merchants_to_standardize:
-            names_to_standardize = [m['original_name'] for m in merchants_to_standardize]
-
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                standardized_mapping = loop.run_until_complete(
-                    analyzer.standardizer.standardize_merchants(names_to_standardize)
-                )
-
-                for merchant_info in merchants_to_standardize:
-                    original = merchant_info['original_name']
-                    standardized = standardized_mapping.get(original, original)
-
-                    if standardized != original:
-                        logger.debug(f"Standardized: {original} → {standardized}")
-
-                    # Check if logo exists locally
-                    has_logo = logo_manager.get_logo(standardized) is not None
-
-                    # Generate logo URL if logo exists
-                    logo_url = ''
-                    if has_logo:
-                        encoded_name = quote(standardized)
-                        logo_url = f"/api/logos/{encoded_name}"
-                        logger.debug(f"Logo found for {standardized}: {logo_url}")
-                    else:
-                        logger.debug(f"No logo found for {standardized}")
-
-                    recommendations.append({
-                        'merchant': standardized,
-                        'category': merchant_info['category'],
-                        'subcategory': '',
-                        'composite_index': merchant_info['composite_index'],
-                        'affinity_index': merchant_info['perc_index'],
-                        'spend_index': merchant_info['spc_index'],
-                        'audience_percentage': merchant_info['audience_pct'],
-                        'is_emerging': merchant_info.get('is_emerging', False),
-                        'logo_url': logo_url,
-                        'has_local_logo': has_logo
-                    })
-
-            finally:
-                loop.close()
-        else:
-            # No standardization available
-            for merchant_info in merchants_to_standardize:
-                merchant_name = merchant_info['original_name']
-
-                # Check for logo
-                has_logo = logo_manager.get_logo(merchant_name) is not None
-                logo_url = ''
-                if has_logo:
-                    encoded_name = quote(merchant_name)
-                    logo_url = f"/api/logos/{encoded_name}"
-                    logger.debug(f"Logo found for {merchant_name}: {logo_url}")
-                else:
-                    logger.debug(f"No logo found for {merchant_name}")
-
-                recommendations.append({
-                    'merchant': merchant_name,
-                    'category': merchant_info['category'],
-                    'subcategory': '',
-                    'composite_index': merchant_info['composite_index'],
-                    'affinity_index': merchant_info['perc_index'],
-                    'spend_index': merchant_info['spc_index'],
-                    'audience_percentage': merchant_info['audience_pct'],
-                    'is_emerging': merchant_info.get('is_emerging', False),
-                    'logo_url': logo_url,
-                    'has_local_logo': has_logo
-                })
-
-        # Sort by composite index descending
-        recommendations.sort(key=lambda x: x['composite_index'], reverse=True)
-
-        # Log summary with logo status
-        logger.info(f"Found {len(recommendations)} recommendations for {team_config['team_name']}")
-        logos_found = sum(1 for rec in recommendations if rec.get('has_local_logo'))
-        logger.info(f"Logos found: {logos_found}/{len(recommendations)}")
-
-        for i, rec in enumerate(recommendations[:10], 1):
-            emerging = " ⭐" if rec.get('is_emerging') else ""
-            logo_status = " 🖼️" if rec.get('has_local_logo') else " ❌"
-            logger.info(
-                f"  {i}. {rec['category']}: {rec['merchant']} (index: {rec['composite_index']}){emerging}{logo_status}")
-
-        return jsonify({
-            'team_name': team_config['team_name'],
-            'team_key': team_key,
-            'recommendations': recommendations[:10],  # Return top 10
-            'generated_at': datetime.now().isoformat(),
-            'total_found': len(recommendations),
-            'logos_found': logos_found
-        })
+        return jsonify({**payload, 'cache_status': cache_status})
 
     except Exception as e:
         logger.error(f"Error getting hot brands preview: {str(e)}")
-        import traceback
         logger.error(traceback.format_exc())
         return jsonify({
             'error': str(e),
-            'team_name': team_config.get('team_name', team_key) if 'team_config' in locals() else team_key,
+            'team_key': team_key,
             'recommendations': [],
             'generated_at': datetime.now().isoformat()
         }), 500
 
+
 @app.route('/api/categories', methods=['GET'])
 def get_available_categories():
     """Get list of available categories for custom selection"""
@@ -1318,9 +991,9 @@ def serve_logo(merchant_name):
         # Decode the merchant name
         merchant_name = unquote(merchant_name)
 
-        # Initialize LogoManager
-        from utils.logo_manager import LogoManager
-        logo_manager = LogoManager()
+        # Shared LogoManager (filename index built once per process)
+        from utils.logo_manager import get_logo_manager
+        logo_manager = get_logo_manager()
 
         # Get the logo
         logo_image = logo_manager.get_logo(merchant_name, size=(200, 200))
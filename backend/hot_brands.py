@@ -0,0 +1,355 @@
+"""
+Materialized hot-brands preview
+Computes each team's top sponsorship recommendations once, keeps the result in
+memory and serves it directly. Stale entries are refreshed in the background;
+a refresh that finds the same view snapshot (fingerprint of the category,
+subcategory and merchant frames) keeps the existing result instead of redoing
+the analysis and name standardization.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import pandas as pd
+
+from data_processors.category_analyzer import CategoryAnalyzer
+from data_processors.team_data_snapshot import TeamDataSnapshot
+from utils.logo_manager import LogoManager, get_logo_manager
+from utils.team_config_manager import TeamConfigManager
+
+logger = logging.getLogger(__name__)
+
+# Preview cache settings
+HOT_BRANDS_TTL_SECONDS = int(os.getenv('HOT_BRANDS_TTL_MINUTES', '60')) * 60
+HOT_BRANDS_PREWARM = os.getenv('HOT_BRANDS_PREWARM', 'true').lower() == 'true'
+
+FIXED_CATEGORIES = ['restaurants', 'athleisure', 'finance', 'gambling', 'travel', 'auto']
+
+
+def load_preview_frames(team_key: str, team_config: Dict[str, Any],
+                        cache_manager: Optional[Any] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch the category, subcategory and merchant views with string columns trimmed
+
+    Returns:
+        Dictionary keyed by snapshot key ('category', 'subcategory', 'merchant')
+    """
+    snapshot = TeamDataSnapshot(team_config['view_prefix'], cache_manager=cache_manager, team_key=team_key)
+    frames = {key: snapshot.get_view(key) for key in ('category', 'subcategory', 'merchant')}
+
+    # CRITICAL: Strip whitespace from all string columns
+    for df in frames.values():
+        for col in df.select_dtypes(include=['object']).columns:
+            df[col] = df[col].str.strip()
+    return frames
+
+
+def snapshot_fingerprint(frames: Dict[str, pd.DataFrame]) -> str:
+    """Content hash of the preview frames (changes when the view snapshot changes)"""
+    digest = hashlib.sha256()
+    for key in sorted(frames):
+        df = frames[key]
+        digest.update(key.encode())
+        digest.update(','.join(map(str, df.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def _top_merchant(analyzer: CategoryAnalyzer, merchant_df: pd.DataFrame, subcategory_df: pd.DataFrame,
+                  category_config: Dict[str, Any]) -> Optional[pd.Series]:
+    """Top merchant by composite index after subcategory filtering (None if nothing qualifies)"""
+    category_names = [name.strip() for name in category_config.get('category_names_in_data', [])]
+    category_merchant_df = merchant_df[merchant_df['CATEGORY'].isin(category_names)].copy()
+    if category_merchant_df.empty:
+        return None
+
+    # CRITICAL: Apply subcategory filtering
+    filtered = analyzer._filter_merchants_by_subcategory(category_merchant_df, subcategory_df, category_config)
+    logger.info(f"Category {category_config['display_name']}: {len(category_merchant_df)} → "
+                f"{len(filtered)} merchants after filtering")
+    if filtered.empty:
+        logger.warning(f"All merchants filtered out for category {category_config['display_name']}")
+        return None
+
+    team_merchants = filtered[
+        (filtered['AUDIENCE'] == analyzer.audience_name) &
+        (filtered['COMPARISON_POPULATION'] == analyzer.comparison_pop) &
+        (filtered['COMPOSITE_INDEX'] > 0) &
+        (filtered['PERC_AUDIENCE'] >= 0.01)
+    ]
+    if team_merchants.empty:
+        return None
+
+    return team_merchants.nlargest(1, 'COMPOSITE_INDEX').iloc[0]
+
+
+def _merchant_info(row: pd.Series, category: str, is_emerging: bool = False) -> Dict[str, Any]:
+    return {
+        'original_name': row['MERCHANT'],
+        'category': category,
+        'composite_index': int(row['COMPOSITE_INDEX']),
+        'audience_pct': float(row['PERC_AUDIENCE']) * 100,
+        'perc_index': int(row.get('PERC_INDEX', 0)),
+        'spc_index': int(row.get('SPC_INDEX', 0)),
+        'is_emerging': is_emerging
+    }
+
+
+def compute_hot_brands(team_key: str, team_config: Dict[str, Any], frames: Dict[str, pd.DataFrame],
+                       cache_manager: Optional[Any] = None,
+                       logo_manager: Optional[LogoManager] = None) -> Dict[str, Any]:
+    """
+    Top sponsorship recommendation per fixed and custom category
+
+    Args:
+        team_key: Team identifier
+        team_config: Team configuration
+        frames: Output of load_preview_frames
+        cache_manager: Optional CacheManager (merchant name cache)
+        logo_manager: LogoManager used to check for local logos
+
+    Returns:
+        Preview payload as returned by /api/preview/hot-brands
+    """
+    logo_manager = logo_manager or get_logo_manager()
+    analyzer = CategoryAnalyzer(
+        team_name=team_config['team_name'],
+        team_short=team_config.get('team_short', team_config['team_name'].split()[-1]),
+        league=team_config['league'],
+        comparison_population=team_config.get('comparison_population'),
+        audience_name=team_config.get('audience_name'),
+        cache_manager=cache_manager
+    )
+
+    category_df, subcategory_df, merchant_df = frames['category'], frames['subcategory'], frames['merchant']
+    if merchant_df.empty:
+        logger.error("No merchant data found")
+        return {
+            'team_name': team_config['team_name'],
+            'team_key': team_key,
+            'recommendations': [],
+            'generated_at': datetime.now().isoformat(),
+            'error': 'No merchant data found'
+        }
+
+    logger.info(f"Loaded {len(merchant_df)} merchant records")
+    merchants_to_standardize: List[Dict[str, Any]] = []
+
+    # Fixed categories with subcategory filtering
+    for category_key in FIXED_CATEGORIES:
+        try:
+            if category_key not in analyzer.categories:
+                continue
+            category_config = analyzer.categories[category_key]
+            row = _top_merchant(analyzer, merchant_df, subcategory_df, category_config)
+            if row is not None:
+                merchants_to_standardize.append(_merchant_info(row, category_config['display_name']))
+                logger.info(f"Fixed category {category_config['display_name']}: {row['MERCHANT']} "
+                            f"(index: {row['COMPOSITE_INDEX']:.0f})")
+        except Exception as e:
+            logger.warning(f"Could not analyze category {category_key}: {e}")
+
+    # Top 4 custom categories
+    try:
+        custom_categories = analyzer.get_custom_categories(
+            category_df=category_df,
+            merchant_df=merchant_df,
+            is_womens_team=team_config.get('is_womens_team', False),
+            existing_categories=FIXED_CATEGORIES
+        )
+        logger.info(f"Found {len(custom_categories)} custom categories")
+
+        for custom_cat in custom_categories[:4]:
+            try:
+                custom_cat_config = {
+                    'display_name': custom_cat['display_name'],
+                    'category_names_in_data': custom_cat['category_names_in_data'],
+                    'subcategories': custom_cat.get('subcategories', {'include': [], 'exclude': []}),
+                    'is_custom': True
+                }
+                row = _top_merchant(analyzer, merchant_df, subcategory_df, custom_cat_config)
+                if row is not None:
+                    merchants_to_standardize.append(
+                        _merchant_info(row, custom_cat['display_name'], custom_cat.get('is_emerging', False)))
+                    logger.info(f"Custom category {custom_cat['display_name']}: {row['MERCHANT']} "
+                                f"(index: {row['COMPOSITE_INDEX']:.0f})")
+            except Exception as e:
+                logger.warning(f"Could not analyze custom category {custom_cat['display_name']}: {e}")
+    except Exception as e:
+        logger.warning(f"Could not get custom categories: {e}")
+
+    # Standardize merchant names
+    standardized_mapping = {}
+    if analyzer.standardizer and merchants_to_standardize:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            standardized_mapping = loop.run_until_complete(
+                analyzer.standardizer.standardize_merchants([m['original_name'] for m in merchants_to_standardize])
+            )
+        finally:
+            loop.close()
+
+    recommendations = []
+    for merchant_info in merchants_to_standardize:
+        merchant_name = standardized_mapping.get(merchant_info['original_name'], merchant_info['original_name'])
+        has_logo = logo_manager.get_logo(merchant_name) is not None
+        recommendations.append({
+            'merchant': merchant_name,
+            'category': merchant_info['category'],
+            'subcategory': '',
+            'composite_index': merchant_info['composite_index'],
+            'affinity_index': merchant_info['perc_index'],
+            'spend_index': merchant_info['spc_index'],
+            'audience_percentage': merchant_info['audience_pct'],
+            'is_emerging': merchant_info['is_emerging'],
+            'logo_url': f"/api/logos/{quote(merchant_name)}" if has_logo else '',
+            'has_local_logo': has_logo
+        })
+
+    # Sort by composite index descending
+    recommendations.sort(key=lambda x: x['composite_index'], reverse=True)
+    logos_found = sum(1 for rec in recommendations if rec['has_local_logo'])
+    logger.info(f"Found {len(recommendations)} recommendations for {team_config['team_name']} "
+                f"(logos: {logos_found}/{len(recommendations)})")
+
+    return {
+        'team_name': team_config['team_name'],
+        'team_key': team_key,
+        'recommendations': recommendations[:10],  # Return top 10
+        'generated_at': datetime.now().isoformat(),
+        'total_found': len(recommendations),
+        'logos_found': logos_found
+    }
+
+
+class HotBrandsPreviewCache:
+    """
+    Per-team materialized previews with stale-while-revalidate refresh
+
+    One computation per team at a time; concurrent requests for a team that is
+    being computed wait for that result instead of starting another.
+    """
+
+    def __init__(self, cache_manager: Optional[Any] = None, ttl_seconds: Optional[int] = None,
+                 load_frames: Callable = load_preview_frames, compute: Callable = compute_hot_brands):
+        """
+        Args:
+            cache_manager: Shared CacheManager (Snowflake result and merchant name caches)
+            ttl_seconds: Age after which an entry is refreshed in the background
+            load_frames: Frame loader (see load_preview_frames)
+            compute: Preview computation (see compute_hot_brands)
+        """
+        self.cache_manager = cache_manager
+        self.ttl_seconds = HOT_BRANDS_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._load_frames = load_frames
+        self._compute = compute
+        self._config_manager = TeamConfigManager()
+        self._logo_manager = None
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._team_locks: Dict[str, threading.Lock] = {}
+        self._refreshing = set()
+
+    def _team_lock(self, team_key: str) -> threading.Lock:
+        with self._lock:
+            return self._team_locks.setdefault(team_key, threading.Lock())
+
+    def _get_logo_manager(self) -> LogoManager:
+        if self._logo_manager is None:
+            self._logo_manager = get_logo_manager()
+        return self._logo_manager
+
+    def get(self, team_key: str, force_refresh: bool = False) -> Tuple[Dict[str, Any], str]:
+        """
+        Preview for a team
+
+        Args:
+            team_key: Team identifier
+            force_refresh: Recompute now even if the view snapshot is unchanged
+
+        Returns:
+            (payload, cache status: 'hit', 'stale' or 'computed')
+        """
+        entry = self._entries.get(team_key)
+        if entry and not force_refresh:
+            if time.time() - entry['refreshed_at'] > self.ttl_seconds:
+                self.refresh_async(team_key)
+                return entry['payload'], 'stale'
+            return entry['payload'], 'hit'
+
+        with self._team_lock(team_key):
+            # Another request may have finished computing while we waited
+            entry = self._entries.get(team_key)
+            if entry and not force_refresh:
+                return entry['payload'], 'hit'
+            self._refresh_locked(team_key, force=force_refresh)
+        return self._entries[team_key]['payload'], 'computed'
+
+    def _refresh_locked(self, team_key: str, force: bool = False):
+        team_config = self._config_manager.get_team_config(team_key)
+        frames = self._load_frames(team_key, team_config, self.cache_manager)
+        fingerprint = snapshot_fingerprint(frames)
+
+        entry = self._entries.get(team_key)
+        if entry and entry['fingerprint'] == fingerprint and not force:
+            logger.info(f"Hot brands for {team_key}: view snapshot unchanged, keeping preview")
+            entry['refreshed_at'] = time.time()
+            return
+
+        payload = self._compute(team_key, team_config, frames,
+                                cache_manager=self.cache_manager, logo_manager=self._get_logo_manager())
+        with self._lock:
+            self._entries[team_key] = {'payload': payload, 'fingerprint': fingerprint, 'refreshed_at': time.time()}
+
+    def refresh(self, team_key: str):
+        """Recompute a team's preview if its view snapshot changed"""
+        try:
+            with self._team_lock(team_key):
+                self._refresh_locked(team_key)
+        except Exception as e:
+            logger.warning(f"Hot brands refresh failed for {team_key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(team_key)
+
+    def refresh_async(self, team_key: str):
+        """Refresh on a daemon thread unless one is already running for the team"""
+        with self._lock:
+            if team_key in self._refreshing:
+                return
+            self._refreshing.add(team_key)
+        threading.Thread(target=self.refresh, args=(team_key,), name=f"hot-brands-{team_key}", daemon=True).start()
+
+    def prewarm(self, team_keys: Optional[List[str]] = None) -> threading.Thread:
+        """Compute previews for every team (or the given teams) on one background thread"""
+        team_keys = team_keys or self._config_manager.list_teams()
+
+        def _prewarm():
+            for team_key in team_keys:
+                with self._lock:
+                    if team_key in self._refreshing:
+                        continue
+                    self._refreshing.add(team_key)
+                self.refresh(team_key)
+            logger.info(f"Hot brands previews warmed for {len(team_keys)} team(s)")
+
+        thread = threading.Thread(target=_prewarm, name="hot-brands-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def invalidate(self, team_key: Optional[str] = None):
+        """Drop one team's preview (or all of them)"""
+        with self._lock:
+            if team_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(team_key, None)
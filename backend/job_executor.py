@@ -0,0 +1,287 @@
+"""
+Bounded executor for PowerPoint generation jobs
+Jobs wait in a priority/FIFO queue that is persisted through the job store
+(status 'queued' + priority), so queued work survives restarts. A fixed number
+of workers run them: threads by default, or spawned worker processes so the
+CPU-heavy chart rendering can use more than one core.
+
+Each executor heartbeats the jobs it holds. Queued or running jobs whose
+heartbeat goes stale (their instance was stopped or crashed) are adopted by a
+live executor: queued jobs are re-queued, running jobs are re-run up to
+JOB_MAX_ATTEMPTS times and otherwise marked failed as interrupted. During a
+zero-downtime deploy the old instance keeps heartbeating, so its jobs are left
+alone until it exits.
+"""
+
+import heapq
+import itertools
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Executor settings
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+JOB_QUEUE_MAX = int(os.getenv('JOB_QUEUE_MAX', '50'))
+JOB_EXECUTOR_MODE = os.getenv('JOB_EXECUTOR_MODE', 'thread')  # 'thread' or 'process'
+JOB_HEARTBEAT_SECONDS = float(os.getenv('JOB_HEARTBEAT_SECONDS', '30'))
+JOB_STALE_SECONDS = float(os.getenv('JOB_STALE_SECONDS', '120'))  # no heartbeat for this long = owner gone
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '2'))  # runs per job, so a crashing job can't loop
+JOB_PRIORITY_MAX = int(os.getenv('JOB_PRIORITY_MAX', '5'))  # client priorities are clamped to 0..max
+
+
+def parse_priority(value: Any) -> int:
+    """
+    Validate a client-supplied job priority
+
+    Args:
+        value: Priority from the request (int or numeric string; None means 0)
+
+    Returns:
+        The priority clamped to 0..JOB_PRIORITY_MAX
+
+    Raises:
+        ValueError: If value is not an integer
+    """
+    if value is None:
+        return 0
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"priority must be an integer, got {value!r}")
+    try:
+        priority = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"priority must be an integer, got {value!r}")
+    return min(max(priority, 0), JOB_PRIORITY_MAX)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the job queue is at capacity"""
+
+
+class JobExecutor:
+    """
+    Runs jobs on a fixed set of workers from a priority queue
+
+    Higher priority runs first; equal priorities run in submission order.
+    The store must provide enqueue_job, claim_job, heartbeat_jobs,
+    adopt_stale_jobs and update_job (see PostgreSQLJobStore).
+    """
+
+    def __init__(self, worker_fn: Callable[[str, str, dict], None], job_store,
+                 workers: Optional[int] = None, max_queue: Optional[int] = None,
+                 use_processes: bool = False,
+                 on_position: Optional[Callable[[str, int], None]] = None,
+                 owner: Optional[str] = None):
+        """
+        Args:
+            worker_fn: Called as worker_fn(job_id, team_key, options); must be picklable for processes
+            job_store: Store that persists queue state
+            workers: Number of concurrent jobs (default JOB_WORKERS)
+            max_queue: Waiting jobs allowed before submit raises QueueFullError (default JOB_QUEUE_MAX)
+            use_processes: Run jobs in spawned worker processes instead of threads
+            on_position: Called with (job_id, position) whenever a waiting job's position changes
+            owner: Name this executor records on the jobs it holds (default host:pid:random)
+        """
+        self.worker_fn = worker_fn
+        self.job_store = job_store
+        self.workers = workers or JOB_WORKERS
+        self.max_queue = JOB_QUEUE_MAX if max_queue is None else max_queue
+        self.use_processes = use_processes
+        self.on_position = on_position
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._heap = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._active = 0
+        self._reserved = 0  # submits between the queue-limit check and the push
+        self._running = set()
+        self._shutdown = False
+        self._stop = threading.Event()
+        self._threads = []
+        self._process_pool = None
+
+        # Last position reported per waiting job (serialized by _report_lock)
+        self._report_lock = threading.Lock()
+        self._reported = {}
+
+    def start(self):
+        """Start the worker threads (and process pool if enabled)"""
+        if self._threads:
+            return
+        if self.use_processes:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        logger.info(f"Job executor started: {self.workers} {'process' if self.use_processes else 'thread'} "
+                    f"worker(s), queue limit {self.max_queue}")
+
+    def submit(self, job_id: str, team_key: str, options: dict, priority: int = 0) -> int:
+        """
+        Queue a job
+
+        Args:
+            job_id: Job to run
+            team_key: Team for the report
+            options: Build options passed to the worker
+            priority: Higher runs first (default 0)
+
+        Returns:
+            1-based queue position at submission
+        """
+        # Reserve the slot under the lock so concurrent submits can't overshoot the bound
+        with self._cond:
+            if len(self._heap) + self._reserved >= self.max_queue:
+                raise QueueFullError(f"Job queue is full ({self.max_queue} waiting)")
+            self._reserved += 1
+
+        try:
+            self.job_store.enqueue_job(job_id, priority, owner=self.owner)
+        except Exception:
+            with self._cond:
+                self._reserved -= 1
+            raise
+        return self._push(job_id, team_key, options, priority, reserved=True)
+
+    def recover(self) -> int:
+        """
+        Adopt jobs whose owner stopped heartbeating (called at startup and then
+        every JOB_HEARTBEAT_SECONDS). Running jobs under JOB_MAX_ATTEMPTS are
+        re-queued; the rest are marked failed as interrupted.
+
+        Returns:
+            Number of jobs re-queued
+        """
+        requeued = 0
+        for job in self.job_store.adopt_stale_jobs(self.owner, JOB_STALE_SECONDS):
+            job_id = job['job_id']
+            if self._holds(job_id):
+                continue  # our own heartbeat lapsed (e.g. a database outage)
+
+            if job['status'] == 'running':
+                if job['attempts'] >= JOB_MAX_ATTEMPTS:
+                    logger.warning(f"Job {job_id} was interrupted {job['attempts']} time(s); not retrying")
+                    self.job_store.update_job(job_id,
+                                              status='failed',
+                                              progress=0,
+                                              message='Generation interrupted',
+                                              error=f"Generation was interrupted {job['attempts']} time(s) "
+                                                    f"(server restarted or crashed)",
+                                              completed_at=datetime.now().isoformat())
+                    continue
+                self.job_store.enqueue_job(job_id, job['priority'], owner=self.owner)
+
+            self._push(job_id, job['team_key'], job.get('options') or {}, job['priority'])
+            requeued += 1
+
+        if requeued:
+            logger.info(f"Recovered {requeued} queued job(s)")
+        return requeued
+
+    def _holds(self, job_id: str) -> bool:
+        with self._cond:
+            return job_id in self._running or any(entry[2] == job_id for entry in self._heap)
+
+    def _held_jobs(self) -> List[str]:
+        with self._cond:
+            return list(self._running) + [entry[2] for entry in self._heap]
+
+    def _heartbeat_loop(self):
+        """Keep our jobs' heartbeats fresh and adopt jobs from executors that went away"""
+        while not self._stop.wait(JOB_HEARTBEAT_SECONDS):
+            try:
+                self.job_store.heartbeat_jobs(self._held_jobs(), self.owner)
+                self.recover()
+            except Exception as e:
+                logger.warning(f"Job heartbeat failed: {e}")
+
+    def _push(self, job_id: str, team_key: str, options: dict, priority: int, reserved: bool = False) -> int:
+        with self._cond:
+            if reserved:
+                self._reserved -= 1
+            heapq.heappush(self._heap, (-priority, next(self._sequence), job_id, team_key, options))
+            self._cond.notify()
+        return self._report_positions().get(job_id, 1)
+
+    def _positions(self) -> Dict[str, int]:
+        with self._cond:
+            return {entry[2]: i + 1 for i, entry in enumerate(sorted(self._heap))}
+
+    def _report_positions(self) -> Dict[str, int]:
+        """Send position changes for every waiting job"""
+        with self._report_lock:
+            positions = self._positions()
+            for job_id, position in positions.items():
+                if self._reported.get(job_id) != position:
+                    self._reported[job_id] = position
+                    if self.on_position:
+                        try:
+                            self.on_position(job_id, position)
+                        except Exception as e:
+                            logger.warning(f"Failed to report queue position for job {job_id}: {e}")
+            for job_id in set(self._reported) - set(positions):
+                del self._reported[job_id]
+        return positions
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while not self._heap and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown:
+                    return
+                _, _, job_id, team_key, options = heapq.heappop(self._heap)
+                self._active += 1
+                self._running.add(job_id)
+
+            try:
+                self._report_positions()
+                if not self.job_store.claim_job(job_id, owner=self.owner):
+                    logger.info(f"Job {job_id} is no longer queued, skipping")
+                    continue
+                self._run(job_id, team_key, options)
+            except Exception as e:
+                logger.error(f"Job {job_id} crashed its worker: {e}")
+            finally:
+                with self._cond:
+                    self._active -= 1
+                    self._running.discard(job_id)
+
+    def _run(self, job_id: str, team_key: str, options: dict):
+        if self._process_pool is not None:
+            self._process_pool.submit(self.worker_fn, job_id, team_key, options).result()
+        else:
+            self.worker_fn(job_id, team_key, options)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and worker usage for health endpoints"""
+        with self._cond:
+            return {
+                'mode': 'process' if self.use_processes else 'thread',
+                'workers': self.workers,
+                'active': self._active,
+                'queued': len(self._heap),
+                'max_queue': self.max_queue
+            }
+
+    def shutdown(self):
+        """Stop taking jobs (queued jobs stay persisted and are adopted once their heartbeat is stale)"""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        self._stop.set()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
@@ -0,0 +1,179 @@
+"""
+PowerPoint generation job body
+build_report() runs one job and reports progress through an update_job
+callback. In thread mode app.generate_pptx_worker calls it with the app's job
+store, cache and progress bus. In JOB_EXECUTOR_MODE=process the executor sends
+process_job() to its spawned workers instead: they import this module, not
+app.py, and set up only what a build needs, once per worker process.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import matplotlib
+
+# Same matplotlib setup as app.py, before anything imports pyplot
+matplotlib.use('Agg')
+os.environ.setdefault('MPLCONFIGDIR', os.path.join(tempfile.gettempdir(), 'matplotlib'))
+
+from utils.font_manager import font_manager
+from utils.cache_manager import CacheManager
+from utils.team_config_manager import TeamConfigManager
+from report_builder.pptx_builder import PowerPointBuilder
+from data_processors.snowflake_connector import is_connection_healthy, connection_health_error
+from postgresql_job_store import PostgreSQLJobStore
+from progress_bus import ProgressBus
+
+logger = logging.getLogger(__name__)
+
+# Job store connections per worker process (progress updates and the cache only)
+WORKER_DB_CONNECTIONS = int(os.getenv('JOB_WORKER_DB_CONNECTIONS', '2'))
+
+
+def build_report(job_id: str, team_key: str, options: dict,
+                 update_job: Callable[..., None], cache_manager: Optional[CacheManager] = None):
+    """
+    Generate the PowerPoint for a job, reporting progress as it goes
+
+    Args:
+        job_id: Job being run
+        team_key: Team for the report
+        options: Build options from /api/generate
+        update_job: Called as update_job(job_id, **fields) for every status change
+        cache_manager: Optional CacheManager for the builder's queries
+    """
+    try:
+        # Step 1: Load team configuration (5%)
+        update_job(job_id,
+                   status='running',
+                   progress=5,
+                   message='Loading team configuration...')
+
+        config_manager = TeamConfigManager()
+        team_config = config_manager.get_team_config(team_key)
+
+        update_job(job_id,
+                   team_name=team_config['team_name'],
+                   progress=8,
+                   message=f'Loaded configuration for {team_config["team_name"]}')
+
+        # Step 2: Check database connection (10%) - cached state, no per-job round trip
+        update_job(job_id,
+                   progress=10,
+                   message='Checking Snowflake connection...')
+
+        if not is_connection_healthy():
+            raise Exception(f"Failed to connect to Snowflake: {connection_health_error()}")
+
+        update_job(job_id,
+                   progress=15,
+                   message='Database connection established successfully')
+
+        # Step 3: Initialize PowerPoint builder (20%)
+        update_job(job_id,
+                   progress=20,
+                   message='Initializing PowerPoint builder...')
+
+        def progress_callback(progress: int, message: str):
+            """Callback to update job progress from PowerPointBuilder"""
+            update_job(job_id, progress=progress, message=message)
+            logger.debug(f"Progress callback: {progress}% - {message}")
+
+        # Pass job_id, cache_manager, AND progress_callback to PowerPointBuilder
+        builder = PowerPointBuilder(
+            team_key,
+            job_id=job_id,
+            cache_manager=cache_manager,
+            progress_callback=progress_callback
+        )
+
+        # Step 4: Build presentation
+        # The builder will now update progress from 25% to 90%
+        output_path = builder.build_presentation(
+            include_custom_categories=not options.get('skip_custom', False),
+            custom_category_count=options.get('custom_count'),
+            category_mode=options.get('category_mode', 'standard'),
+            custom_categories=options.get('custom_categories')
+        )
+
+        # Step 5: Finalize (90-100%)
+        update_job(job_id,
+                   progress=90,
+                   message='Finalizing presentation...')
+
+        # Ensure output_path is a Path object
+        output_path = Path(output_path)
+
+        update_job(job_id,
+                   progress=95,
+                   message='Saving presentation metadata...')
+
+        # Store both the file path and directory for better tracking
+        update_job(job_id,
+                   status='completed',
+                   progress=100,
+                   message='PowerPoint generated successfully!',
+                   completed_at=datetime.now().isoformat(),
+                   output_file=str(output_path),
+                   output_dir=str(output_path.parent))
+
+        logger.info(f"Job {job_id} completed. Output file: {output_path}")
+
+    except Exception as e:
+        logger.error(f"Job {job_id} failed: {str(e)}")
+        logger.error(traceback.format_exc())
+
+        update_job(job_id,
+                   status='failed',
+                   progress=0,
+                   message='Generation failed',
+                   error=str(e),
+                   completed_at=datetime.now().isoformat())
+
+
+_worker_context: Optional[Dict[str, Any]] = None
+_worker_context_lock = threading.Lock()
+
+
+def _get_worker_context() -> Dict[str, Any]:
+    """
+    Set up a worker process once: fonts, a small job store pool (the app
+    process already created the tables), a CacheManager and a progress bus
+    that only sends, through NOTIFY. The app's Snowflake pool warm-up,
+    health monitor, LISTEN thread and queue recovery stay in the app process.
+    """
+    global _worker_context
+    with _worker_context_lock:
+        if _worker_context is None:
+            logging.basicConfig(level=logging.INFO)
+            font_manager.configure_matplotlib()
+
+            job_store = PostgreSQLJobStore(max_conn=WORKER_DB_CONNECTIONS, ensure_tables=False)
+            # Nobody subscribes in a worker process; NOTIFY is how updates reach the app's streams
+            progress_bus = ProgressBus()
+            progress_bus.enable_notify(job_store.database_url, listen=False)
+
+            _worker_context = {
+                'job_store': job_store,
+                'cache_manager': CacheManager(job_store.pool),
+                'progress_bus': progress_bus
+            }
+            logger.info(f"Job worker process {os.getpid()} initialized")
+        return _worker_context
+
+
+def process_job(job_id: str, team_key: str, options: dict):
+    """Entry point for spawned job processes (JobExecutor worker_fn in process mode)"""
+    context = _get_worker_context()
+
+    def update_job(job_id: str, **kwargs):
+        if context['job_store'].update_job(job_id, **kwargs):
+            context['progress_bus'].publish(job_id, kwargs)
+
+    build_report(job_id, team_key, options, update_job, context['cache_manager'])
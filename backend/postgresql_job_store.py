@@ -9,7 +9,7 @@ import time
 
 import psycopg2
 from psycopg2.extras import RealDictCursor, Json
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.pool import ThreadedConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +17,8 @@ logger = logging.getLogger(__name__)
 class PostgreSQLJobStore:
     """PostgreSQL-backed job storage with connection pooling and automatic cleanup."""
 
-    def __init__(self, database_url: Optional[str] = None, min_conn: int = 1, max_conn: int = 10):
+    def __init__(self, database_url: Optional[str] = None, min_conn: int = 1, max_conn: int = 10,
+                 ensure_tables: bool = True):
         self.database_url = database_url or os.environ.get('DATABASE_URL')
         if not self.database_url:
             raise ValueError("DATABASE_URL must be provided")
@@ -32,7 +33,8 @@ class PostgreSQLJobStore:
 
         for attempt in range(max_retries):
             try:
-                self.pool = SimpleConnectionPool(min_conn, max_conn, self.database_url)
+                # Threaded pool: shared by request handlers, job threads and category analysis workers
+                self.pool = ThreadedConnectionPool(min_conn, max_conn, self.database_url)
                 logger.info("Successfully created PostgreSQL connection pool")
                 break
             except Exception as e:
@@ -41,7 +43,9 @@ class PostgreSQLJobStore:
                 logger.warning(f"Failed to create connection pool (attempt {attempt + 1}/{max_retries}): {e}")
                 time.sleep(retry_delay)
 
-        self._ensure_tables()
+        # Job worker processes skip the DDL checks; the app process has run them
+        if ensure_tables:
+            self._ensure_tables()
 
     def _ensure_tables(self):
         """Create tables if they don't exist."""
@@ -68,12 +72,22 @@ class PostgreSQLJobStore:
                     )
                 ''')
 
+                # Job queue columns (added after the original schema)
+                cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS priority INTEGER DEFAULT 0")
+                cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS queue_position INTEGER")
+
+                # Job ownership: the executor holding a job heartbeats it; attempts counts claims
+                cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS owner TEXT")
+                cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP WITH TIME ZONE")
+                cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 0")
+
                 # Create indexes for better performance
                 indexes = [
                     "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)",
                     "CREATE INDEX IF NOT EXISTS idx_jobs_team_key ON jobs(team_key)",
                     "CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC)",
-                    "CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs(expires_at)"
+                    "CREATE INDEX IF NOT EXISTS idx_jobs_expires_at ON jobs(expires_at)",
+                    "CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, priority DESC, created_at)"
                 ]
 
                 for index in indexes:
@@ -147,6 +161,7 @@ class PostgreSQLJobStore:
                     cur.execute('''
                         SELECT job_id, team_key, team_name, status, progress, message, 
                                error, result, options, output_file, output_dir,
+                               priority, queue_position,
                                created_at, updated_at, completed_at
                         FROM jobs
                         WHERE job_id = %s
@@ -174,7 +189,8 @@ class PostgreSQLJobStore:
         # Expanded list of allowed fields to include ALL job fields
         allowed_fields = {
             'status', 'progress', 'message', 'error', 'result',
-            'team_name', 'output_file', 'output_dir', 'completed_at'
+            'team_name', 'output_file', 'output_dir', 'completed_at',
+            'priority', 'queue_position'
         }
 
         updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
@@ -219,6 +235,74 @@ class PostgreSQLJobStore:
             logger.error(f"Updates attempted: {updates}")
             return False
 
+    def enqueue_job(self, job_id: str, priority: int = 0, owner: Optional[str] = None) -> bool:
+        """Persist a job as queued (held by owner) so it survives restarts."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute('''
+                    UPDATE jobs
+                    SET status = 'queued', priority = %s, queue_position = NULL,
+                        progress = 0, message = 'Waiting in queue...',
+                        owner = %s, heartbeat_at = NOW()
+                    WHERE job_id = %s
+                ''', (priority, owner, job_id))
+                conn.commit()
+                return cur.rowcount > 0
+
+    def claim_job(self, job_id: str, owner: Optional[str] = None) -> bool:
+        """Atomically move a queued job to running. Returns False if it is no longer queued."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute('''
+                    UPDATE jobs
+                    SET status = 'running', queue_position = NULL,
+                        owner = %s, heartbeat_at = NOW(), attempts = COALESCE(attempts, 0) + 1
+                    WHERE job_id = %s AND status = 'queued'
+                ''', (owner, job_id))
+                conn.commit()
+                return cur.rowcount > 0
+
+    def heartbeat_jobs(self, job_ids: List[str], owner: str) -> int:
+        """Mark jobs held by owner as alive. Returns the number of jobs updated."""
+        if not job_ids:
+            return 0
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute('''
+                    UPDATE jobs
+                    SET heartbeat_at = NOW()
+                    WHERE job_id = ANY(%s::uuid[]) AND owner = %s AND status IN ('queued', 'running')
+                ''', (list(job_ids), owner))
+                conn.commit()
+                return cur.rowcount
+
+    def adopt_stale_jobs(self, owner: str, stale_seconds: float) -> List[Dict[str, Any]]:
+        """
+        Take over unexpired queued or running jobs whose owner stopped heartbeating.
+
+        The row update is atomic, so each stale job is adopted by one executor only.
+        Returns the adopted jobs (with the status they were left in) in queue order.
+        """
+        with self._get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute('''
+                    UPDATE jobs
+                    SET owner = %s, heartbeat_at = NOW()
+                    WHERE status IN ('queued', 'running') AND expires_at > NOW()
+                      AND (heartbeat_at IS NULL OR heartbeat_at < NOW() - make_interval(secs => %s))
+                    RETURNING job_id, team_key, status, options, COALESCE(priority, 0) AS priority,
+                              COALESCE(attempts, 0) AS attempts, created_at
+                ''', (owner, stale_seconds))
+                rows = cur.fetchall()
+                conn.commit()
+
+        jobs = []
+        for row in sorted(rows, key=lambda row: (-row['priority'], row['created_at'])):
+            job_data = dict(row)
+            job_data['job_id'] = str(job_data['job_id'])
+            jobs.append(job_data)
+        return jobs
+
     def list_recent_jobs(self, limit: int = 100) -> List[Dict[str, Any]]:
         """List recent jobs."""
         try:
@@ -282,6 +366,7 @@ class PostgreSQLJobStore:
                             COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed,
                             COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed,
                             COUNT(CASE WHEN status = 'running' THEN 1 END) as running,
+                            COUNT(CASE WHEN status = 'queued' THEN 1 END) as queued,
                             COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending
                         FROM jobs
                         WHERE expires_at > NOW()
@@ -295,6 +380,7 @@ class PostgreSQLJobStore:
                 'completed': 0,
                 'failed': 0,
                 'running': 0,
+                'queued': 0,
                 'pending': 0
             }
 
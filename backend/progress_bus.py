@@ -0,0 +1,173 @@
+"""
+Push-based job progress
+JobManager.update_job publishes every update to the ProgressBus; SSE streams
+subscribe per job and only write when an event arrives. With LISTEN/NOTIFY
+enabled, updates are also relayed through PostgreSQL so streams served by
+another instance (or a spawned job process) receive them too.
+"""
+
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+# Bus settings (JOB_EXECUTOR_MODE=process always relays through NOTIFY)
+PROGRESS_BUS_NOTIFY = os.getenv('PROGRESS_BUS_NOTIFY', 'false').lower() == 'true'
+PROGRESS_NOTIFY_CHANNEL = 'job_progress'
+SUBSCRIBER_QUEUE_SIZE = 100
+NOTIFY_PAYLOAD_LIMIT = 7900  # PostgreSQL caps NOTIFY payloads at 8000 bytes
+
+# Event telling subscribers to re-read the job from the store
+RESYNC_EVENT = {'_resync': True}
+
+
+class ProgressBus:
+    """In-process pub/sub of job updates keyed by job ID"""
+
+    def __init__(self):
+        self.instance_id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, set] = {}
+        self._notifier = None
+
+    def subscribe(self, job_id: str) -> queue.Queue:
+        """Start receiving updates for a job; pass the queue to unsubscribe when done"""
+        subscription = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, job_id: str, subscription: queue.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[job_id]
+
+    def publish(self, job_id: str, update: Dict[str, Any]):
+        """Deliver an update to local subscribers (and other instances when NOTIFY is on)"""
+        self._deliver(job_id, update)
+        if self._notifier:
+            self._notifier.notify(job_id, update)
+
+    def _deliver(self, job_id: str, update: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(update)
+            except queue.Full:
+                # Slow reader: drop its backlog and have it re-read the job instead
+                try:
+                    while True:
+                        subscription.get_nowait()
+                except queue.Empty:
+                    pass
+                subscription.put_nowait(RESYNC_EVENT)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            streams = sum(len(subscribers) for subscribers in self._subscribers.values())
+        return {'streams': streams, 'notify': self._notifier is not None}
+
+    def enable_notify(self, database_url: str, channel: str = PROGRESS_NOTIFY_CHANNEL, listen: bool = True):
+        """
+        Relay updates through PostgreSQL LISTEN/NOTIFY
+
+        Args:
+            database_url: PostgreSQL connection string
+            channel: NOTIFY channel
+            listen: Also receive other instances' updates (job worker processes only send)
+        """
+        if self._notifier is None:
+            self._notifier = PostgresNotifier(self, database_url, channel)
+            if listen:
+                self._notifier.start()
+
+
+class PostgresNotifier:
+    """Sends bus updates with pg_notify and feeds notifications from other instances back into the bus"""
+
+    def __init__(self, bus: ProgressBus, database_url: str, channel: str = PROGRESS_NOTIFY_CHANNEL):
+        self.bus = bus
+        self.database_url = database_url
+        self.channel = channel
+        self._send_lock = threading.Lock()
+        self._send_conn = None
+        self._thread = None
+
+    def _connect(self):
+        conn = psycopg2.connect(self.database_url)
+        conn.autocommit = True
+        return conn
+
+    def notify(self, job_id: str, update: Dict[str, Any]):
+        payload = json.dumps({'origin': self.bus.instance_id, 'job_id': job_id, 'update': update}, default=str)
+        if len(payload.encode('utf-8')) > NOTIFY_PAYLOAD_LIMIT:
+            payload = json.dumps({'origin': self.bus.instance_id, 'job_id': job_id, 'update': RESYNC_EVENT})
+
+        with self._send_lock:
+            try:
+                if self._send_conn is None or self._send_conn.closed:
+                    self._send_conn = self._connect()
+                with self._send_conn.cursor() as cur:
+                    cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+            except Exception as e:
+                logger.warning(f"Progress NOTIFY failed for job {job_id}: {e}")
+                self._send_conn = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._listen_loop, name="progress-bus-listener", daemon=True)
+        self._thread.start()
+
+    def _listen_loop(self):
+        """LISTEN forever, reconnecting with backoff"""
+        backoff = 1
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+                logger.info(f"Listening for job progress on '{self.channel}'")
+                backoff = 1
+
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._handle(conn.notifies.pop(0).payload)
+            except Exception as e:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                logger.warning(f"Progress listener disconnected ({e}); retrying in {backoff}s")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+
+    def _handle(self, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get('origin') != self.bus.instance_id:
+            self.bus._deliver(message['job_id'], message.get('update') or RESYNC_EVENT)
+
+
+def is_terminal(job: Optional[Dict[str, Any]]) -> bool:
+    """Whether a job (or update) has finished"""
+    return bool(job) and job.get('status') in ('completed', 'failed')
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Offline test for the materialized hot-brands preview cache
+Uses fake frame loading and computation instead of Snowflake/OpenAI
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add backend directory and project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from hot_brands import HotBrandsPreviewCache, snapshot_fingerprint
+
+TEAM = 'utah_jazz'
+
+
+class FakeWarehouse:
+    def __init__(self):
+        self.merchants = ['Chick-fil-A', 'Lululemon']
+        self.loads = 0
+        self.computes = 0
+
+    def load_frames(self, team_key, team_config, cache_manager=None):
+        self.loads += 1
+        return {
+            'category': pd.DataFrame({'CATEGORY': ['Restaurants', 'Athleisure']}),
+            'subcategory': pd.DataFrame({'SUBCATEGORY': ['QSR', 'Apparel']}),
+            'merchant': pd.DataFrame({'MERCHANT': list(self.merchants)})
+        }
+
+    def compute(self, team_key, team_config, frames, cache_manager=None, logo_manager=None):
+        self.computes += 1
+        return {'team_key': team_key, 'recommendations': frames['merchant']['MERCHANT'].tolist()}
+
+
+def _cache(warehouse, ttl_seconds=60):
+    cache = HotBrandsPreviewCache(ttl_seconds=ttl_seconds, load_frames=warehouse.load_frames,
+                                  compute=warehouse.compute)
+    cache._logo_manager = object()  # never used by the fake compute
+    return cache
+
+
+def test_computed_once_then_served_from_memory():
+    warehouse = FakeWarehouse()
+    cache = _cache(warehouse)
+
+    payload, status = cache.get(TEAM)
+    assert status == 'computed' and payload['recommendations'] == ['Chick-fil-A', 'Lululemon']
+
+    for _ in range(5):
+        assert cache.get(TEAM) == (payload, 'hit')
+    assert warehouse.loads == 1 and warehouse.computes == 1
+    print("✅ Preview computed once and served from memory")
+
+
+def test_stale_refresh_keeps_result_when_snapshot_unchanged():
+    warehouse = FakeWarehouse()
+    cache = _cache(warehouse, ttl_seconds=0)
+    cache.get(TEAM)
+
+    _, status = cache.get(TEAM)
+    assert status == 'stale'
+    _wait_for(lambda: warehouse.loads == 2 and not cache._refreshing)
+    assert warehouse.computes == 1  # same fingerprint: no recompute
+    print("✅ Unchanged view snapshot skips the recompute")
+
+
+def test_changed_snapshot_recomputes():
+    warehouse = FakeWarehouse()
+    cache = _cache(warehouse, ttl_seconds=0)
+    cache.get(TEAM)
+
+    warehouse.merchants = ['In-N-Out', 'Nike']
+    cache.refresh(TEAM)
+    assert warehouse.computes == 2
+    assert cache._entries[TEAM]['payload']['recommendations'] == ['In-N-Out', 'Nike']
+
+    # Forced refresh recomputes even without a change
+    _, status = cache.get(TEAM, force_refresh=True)
+    assert status == 'computed' and warehouse.computes == 3
+    print("✅ Changed view snapshot (or ?refresh=true) recomputes the preview")
+
+
+def test_fingerprint_tracks_content():
+    frames = FakeWarehouse().load_frames(TEAM, {})
+    same = FakeWarehouse().load_frames(TEAM, {})
+    assert snapshot_fingerprint(frames) == snapshot_fingerprint(same)
+
+    same['merchant'].loc[0, 'MERCHANT'] = 'Wendys'
+    assert snapshot_fingerprint(frames) != snapshot_fingerprint(same)
+    print("✅ Fingerprint changes only with view content")
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+if __name__ == "__main__":
+    test_computed_once_then_served_from_memory()
+    test_stale_refresh_keeps_result_when_snapshot_unchanged()
+    test_changed_snapshot_recomputes()
+    test_fingerprint_tracks_content()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Offline test for the bounded job executor
+Uses an in-memory store instead of PostgreSQL
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from job_executor import JobExecutor, QueueFullError, JOB_PRIORITY_MAX, parse_priority
+
+
+class FakeStore:
+    def __init__(self, persisted=None):
+        self.jobs = {job['job_id']: dict(job) for job in (persisted or [])}
+
+    def enqueue_job(self, job_id, priority=0, owner=None):
+        self.jobs.setdefault(job_id, {'job_id': job_id, 'team_key': 'test', 'options': {}})
+        self.jobs[job_id].update(status='queued', priority=priority, owner=owner, heartbeat_age=0)
+        return True
+
+    def claim_job(self, job_id, owner=None):
+        if self.jobs.get(job_id, {}).get('status') != 'queued':
+            return False
+        job = self.jobs[job_id]
+        job.update(status='running', owner=owner, heartbeat_age=0, attempts=job.get('attempts', 0) + 1)
+        return True
+
+    def update_job(self, job_id, **kwargs):
+        self.jobs[job_id].update(kwargs)
+        return True
+
+    def heartbeat_jobs(self, job_ids, owner):
+        return 0
+
+    def adopt_stale_jobs(self, owner, stale_seconds):
+        adopted = []
+        for job in self.jobs.values():
+            age = job.get('heartbeat_age')
+            if job['status'] in ('queued', 'running') and (age is None or age > stale_seconds):
+                job.update(owner=owner, heartbeat_age=0)
+                adopted.append({'attempts': 0, **job})
+        return adopted
+
+class BlockingWorker:
+    """Records run order; each job waits until released"""
+
+    def __init__(self):
+        self.order = []
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+        self.done = threading.Semaphore(0)
+
+    def __call__(self, job_id, team_key, options):
+        self.order.append(job_id)
+        self.started.release()
+        self.release.wait(timeout=5)
+        self.done.release()
+
+
+def _wait(semaphore, count):
+    for _ in range(count):
+        assert semaphore.acquire(timeout=5)
+
+
+def test_priority_then_fifo_with_positions():
+    worker = BlockingWorker()
+    positions = {}
+    executor = JobExecutor(worker, FakeStore(), workers=1, max_queue=10,
+                           on_position=lambda job_id, position: positions.setdefault(job_id, []).append(position))
+    executor.start()
+
+    executor.submit('first', 'test', {})
+    _wait(worker.started, 1)  # the only worker is busy
+
+    assert executor.submit('low-a', 'test', {}) == 1
+    assert executor.submit('low-b', 'test', {}) == 2
+    assert executor.submit('urgent', 'test', {}, priority=5) == 1
+    assert executor.stats()['queued'] == 3 and executor.stats()['active'] == 1
+
+    worker.release.set()
+    _wait(worker.done, 4)
+    executor.shutdown()
+
+    assert worker.order == ['first', 'urgent', 'low-a', 'low-b']
+    assert positions['low-a'] == [1, 2, 1]  # bumped by the urgent job, then moves up
+    assert positions['low-b'] == [2, 3, 2, 1]
+    print("✅ Jobs run by priority, then FIFO, with queue positions reported")
+
+
+def test_queue_limit():
+    worker = BlockingWorker()
+    executor = JobExecutor(worker, FakeStore(), workers=1, max_queue=1)
+    executor.start()
+
+    executor.submit('running', 'test', {})
+    _wait(worker.started, 1)
+    executor.submit('waiting', 'test', {})
+    try:
+        executor.submit('rejected', 'test', {})
+        assert False, "expected QueueFullError"
+    except QueueFullError:
+        pass
+
+    worker.release.set()
+    _wait(worker.done, 2)
+    executor.shutdown()
+    print("✅ Full queue rejects new jobs")
+
+
+def test_queue_limit_holds_under_concurrent_submits():
+    class SlowStore(FakeStore):
+        def enqueue_job(self, job_id, priority=0, owner=None):
+            if job_id == 'db-error':
+                raise RuntimeError("database unavailable")
+            time.sleep(0.05)  # database round trip
+            return super().enqueue_job(job_id, priority, owner)
+
+    worker = BlockingWorker()
+    executor = JobExecutor(worker, SlowStore(), workers=1, max_queue=3)
+    executor.start()
+    executor.submit('running', 'test', {})
+    _wait(worker.started, 1)
+
+    try:
+        executor.submit('db-error', 'test', {})
+        assert False, "expected the store error"
+    except RuntimeError:
+        pass  # its reservation is released
+
+    accepted, rejected = [], []
+
+    def submit(job_id):
+        try:
+            executor.submit(job_id, 'test', {})
+            accepted.append(job_id)
+        except QueueFullError:
+            rejected.append(job_id)
+
+    threads = [threading.Thread(target=submit, args=(f"job-{i}",)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(accepted) == 3 and len(rejected) == 7
+    assert executor.stats()['queued'] == 3
+
+    worker.release.set()
+    _wait(worker.done, 4)
+    executor.shutdown()
+    print("✅ Concurrent submits never exceed the queue limit")
+
+
+def test_recover_persisted_jobs():
+    store = FakeStore([
+        {'job_id': 'interrupted', 'team_key': 'test', 'status': 'running', 'priority': 0, 'options': {},
+         'attempts': 1, 'heartbeat_age': 600},
+        {'job_id': 'waiting', 'team_key': 'test', 'status': 'queued', 'priority': 0, 'options': {}},
+        {'job_id': 'crash-loop', 'team_key': 'test', 'status': 'running', 'priority': 0, 'options': {},
+         'attempts': 2, 'heartbeat_age': 600},
+        {'job_id': 'other-instance', 'team_key': 'test', 'status': 'running', 'priority': 0, 'options': {},
+         'attempts': 1, 'heartbeat_age': 5},
+    ])
+    worker = BlockingWorker()
+    worker.release.set()
+    executor = JobExecutor(worker, store, workers=1)
+
+    assert executor.recover() == 2
+    executor.start()
+    _wait(worker.done, 2)
+    executor.shutdown()
+
+    assert worker.order == ['interrupted', 'waiting']
+    assert store.jobs['crash-loop']['status'] == 'failed'  # out of attempts
+    assert 'interrupted' in store.jobs['crash-loop']['error']
+    assert store.jobs['other-instance']['status'] == 'running'  # still heartbeating elsewhere
+    assert store.jobs['interrupted']['attempts'] == 2
+    print("✅ Stale jobs resume after a restart; live and crash-looping jobs don't")
+
+
+def test_parse_priority():
+    assert parse_priority(None) == 0
+    assert parse_priority('3') == 3 and parse_priority(2.0) == 2
+    assert parse_priority(10 ** 9) == JOB_PRIORITY_MAX  # can't jump every other build
+    assert parse_priority(-7) == 0
+    for bad in ('high', 2.5, True, [1]):
+        try:
+            parse_priority(bad)
+            assert False, f"expected ValueError for {bad!r}"
+        except ValueError:
+            pass
+    print("✅ Client priorities validated and clamped")
+
+
+if __name__ == "__main__":
+    test_priority_then_fifo_with_positions()
+    test_queue_limit()
+    test_queue_limit_holds_under_concurrent_submits()
+    test_recover_persisted_jobs()
+    test_parse_priority()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Offline test for the job body shared by thread and process workers
+The builder is replaced so no Snowflake or PostgreSQL is needed
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add backend directory and project root to path
+backend_dir = Path(__file__).parent.parent
+sys.path.append(str(backend_dir))
+sys.path.append(str(backend_dir.parent))
+
+import job_worker
+
+
+def test_build_report_reports_progress():
+    updates = []
+    builder = mock.Mock()
+    builder.build_presentation.return_value = '/tmp/out/report.pptx'
+    config_manager = mock.Mock()
+    config_manager.get_team_config.return_value = {'team_name': 'Utah Jazz'}
+
+    with mock.patch.object(job_worker, 'TeamConfigManager', return_value=config_manager), \
+            mock.patch.object(job_worker, 'PowerPointBuilder', return_value=builder), \
+            mock.patch.object(job_worker, 'is_connection_healthy', return_value=True):
+        job_worker.build_report('job-1', 'utah_jazz', {'skip_custom': True},
+                                lambda job_id, **fields: updates.append(fields))
+
+    progress = [update['progress'] for update in updates if 'progress' in update]
+    assert progress == sorted(progress) and progress[-1] == 100
+    assert updates[-1]['status'] == 'completed' and updates[-1]['output_file'] == '/tmp/out/report.pptx'
+    assert builder.build_presentation.call_args.kwargs['include_custom_categories'] is False
+    print("✅ build_report reports progress through the callback")
+
+
+def test_build_report_marks_failure():
+    updates = []
+    with mock.patch.object(job_worker, 'TeamConfigManager', side_effect=KeyError('no_such_team')):
+        job_worker.build_report('job-2', 'no_such_team', {}, lambda job_id, **fields: updates.append(fields))
+
+    assert updates[-1]['status'] == 'failed' and 'no_such_team' in updates[-1]['error']
+    print("✅ build_report marks the job failed on errors")
+
+
+def test_process_entry_point_does_not_import_app():
+    # What a spawned worker does when it unpickles process_job
+    code = (
+        "import sys, pickle; "
+        f"sys.path[:0] = [{str(backend_dir)!r}, {str(backend_dir.parent)!r}]; "
+        "fn = pickle.loads(pickle.dumps(__import__('job_worker').process_job)); "
+        "print('app' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, timeout=120)
+    assert result.stdout.strip().splitlines()[-1] == 'False', result.stderr
+    print("✅ Job processes load job_worker without app.py")
+
+
+if __name__ == "__main__":
+    test_build_report_reports_progress()
+    test_build_report_marks_failure()
+    test_process_entry_point_does_not_import_app()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Offline test for the job progress bus
+NOTIFY relay is exercised without PostgreSQL by feeding payloads directly
+"""
+
+import json
+import queue
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from progress_bus import ProgressBus, PostgresNotifier, RESYNC_EVENT, SUBSCRIBER_QUEUE_SIZE, is_terminal
+
+
+def test_updates_reach_only_their_job():
+    bus = ProgressBus()
+    job_a = bus.subscribe('job_a')
+    job_b = bus.subscribe('job_b')
+
+    bus.publish('job_a', {'progress': 50, 'message': 'Building demographics slide...'})
+
+    assert job_a.get_nowait() == {'progress': 50, 'message': 'Building demographics slide...'}
+    assert job_b.empty()
+
+    bus.unsubscribe('job_a', job_a)
+    bus.publish('job_a', {'progress': 60})
+    assert job_a.empty()
+    assert bus.stats() == {'streams': 1, 'notify': False}
+    print("✅ Updates delivered per job, nothing after unsubscribe")
+
+
+def test_slow_reader_gets_resync():
+    bus = ProgressBus()
+    subscription = bus.subscribe('job_a')
+    for progress in range(SUBSCRIBER_QUEUE_SIZE + 1):
+        bus.publish('job_a', {'progress': progress})
+
+    assert subscription.get_nowait() is RESYNC_EVENT
+    try:
+        subscription.get_nowait()
+        assert False, "backlog should have been dropped"
+    except queue.Empty:
+        pass
+    print("✅ Overflowing stream replaced by a single resync event")
+
+
+def test_notifications_from_other_instances():
+    bus = ProgressBus()
+    notifier = PostgresNotifier(bus, database_url='postgresql://unused')
+    subscription = bus.subscribe('job_a')
+
+    notifier._handle(json.dumps({'origin': bus.instance_id, 'job_id': 'job_a', 'update': {'progress': 10}}))
+    assert subscription.empty()  # our own NOTIFY was already delivered locally
+
+    notifier._handle(json.dumps({'origin': 'other', 'job_id': 'job_a', 'update': {'status': 'completed'}}))
+    update = subscription.get_nowait()
+    assert update == {'status': 'completed'} and is_terminal(update)
+    print("✅ Notifications from other instances relayed to local streams")
+
+
+if __name__ == "__main__":
+    test_updates_reach_only_their_job()
+    test_slow_reader_gets_resync()
+    test_notifications_from_other_instances()
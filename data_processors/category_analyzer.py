@@ -11,10 +11,11 @@ from typing import Dict, List, Any, Optional, Tuple, Set
 from pathlib import Path
 import yaml
 import logging
-import asyncio
 from datetime import datetime
 from dataclasses import dataclass
 
+from .merchant_standardization_planner import MerchantStandardizationPlanner
+
 logger = logging.getLogger(__name__)
 
 
@@ -156,12 +157,45 @@ class CategoryAnalyzer:
                          merchant_df: pd.DataFrame,
                          subcategory_last_year_df: pd.DataFrame = None,
                          merchant_last_year_df: pd.DataFrame = None,
-                         validate: bool = True) -> Dict[str, Any]:
+                         validate: bool = True,
+                         category_config: Optional[Dict[str, Any]] = None,
+                         name_mapping: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """
         OPTIMIZED: Analyze category with selective merchant standardization
+
+        Args:
+            category_config: Optional explicit config (e.g., for custom categories).
+                Passing it avoids mutating self.categories, so concurrent calls are safe.
+            name_mapping: Optional pre-resolved merchant name mapping (see
+                MerchantStandardizationPlanner); the standardizer is called if omitted
+        """
+        prepared = self.prepare_category(
+            category_key, category_df, subcategory_df, merchant_df,
+            subcategory_last_year_df, merchant_last_year_df,
+            category_config=category_config
+        )
+        return self.analyze_prepared_category(prepared, validate=validate, name_mapping=name_mapping)
+
+    def prepare_category(self,
+                         category_key: str,
+                         category_df: pd.DataFrame,
+                         subcategory_df: pd.DataFrame,
+                         merchant_df: pd.DataFrame,
+                         subcategory_last_year_df: pd.DataFrame = None,
+                         merchant_last_year_df: pd.DataFrame = None,
+                         category_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Clean and filter category data and identify the merchants that need standardization
+
+        First phase of analyze_category, split out so a build can collect
+        merchants_to_standardize from every category before calling the API.
+
+        Returns:
+            Prepared data for analyze_prepared_category
         """
         # Get category configuration
-        category_config = self.categories.get(category_key)
+        if category_config is None:
+            category_config = self.categories.get(category_key)
         if not category_config:
             raise ValueError(f"Unknown category: {category_key}")
 
@@ -192,12 +226,54 @@ class CategoryAnalyzer:
         logger.info(f"🎯 Identified {len(merchants_to_standardize)} merchants to standardize "
                     f"(out of {len(filtered_merchant_df['MERCHANT'].unique()) if not filtered_merchant_df.empty else 0} filtered merchants)")
 
+        return {
+            'category_key': category_key,
+            'category_config': category_config,
+            'category_df': category_df,
+            'subcategory_df': subcategory_df,
+            'merchant_df': merchant_df,
+            'subcategory_last_year_df': subcategory_last_year_df,
+            'filtered_merchant_df': filtered_merchant_df,
+            'filtered_merchant_last_year_df': filtered_merchant_last_year_df,
+            'merchants_to_standardize': merchants_to_standardize
+        }
+
+    def analyze_prepared_category(self, prepared: Dict[str, Any], validate: bool = True,
+                                  name_mapping: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Second phase of analyze_category: standardize selected merchants and build results
+
+        Args:
+            prepared: Output of prepare_category
+            validate: Whether to validate metrics and results
+            name_mapping: Optional pre-resolved merchant name mapping
+
+        Returns:
+            Category analysis results
+        """
+        category_key = prepared['category_key']
+        category_config = prepared['category_config']
+        category_df = prepared['category_df']
+        subcategory_df = prepared['subcategory_df']
+        merchant_df = prepared['merchant_df']
+        subcategory_last_year_df = prepared['subcategory_last_year_df']
+        filtered_merchant_df = prepared['filtered_merchant_df']
+        filtered_merchant_last_year_df = prepared['filtered_merchant_last_year_df']
+        merchants_to_standardize = prepared['merchants_to_standardize']
+
         # OPTIMIZATION: Only standardize the merchants we need
         if merchants_to_standardize and self.standardizer:
-            filtered_merchant_df = self._standardize_selected_merchants(filtered_merchant_df, merchants_to_standardize)
+            if name_mapping is None:
+                planner = MerchantStandardizationPlanner(self.standardizer)
+                planner.add(merchants_to_standardize)
+                name_mapping = planner.resolve()
+
+            filtered_merchant_df = self._standardize_selected_merchants(
+                filtered_merchant_df, merchants_to_standardize, name_mapping
+            )
             if filtered_merchant_last_year_df is not None and not filtered_merchant_last_year_df.empty:
                 filtered_merchant_last_year_df = self._standardize_selected_merchants(
-                    filtered_merchant_last_year_df, merchants_to_standardize
+                    filtered_merchant_last_year_df, merchants_to_standardize, name_mapping
                 )
 
         # Store raw data for validation (AFTER selective standardization)
@@ -324,13 +400,15 @@ class CategoryAnalyzer:
 
     def _standardize_selected_merchants(self,
                                         df: pd.DataFrame,
-                                        merchants_to_standardize: Set[str]) -> pd.DataFrame:
+                                        merchants_to_standardize: Set[str],
+                                        name_mapping: Dict[str, str]) -> pd.DataFrame:
         """
         OPTIMIZATION: Only standardize specific merchants instead of all
 
         Args:
             df: DataFrame with MERCHANT column
             merchants_to_standardize: Set of merchant names to standardize
+            name_mapping: Resolved mapping (may cover other categories' merchants too)
 
         Returns:
             DataFrame with selected merchants standardized
@@ -338,44 +416,10 @@ class CategoryAnalyzer:
         if 'MERCHANT' not in df.columns or df.empty or not merchants_to_standardize:
             return df
 
-        try:
-            # Create a copy to avoid modifying original
-            df = df.copy()
-
-            # Preserve original names
-            df['MERCHANT_ORIGINAL'] = df['MERCHANT'].copy()
-
-            # Convert set to list for API call
-            merchants_list = list(merchants_to_standardize)
-
-            logger.info(f"🔄 Standardizing {len(merchants_list)} selected merchants...")
-
-            # Get standardized mapping for ONLY the merchants we need
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                name_mapping = loop.run_until_complete(
-                    self.standardizer.standardize_merchants(merchants_list)
-                )
-            finally:
-                loop.close()
-
-            # Apply mapping ONLY to the rows with these merchants
-            for original, standardized in name_mapping.items():
-                df.loc[df['MERCHANT'] == original, 'MERCHANT'] = standardized
-
-            logger.info(f"✅ Standardized {len(name_mapping)} merchant names")
-
-            # Log performance stats
-            if hasattr(self.standardizer, 'log_performance'):
-                self.standardizer.log_performance()
-
-            return df
-
-        except Exception as e:
-            logger.warning(f"⚠️ Merchant standardization failed: {e}")
-            return df
+        # Apply mapping ONLY to the merchants selected for this category
+        selected_mapping = {name: name_mapping[name] for name in merchants_to_standardize
+                            if name in name_mapping}
+        return MerchantStandardizationPlanner.apply(df, selected_mapping)
 
     def _clean_dataframe(self, df: pd.DataFrame):
         """Clean dataframe in place"""
@@ -822,15 +866,18 @@ class CategoryAnalyzer:
                 f"with {subcategory_name} when compared to the NBA average"
             )
 
-    def _get_standardized_name_from_table(self, merchant_name: str, merchant_table: pd.DataFrame) -> str:
+    def _get_standardized_name_from_table(self, merchant_name: str, merchant_table: pd.DataFrame,
+                                          merchant_df: Optional[pd.DataFrame] = None) -> str:
         """Get the standardized merchant name from the table"""
         exact_match = merchant_table[merchant_table['Brand'] == merchant_name]
         if not exact_match.empty:
             return merchant_name
 
-        if hasattr(self, 'raw_data') and 'merchant' in self.raw_data:
+        # Prefer the frame from the current call; self.raw_data is shared across concurrent calls
+        if merchant_df is None and hasattr(self, 'raw_data') and 'merchant' in self.raw_data:
             merchant_df = self.raw_data['merchant']
 
+        if merchant_df is not None:
             if 'MERCHANT_ORIGINAL' in merchant_df.columns:
                 matching_rows = merchant_df[merchant_df['MERCHANT_ORIGINAL'] == merchant_name]
                 if not matching_rows.empty:
@@ -868,7 +915,7 @@ class CategoryAnalyzer:
 
         if highest_ppc_merchant:
             standardized_name = self._get_standardized_name_from_table(
-                highest_ppc_merchant['merchant'], merchant_table
+                highest_ppc_merchant['merchant'], merchant_table, merchant_df
             )
 
             insights.append(
@@ -889,7 +936,7 @@ class CategoryAnalyzer:
                 formatted_spc = f"${spc_value:.2f}"
 
             standardized_name = self._get_standardized_name_from_table(
-                highest_spc_merchant['merchant'], merchant_table
+                highest_spc_merchant['merchant'], merchant_table, merchant_df
             )
 
             insights.append(
@@ -900,7 +947,7 @@ class CategoryAnalyzer:
         best_nba_merchant = self._find_best_nba_comparison(merchant_df, top_merchants)
         if best_nba_merchant:
             standardized_name = self._get_standardized_name_from_table(
-                best_nba_merchant['merchant'], merchant_table
+                best_nba_merchant['merchant'], merchant_table, merchant_df
             )
 
             insights.append(
@@ -6,6 +6,7 @@ Now includes AI-powered insights generation and ethnicity processing.
 FIXED VERSION: Handles null values in ETHNIC_GROUP column.
 UPDATED: Filters out 'Retired' and 'Other' from occupation charts.
 UPDATED: Removed all hardcoded team references
+UPDATED: Accepts pre-aggregated GROUPING SETS data (see build_aggregated_query)
 """
 
 import pandas as pd
@@ -67,6 +68,77 @@ class DemographicsProcessor:
     # Ethnicity categories
     ETHNICITY_ORDER = ['White', 'Hispanic', 'African American', 'Asian', 'Other']
 
+    # Attributes summed per community in aggregated mode
+    AGGREGATED_ATTRIBUTES = [
+        'GENERATION',
+        'INCOME_LEVELS',
+        'OCCUPATION_CATEGORY',
+        'GENDER',
+        'CHILDREN_HH',
+        'ETHNIC_GROUP'
+    ]
+
+    # Column naming the attribute a pre-aggregated row is grouped by (NULL = community total)
+    GROUPED_BY_COLUMN = 'GROUPED_BY'
+
+    @classmethod
+    def build_aggregated_query(cls, view_name: str) -> str:
+        """
+        Build a single GROUPING SETS query returning customer counts per
+        community x attribute, plus one total row per community
+
+        Args:
+            view_name: Demographics view name
+
+        Returns:
+            SQL for the compact frame accepted by DemographicsProcessor
+        """
+        attributes = cls.AGGREGATED_ATTRIBUTES
+        grouped_by = "\n".join(
+            f"            WHEN GROUPING({attr}) = 0 THEN '{attr}'" for attr in attributes
+        )
+        grouping_sets = ",\n".join(f"            (COMMUNITY, {attr})" for attr in attributes)
+
+        return f"""
+        SELECT
+            COMMUNITY,
+            {', '.join(attributes)},
+            CASE
+{grouped_by}
+            END AS {cls.GROUPED_BY_COLUMN},
+            SUM(CUSTOMER_COUNT) AS CUSTOMER_COUNT
+        FROM {view_name}
+        GROUP BY GROUPING SETS (
+            (COMMUNITY),
+{grouping_sets}
+        )
+        """
+
+    @classmethod
+    def aggregate(cls, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the same compact frame as build_aggregated_query from row-level data
+        (for file inputs; Snowflake builds it server-side)
+
+        Args:
+            data: Row-level demographics data
+
+        Returns:
+            Pre-aggregated frame
+        """
+        totals = data.groupby('COMMUNITY', dropna=False)['CUSTOMER_COUNT'].sum().reset_index()
+        totals[cls.GROUPED_BY_COLUMN] = None
+        parts = [totals]
+
+        for attr in cls.AGGREGATED_ATTRIBUTES:
+            if attr not in data.columns:
+                continue
+            part = data.groupby(['COMMUNITY', attr], dropna=False)['CUSTOMER_COUNT'].sum().reset_index()
+            part[cls.GROUPED_BY_COLUMN] = attr
+            parts.append(part)
+
+        return pd.concat(parts, ignore_index=True)
+
     def __init__(self, data_source: Union[str, Path, pd.DataFrame],
                  team_name: str,
                  league: str,
@@ -107,8 +179,9 @@ class DemographicsProcessor:
             self.comparison_population = self.communities[1]
             logger.warning(f"No comparison_population provided, using fallback: {self.comparison_population}")
 
-        # Load and validate data
+        # Load and validate data (row-level or pre-aggregated)
         self.data = self._load_data(data_source)
+        self.is_aggregated = self.GROUPED_BY_COLUMN in self.data.columns
         self._validate_data()
 
         # Cache for expensive computations
@@ -160,13 +233,29 @@ class DemographicsProcessor:
 
         # Log data summary
         total_rows = len(self.data)
-        total_customers = self.data['CUSTOMER_COUNT'].sum()
-        logger.info(f"Loaded {total_rows:,} rows representing {total_customers:,} customers")
+        total_customers = self._get_total_customers()
+        logger.info(f"Loaded {total_rows:,} {'aggregated ' if self.is_aggregated else ''}rows "
+                    f"representing {total_customers:,} customers")
+
+    def _get_attribute_rows(self, attribute: str) -> pd.DataFrame:
+        """Rows to sum for an attribute (aggregated mode keeps only that grouping set)"""
+        if not self.is_aggregated:
+            return self.data
+        return self.data[self.data[self.GROUPED_BY_COLUMN] == attribute]
+
+    def _get_total_customers(self):
+        """Total customer count across all rows"""
+        if not self.is_aggregated:
+            return self.data['CUSTOMER_COUNT'].sum()
+        return self.data.loc[self.data[self.GROUPED_BY_COLUMN].isna(), 'CUSTOMER_COUNT'].sum()
 
     @lru_cache(maxsize=1)
     def _get_community_totals(self) -> pd.Series:
         """Get total customer counts by community (cached)"""
-        return self.data.groupby('COMMUNITY')['CUSTOMER_COUNT'].sum()
+        data = self.data
+        if self.is_aggregated:
+            data = data[data[self.GROUPED_BY_COLUMN].isna()]
+        return data.groupby('COMMUNITY')['CUSTOMER_COUNT'].sum()
 
     def _calculate_percentages(self, attribute: str,
                                categories: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
@@ -182,7 +271,7 @@ class DemographicsProcessor:
             Dict with structure: {community: {category: percentage}}
         """
         # Group by community and attribute, sum customer counts
-        grouped = self.data.groupby(['COMMUNITY', attribute])['CUSTOMER_COUNT'].sum()
+        grouped = self._get_attribute_rows(attribute).groupby(['COMMUNITY', attribute])['CUSTOMER_COUNT'].sum()
 
         # Get community totals
         community_totals = self._get_community_totals()
@@ -326,7 +415,7 @@ class DemographicsProcessor:
     def process_children(self) -> Dict[str, Any]:
         """Process children in household distribution"""
         # Group by community and children flag directly
-        grouped = self.data.groupby(['COMMUNITY', 'CHILDREN_HH'])['CUSTOMER_COUNT'].sum()
+        grouped = self._get_attribute_rows('CHILDREN_HH').groupby(['COMMUNITY', 'CHILDREN_HH'])['CUSTOMER_COUNT'].sum()
         community_totals = self._get_community_totals()
 
         # Calculate percentages
@@ -366,7 +455,7 @@ class DemographicsProcessor:
 
         # MINIMAL NULL FIX: Handle nulls before processing
         logger.info("Processing ethnicity data...")
-        null_count = self.data['ETHNIC_GROUP'].isnull().sum()
+        null_count = self._get_attribute_rows('ETHNIC_GROUP')['ETHNIC_GROUP'].isnull().sum()
 
         if null_count > 0:
             logger.info(f"Found {null_count:,} null values in ETHNIC_GROUP, replacing with 'Unknown'")
@@ -381,7 +470,7 @@ class DemographicsProcessor:
             logger.info("No null values found in ETHNIC_GROUP")
 
         # Get unique ethnic groups from data
-        unique_groups = self.data['ETHNIC_GROUP'].dropna().unique()
+        unique_groups = self._get_attribute_rows('ETHNIC_GROUP')['ETHNIC_GROUP'].dropna().unique()
         logger.info(f"Found ethnic groups: {unique_groups}")
 
         try:
@@ -500,7 +589,7 @@ class DemographicsProcessor:
             'team_name': self.team_name,
             'league': self.league,
             'communities': self.communities,
-            'total_sample_size': self.data['CUSTOMER_COUNT'].sum(),
+            'total_sample_size': self._get_total_customers(),
             'demographics': demographic_results,
             'key_insights': key_insights
         }
@@ -5,13 +5,15 @@ Enhanced with OpenAI-powered merchant name standardization
 FIXED VERSION - properly overwrites MERCHANT column with standardized names
 UPDATED - removed all hardcoded team references
 FIXED - Changed COMMUNITY_GROUP to COMMUNITY to match actual column names
+UPDATED - top communities memoized per ranker; communities + merchants in one CTE query
 """
 
 import pandas as pd
 import yaml
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any
+import threading
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -41,6 +43,11 @@ class MerchantRanker:
         # Store cache_manager
         self.cache_manager = cache_manager
 
+        # Top communities memo for this ranker's lifetime (one build / request),
+        # keyed by (comparison_pop, min_audience_pct, top_n)
+        self._top_communities_memo: Dict[Tuple[str, float, int], pd.DataFrame] = {}
+        self._memo_lock = threading.Lock()
+
         # Store comparison population - no default!
         self.comparison_population = comparison_population
         if not self.comparison_population:
@@ -159,14 +166,9 @@ class MerchantRanker:
         if not comparison_pop:
             raise ValueError("comparison_pop must be provided or set in instance")
 
-        # Build the IN clause for approved communities
-        if self.approved_communities:
-            communities_list = "', '".join(self.approved_communities)
-            community_filter = f"AND COMMUNITY IN ('{communities_list}')"  # FIXED: Changed from COMMUNITY_GROUP
-        else:
-            # If no approved communities loaded, use old exclusion logic
-            logger.warning("No approved communities loaded, using exclusion logic")
-            community_filter = self._get_exclusion_filter()
+        memoized = self._get_memoized_communities(comparison_pop, min_audience_pct, top_n)
+        if memoized is not None:
+            return memoized
 
         query = f"""
         SELECT 
@@ -179,7 +181,7 @@ class MerchantRanker:
         WHERE 
             COMPARISON_POPULATION = '{comparison_pop}'
             AND PERC_AUDIENCE >= {min_audience_pct}
-            {community_filter}
+            {self._get_community_filter()}
         ORDER BY COMPOSITE_INDEX DESC
         LIMIT {top_n}
         """
@@ -191,10 +193,42 @@ class MerchantRanker:
         # Import here to avoid circular imports
         from data_processors.snowflake_connector import query_to_dataframe
 
-        df = query_to_dataframe(query)
+        df = query_to_dataframe(query, cache_manager=self.cache_manager)
         logger.info(f"Found {len(df)} communities")
 
-        return df
+        self._memoize_communities(comparison_pop, min_audience_pct, top_n, df)
+        return df.copy()
+
+    def _get_memoized_communities(self, comparison_pop: str, min_audience_pct: float,
+                                  top_n: int) -> Optional[pd.DataFrame]:
+        """Copy of a memoized get_top_communities result, or None"""
+        with self._memo_lock:
+            df = self._top_communities_memo.get((comparison_pop, min_audience_pct, top_n))
+        if df is None:
+            return None
+        logger.info(f"Using memoized top {top_n} communities ({comparison_pop})")
+        return df.copy()
+
+    def _memoize_communities(self, comparison_pop: str, min_audience_pct: float,
+                             top_n: int, df: pd.DataFrame):
+        with self._memo_lock:
+            self._top_communities_memo[(comparison_pop, min_audience_pct, top_n)] = df.copy()
+
+    def clear_memo(self):
+        """Drop memoized query results (e.g., before reusing the ranker for a new request)"""
+        with self._memo_lock:
+            self._top_communities_memo.clear()
+
+    def _get_community_filter(self) -> str:
+        """Approved-communities IN clause (or the old exclusion filter as fallback)"""
+        # Build the IN clause for approved communities
+        if self.approved_communities:
+            communities_list = "', '".join(self.approved_communities)
+            return f"AND COMMUNITY IN ('{communities_list}')"  # FIXED: Changed from COMMUNITY_GROUP
+
+        # If no approved communities loaded, use old exclusion logic
+        logger.warning("No approved communities loaded, using exclusion logic")
+        return self._get_exclusion_filter()
 
     def _get_exclusion_filter(self):
         """Get the old exclusion filter as fallback"""
@@ -242,19 +276,7 @@ class MerchantRanker:
         # Format communities for SQL
         communities_list = "', '".join(communities)
 
-        # Add exclusion for Live Entertainment Seekers professional sports
-        exclusion_clause = ""
-        if exclude_live_entertainment_sports:
-            exclusion_clause = """
-                AND NOT (COMMUNITY = 'Live Entertainment Seekers' 
-                        AND LOWER(SUBCATEGORY) LIKE '%professional sports%')
-            """
-
-        # ADD THIS: Merchant exclusion clause
-        merchant_exclusion = ""
-        if self.EXCLUDED_MERCHANTS:
-            excluded_list = "', '".join([m.upper() for m in self.EXCLUDED_MERCHANTS])
-            merchant_exclusion = f"AND UPPER(MERCHANT) NOT IN ('{excluded_list}')"
+        exclusion_clause, merchant_exclusion = self._get_merchant_filters(exclude_live_entertainment_sports)
 
         # UPDATE THE QUERY to include merchant exclusion
         query = f"""
@@ -293,6 +315,37 @@ class MerchantRanker:
 
         logger.info(f"Fetching top merchants for {len(communities)} communities")
         logger.info(f"Comparison population: {comparison_pop}")
+        self._log_merchant_filters(exclude_live_entertainment_sports)
+
+        from data_processors.snowflake_connector import query_to_dataframe
+
+        df = query_to_dataframe(query, cache_manager=self.cache_manager)
+        logger.info(f"Found {len(df)} merchant-community pairs")
+
+        # STANDARDIZE MERCHANT NAMES (MERCHANT column will be overwritten)
+        df = self.standardize_merchant_data(df)
+
+        return df
+
+    def _get_merchant_filters(self, exclude_live_entertainment_sports: bool) -> Tuple[str, str]:
+        """Live Entertainment Seekers sports exclusion and excluded-merchant clauses"""
+        # Add exclusion for Live Entertainment Seekers professional sports
+        exclusion_clause = ""
+        if exclude_live_entertainment_sports:
+            exclusion_clause = """
+                AND NOT (COMMUNITY = 'Live Entertainment Seekers' 
+                        AND LOWER(SUBCATEGORY) LIKE '%professional sports%')
+            """
+
+        # ADD THIS: Merchant exclusion clause
+        merchant_exclusion = ""
+        if self.EXCLUDED_MERCHANTS:
+            excluded_list = "', '".join([m.upper() for m in self.EXCLUDED_MERCHANTS])
+            merchant_exclusion = f"AND UPPER(MERCHANT) NOT IN ('{excluded_list}')"
+
+        return exclusion_clause, merchant_exclusion
+
+    def _log_merchant_filters(self, exclude_live_entertainment_sports: bool):
         if exclude_live_entertainment_sports:
             logger.info("Excluding professional sports subcategory from Live Entertainment Seekers")
         logger.info("Ranking merchants by PERC_AUDIENCE")
@@ -301,15 +354,138 @@ class MerchantRanker:
         if self.EXCLUDED_MERCHANTS:
             logger.info(f"Excluding merchants: {self.EXCLUDED_MERCHANTS}")
 
+    def get_top_communities_with_merchants(self,
+                                           min_audience_pct: float = 0.20,
+                                           top_n: int = 10,
+                                           comparison_pop: str = None,
+                                           min_audience_count: int = 10,
+                                           top_n_per_community: int = 1,
+                                           exclude_live_entertainment_sports: bool = True
+                                           ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Get top communities and their top merchants in one round trip (single CTE query)
+
+        Args:
+            min_audience_pct: Minimum audience percentage threshold (20%)
+            top_n: Number of top communities to return
+            comparison_pop: Comparison population name (uses instance default if not provided)
+            min_audience_count: Minimum merchant audience count
+            top_n_per_community: Merchants to keep per community
+            exclude_live_entertainment_sports: Drop professional sports for Live Entertainment Seekers
+
+        Returns:
+            Tuple of (get_top_communities result, get_top_merchants_for_communities result)
+        """
+        # Use instance comparison_population if not provided
+        if comparison_pop is None:
+            comparison_pop = self.comparison_population
+
+        if not comparison_pop:
+            raise ValueError("comparison_pop must be provided or set in instance")
+
+        # Communities already known: only the merchants are left to fetch
+        communities_df = self._get_memoized_communities(comparison_pop, min_audience_pct, top_n)
+        if communities_df is not None:
+            if communities_df.empty:
+                return communities_df, pd.DataFrame()
+            merchants_df = self.get_top_merchants_for_communities(
+                communities=communities_df['COMMUNITY'].tolist(),
+                comparison_pop=comparison_pop,
+                min_audience_count=min_audience_count,
+                top_n_per_community=top_n_per_community,
+                exclude_live_entertainment_sports=exclude_live_entertainment_sports
+            )
+            return communities_df, merchants_df
+
+        exclusion_clause, merchant_exclusion = self._get_merchant_filters(exclude_live_entertainment_sports)
+
+        query = f"""
+        WITH top_communities AS (
+            SELECT 
+                COMMUNITY,
+                PERC_AUDIENCE,
+                PERC_INDEX,
+                COMPOSITE_INDEX
+            FROM {self.community_view}
+            WHERE 
+                COMPARISON_POPULATION = '{comparison_pop}'
+                AND PERC_AUDIENCE >= {min_audience_pct}
+                {self._get_community_filter()}
+            ORDER BY COMPOSITE_INDEX DESC
+            LIMIT {top_n}
+        ),
+        ranked_merchants AS (
+            SELECT 
+                COMMUNITY,
+                MERCHANT,
+                CATEGORY,
+                SUBCATEGORY,
+                PERC_INDEX,
+                PERC_AUDIENCE,
+                AUDIENCE_TOTAL_SPEND,
+                AUDIENCE_COUNT,
+                ROW_NUMBER() OVER (PARTITION BY COMMUNITY ORDER BY PERC_AUDIENCE DESC) as rank
+            FROM {self.merchant_view}
+            WHERE 
+                COMMUNITY IN (SELECT COMMUNITY FROM top_communities)
+                AND COMPARISON_POPULATION = '{comparison_pop}'
+                AND AUDIENCE_COUNT >= {min_audience_count}
+                {exclusion_clause}
+                {merchant_exclusion}
+        )
+        SELECT 
+            c.COMMUNITY,
+            c.PERC_AUDIENCE AS COMMUNITY_PERC_AUDIENCE,
+            c.PERC_INDEX AS COMMUNITY_PERC_INDEX,
+            c.COMPOSITE_INDEX AS COMMUNITY_COMPOSITE_INDEX,
+            m.MERCHANT,
+            m.CATEGORY,
+            m.SUBCATEGORY,
+            m.PERC_INDEX,
+            m.PERC_AUDIENCE,
+            m.AUDIENCE_TOTAL_SPEND,
+            m.AUDIENCE_COUNT
+        FROM top_communities c
+        LEFT JOIN ranked_merchants m
+            ON m.COMMUNITY = c.COMMUNITY
+            AND m.rank <= {top_n_per_community}
+        ORDER BY c.COMPOSITE_INDEX DESC, m.PERC_AUDIENCE DESC
+        """
+
+        logger.info(f"Fetching top {top_n} communities and their top {top_n_per_community} merchants")
+        logger.info(f"Filter: PERC_AUDIENCE >= {min_audience_pct * 100}%")
+        logger.info(f"Comparison population: {comparison_pop}")
+        self._log_merchant_filters(exclude_live_entertainment_sports)
+
         from data_processors.snowflake_connector import query_to_dataframe
 
-        df = query_to_dataframe(query)
-        logger.info(f"Found {len(df)} merchant-community pairs")
+        df = query_to_dataframe(query, cache_manager=self.cache_manager)
+
+        # Split the joined rows back into the two result shapes
+        communities_df = (
+            df[['COMMUNITY', 'COMMUNITY_PERC_AUDIENCE', 'COMMUNITY_PERC_INDEX', 'COMMUNITY_COMPOSITE_INDEX']]
+            .drop_duplicates('COMMUNITY')
+            .rename(columns={
+                'COMMUNITY_PERC_AUDIENCE': 'PERC_AUDIENCE',
+                'COMMUNITY_PERC_INDEX': 'PERC_INDEX',
+                'COMMUNITY_COMPOSITE_INDEX': 'COMPOSITE_INDEX'
+            })
+            .reset_index(drop=True)
+        )
+        merchants_df = (
+            df.loc[df['MERCHANT'].notna(), ['COMMUNITY', 'MERCHANT', 'CATEGORY', 'SUBCATEGORY', 'PERC_INDEX',
+                                            'PERC_AUDIENCE', 'AUDIENCE_TOTAL_SPEND', 'AUDIENCE_COUNT']]
+            .sort_values('PERC_AUDIENCE', ascending=False, kind='stable')
+            .reset_index(drop=True)
+        )
+        logger.info(f"Found {len(communities_df)} communities, {len(merchants_df)} merchant-community pairs")
+
+        self._memoize_communities(comparison_pop, min_audience_pct, top_n, communities_df)
 
         # STANDARDIZE MERCHANT NAMES (MERCHANT column will be overwritten)
-        df = self.standardize_merchant_data(df)
+        merchants_df = self.standardize_merchant_data(merchants_df)
 
-        return df
+        return communities_df, merchants_df
 
     def get_fan_wheel_data(self,
                            min_audience_pct: float = 0.20,
@@ -327,25 +503,19 @@ class MerchantRanker:
         Returns:
             DataFrame with one unique merchant per community for fan wheel
         """
-        # Get top communities
-        communities_df = self.get_top_communities(
+        # Get top communities and their top N merchants in one query
+        # (fetch more merchants than needed for fallback)
+        communities_df, merchants_df = self.get_top_communities_with_merchants(
             min_audience_pct=min_audience_pct,
             top_n=top_n_communities,
-            comparison_pop=comparison_pop
-        )
-
-        if communities_df.empty:
-            raise ValueError("No communities found matching criteria")
-
-        # Get top N merchants for each community (fetch more than needed for fallback)
-        communities = communities_df['COMMUNITY'].tolist()
-        merchants_df = self.get_top_merchants_for_communities(
-            communities=communities,
             comparison_pop=comparison_pop,
             top_n_per_community=5,  # Fetch top 5 to have fallback options
             exclude_live_entertainment_sports=True
         )
 
+        if communities_df.empty:
+            raise ValueError("No communities found matching criteria")
+
         # Merge community data with merchant data
         merchants_with_community_data = merchants_df.merge(
             communities_df[['COMMUNITY', 'PERC_INDEX', 'COMPOSITE_INDEX']].rename(
@@ -358,46 +528,65 @@ class MerchantRanker:
             how='left'
         )
 
-        # Implement greedy selection to ensure unique merchants
-        selected_merchants = {}  # {community: merchant_row}
-        used_merchants = set()
+        # Greedy selection to ensure unique merchants
+        result = self._assign_unique_merchants(merchants_with_community_data, communities_df)
 
-        # Sort by COMPOSITE_INDEX to prioritize higher-value communities
-        communities_sorted = communities_df.sort_values('COMPOSITE_INDEX', ascending=False)
+        # Generate behavior text using approved communities action verbs
+        verbs = {community: self.community_actions.get(community, 'Shops at')
+                 for community in result['COMMUNITY'].unique()}
+        result['behavior'] = [
+            self._format_behavior(verbs[community], merchant)
+            for community, merchant in zip(result['COMMUNITY'], result['MERCHANT'])
+        ]
 
-        for _, community_row in communities_sorted.iterrows():
-            community = community_row['COMMUNITY']
+        return result
 
-            # Get all merchants for this community, sorted by PERC_AUDIENCE
-            community_merchants = merchants_with_community_data[
-                merchants_with_community_data['COMMUNITY'] == community
-                ].sort_values('PERC_AUDIENCE', ascending=False)
+    @staticmethod
+    def _assign_unique_merchants(merchants_df: pd.DataFrame,
+                                 communities_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Assign each community its highest-PERC_AUDIENCE merchant not already taken
+        by a higher COMPOSITE_INDEX community
 
-            # Find the first merchant not yet used
-            for _, merchant_row in community_merchants.iterrows():
-                merchant = merchant_row['MERCHANT']
+        Args:
+            merchants_df: Candidate merchants (COMMUNITY, MERCHANT, PERC_AUDIENCE, ...)
+            communities_df: Communities with COMPOSITE_INDEX
 
-                if merchant not in used_merchants:
-                    selected_merchants[community] = merchant_row
-                    used_merchants.add(merchant)
-                    break
-            else:
+        Returns:
+            One row of merchants_df per assigned community, in community rank order
+        """
+        # Sort by COMPOSITE_INDEX to prioritize higher-value communities
+        ranked = communities_df.sort_values('COMPOSITE_INDEX', ascending=False)['COMMUNITY'].tolist()
+        community_rank = {community: rank for rank, community in enumerate(ranked)}
+
+        # One sort: community rank, then PERC_AUDIENCE descending within each community
+        candidates = merchants_df.assign(_RANK=merchants_df['COMMUNITY'].map(community_rank))
+        candidates = candidates[candidates['_RANK'].notna()]
+        candidates = (candidates.sort_values('PERC_AUDIENCE', ascending=False, kind='stable')
+                      .sort_values('_RANK', kind='stable'))
+
+        # Single pass: first unused merchant for each community
+        communities = candidates['COMMUNITY'].to_numpy()
+        merchants = candidates['MERCHANT'].to_numpy()
+        selected = {}  # {community: position in candidates}
+        used_merchants = set()
+
+        for position in range(len(candidates)):
+            community = communities[position]
+            if community in selected or merchants[position] in used_merchants:
+                continue
+            selected[community] = position
+            used_merchants.add(merchants[position])
+
+        for community in ranked:
+            if community not in selected:
                 # If all merchants are used, log warning and skip this community
                 logger.warning(f"No unique merchant found for community: {community}")
 
-        # Convert selected merchants to DataFrame
-        if not selected_merchants:
+        if not selected:
             raise ValueError("No unique merchants could be assigned to communities")
 
-        result = pd.DataFrame(list(selected_merchants.values()))
-
-        # Generate behavior text using approved communities action verbs
-        result['behavior'] = result.apply(
-            lambda row: self._generate_behavior_from_community(row['COMMUNITY'], row['MERCHANT']),
-            axis=1
-        )
-
-        return result
+        return candidates.iloc[list(selected.values())].drop(columns='_RANK')
 
     def _generate_behavior_from_community(self, community: str, merchant: str) -> str:
         """
@@ -413,7 +602,11 @@ class MerchantRanker:
         """
         # Get action verb from approved communities
         action = self.community_actions.get(community, 'Shops at')
+        return self._format_behavior(action, merchant)
 
+    @staticmethod
+    def _format_behavior(action: str, merchant: str) -> str:
+        """Format '<action> <merchant>' on two lines for the fan wheel"""
         # Format behavior text
         behavior = f"{action} {merchant}"
         words = behavior.split()
@@ -507,7 +700,7 @@ class MerchantRanker:
         """
 
         from data_processors.snowflake_connector import query_to_dataframe
-        df = query_to_dataframe(query)
+        df = query_to_dataframe(query, cache_manager=self.cache_manager)
 
         # STANDARDIZE MERCHANT NAMES (MERCHANT column will be overwritten)
         df = self.standardize_merchant_data(df)
@@ -0,0 +1,88 @@
+# data_processors/merchant_standardization_planner.py
+"""
+Build-level merchant name standardization
+Collects the merchants every category will display, resolves them in one
+cache lookup + one parallel API pass, and applies the mapping per category
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class MerchantStandardizationPlanner:
+    """Dedupes merchant names across categories and standardizes them once"""
+
+    def __init__(self, standardizer: Optional[Any]):
+        """
+        Initialize an empty plan
+
+        Args:
+            standardizer: MerchantNameStandardizer (None disables standardization)
+        """
+        self.standardizer = standardizer
+        self._names: Dict[str, None] = {}  # insertion-ordered set
+        self.mapping: Dict[str, str] = {}
+
+    def add(self, merchant_names: Iterable[str]):
+        """Add merchant names (e.g., one category's _identify_merchants_to_standardize output)"""
+        for name in merchant_names:
+            if name is not None and name not in self.mapping:
+                self._names[name] = None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def resolve(self) -> Dict[str, str]:
+        """
+        Standardize all pending names in a single standardize_merchants call
+
+        Returns:
+            Mapping of every name resolved so far (failures leave names unmapped)
+        """
+        names = list(self._names)
+        if not names or self.standardizer is None:
+            return self.mapping
+
+        logger.info(f"🔄 Standardizing {len(names)} unique merchants for the build...")
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self.mapping.update(loop.run_until_complete(self.standardizer.standardize_merchants(names)))
+            self._names.clear()
+            logger.info(f"✅ Standardized {len(names)} merchant names")
+
+            # Log performance stats
+            if hasattr(self.standardizer, 'log_performance'):
+                self.standardizer.log_performance()
+        except Exception as e:
+            logger.warning(f"⚠️ Merchant standardization failed: {e}")
+        finally:
+            loop.close()
+
+        return self.mapping
+
+    @staticmethod
+    def apply(df: pd.DataFrame, name_mapping: Dict[str, str]) -> pd.DataFrame:
+        """
+        Apply a name mapping to the MERCHANT column (vectorized)
+
+        Returns:
+            Copy of df with MERCHANT_ORIGINAL preserved and MERCHANT overwritten
+        """
+        if 'MERCHANT' not in df.columns or df.empty:
+            return df
+
+        df = df.copy()
+        df['MERCHANT_ORIGINAL'] = df['MERCHANT'].copy()
+
+        if name_mapping:
+            mapped = df['MERCHANT'].map(name_mapping)
+            df['MERCHANT'] = mapped.where(mapped.notna(), df['MERCHANT'])
+
+        return df
@@ -3,6 +3,14 @@
 Centralized Snowflake connection manager for Sports Innovation Lab
 Handles authentication and provides reusable connection/query functions
 ENHANCED with connection pooling for better performance
+UPDATED: The pool is owned by the host process (warm_pool at startup, close_pool at exit);
+builds borrow connections and never close it
+UPDATED: Cheap validation (is_closed/age first, SELECT 1 only after idle time),
+background reaper for idle/expired connections, and pool counters via stats()
+UPDATED: get_pool_metrics() reports acquire latency, active/idle connections,
+connection ages and per-view query counts/durations for health endpoints
+UPDATED: ConnectionHealth caches the last connectivity check (TTL + background
+refresh) so builds no longer run test_connection() as a per-job preflight
 """
 
 import os
@@ -15,9 +23,12 @@ from dotenv import load_dotenv
 import logging
 import threading
 import queue
+import re
 import time
 from contextlib import contextmanager
-from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -26,11 +37,54 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Pool validation/reaping settings (seconds)
+POOL_VALIDATION_IDLE_SECONDS = int(os.getenv('SNOWFLAKE_POOL_VALIDATION_IDLE_SECONDS', '60'))
+POOL_IDLE_TIMEOUT_SECONDS = int(os.getenv('SNOWFLAKE_POOL_IDLE_TIMEOUT_SECONDS', '900'))
+POOL_REAPER_INTERVAL_SECONDS = int(os.getenv('SNOWFLAKE_POOL_REAPER_INTERVAL_SECONDS', '60'))
+
+# Connection health cache: successes trusted for the TTL, failures re-checked sooner
+CONNECTION_HEALTH_TTL_SECONDS = int(os.getenv('SNOWFLAKE_HEALTH_TTL_SECONDS', '300'))
+CONNECTION_HEALTH_FAILURE_TTL_SECONDS = int(os.getenv('SNOWFLAKE_HEALTH_FAILURE_TTL_SECONDS', '30'))
+
+# Upper bounds (ms) of the acquire latency histogram buckets
+ACQUIRE_LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000, 30000)
+
+
+class _LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram (milliseconds)"""
+
+    def __init__(self, bounds=ACQUIRE_LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self._lock = threading.Lock()
+        self._buckets = [0] * (len(self.bounds) + 1)
+        self._count = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def observe(self, ms):
+        index = next((i for i, bound in enumerate(self.bounds) if ms <= bound), len(self.bounds))
+        with self._lock:
+            self._buckets[index] += 1
+            self._count += 1
+            self._total_ms += ms
+            self._max_ms = max(self._max_ms, ms)
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f"le_{bound}" for bound in self.bounds] + [f"gt_{self.bounds[-1]}"]
+            return {
+                'count': self._count,
+                'avg_ms': round(self._total_ms / self._count, 2) if self._count else 0.0,
+                'max_ms': round(self._max_ms, 2),
+                'buckets': dict(zip(labels, self._buckets))
+            }
+
 
 class SnowflakeConnectionPool:
     """Thread-safe connection pool for Snowflake"""
 
-    def __init__(self, min_connections=5, max_connections=20, connection_lifetime=3600):
+    def __init__(self, min_connections=5, max_connections=20, connection_lifetime=3600,
+                 validation_idle_seconds=None, idle_timeout=None, reaper_interval=None):
         """
         Initialize connection pool
 
@@ -38,10 +92,17 @@ class SnowflakeConnectionPool:
             min_connections: Minimum number of connections to maintain
             max_connections: Maximum number of connections allowed
             connection_lifetime: How long a connection can live (seconds)
+            validation_idle_seconds: Skip the SELECT 1 ping for connections used more recently than this
+            idle_timeout: Reaper closes connections idle longer than this (down to min_connections)
+            reaper_interval: Seconds between reaper passes (0 disables the reaper)
         """
         self.min_connections = min_connections
         self.max_connections = max_connections
         self.connection_lifetime = connection_lifetime
+        self.validation_idle_seconds = (POOL_VALIDATION_IDLE_SECONDS if validation_idle_seconds is None
+                                        else validation_idle_seconds)
+        self.idle_timeout = POOL_IDLE_TIMEOUT_SECONDS if idle_timeout is None else idle_timeout
+        self.reaper_interval = POOL_REAPER_INTERVAL_SECONDS if reaper_interval is None else reaper_interval
 
         # Thread-safe queue to hold available connections
         self._pool = queue.Queue(maxsize=max_connections)
@@ -53,6 +114,22 @@ class SnowflakeConnectionPool:
         # Connection parameters (will be set on first use)
         self._conn_params = None
 
+        # Background reaper (started with the first connections)
+        self._reaper_thread = None
+        self._reaper_stop = threading.Event()
+
+        # Counters reported by stats()
+        self._acquire_latency = _LatencyHistogram()
+        self._stats_lock = threading.Lock()
+        self._counters = {
+            'pings': 0,
+            'pings_skipped': 0,
+            'ping_failures': 0,
+            'evictions': 0,
+            'waits': 0,
+            'wait_timeouts': 0
+        }
+
         logger.info(f"Initializing connection pool (min={min_connections}, max={max_connections})")
 
     def _create_connection_params(self):
@@ -150,40 +227,189 @@ class SnowflakeConnectionPool:
 
         conn = snowflake.connector.connect(**self._conn_params)
         conn._created_time = time.time()  # Track creation time
+        conn._last_used = conn._created_time
         return conn
 
-    def _is_connection_valid(self, conn):
-        """Check if a connection is still valid"""
+    def _count(self, counter, n=1):
+        """Increment a pool counter"""
+        with self._stats_lock:
+            self._counters[counter] += n
+
+    def stats(self):
+        """
+        Snapshot of pool size, acquire latency, connection ages and counters
+
+        Returns:
+            Dict with active/idle connection counts, the acquire latency
+            histogram, connection age summary and ping/eviction/wait counters
+        """
+        with self._stats_lock:
+            counters = dict(self._counters)
+
+        now = time.time()
+        with self._lock:
+            connections = self._created_connections
+            ages = sorted(now - conn._created_time for conn in self._all_connections
+                          if hasattr(conn, '_created_time'))
+        idle = self._pool.qsize()
+
+        return {
+            'connections': connections,
+            'active': max(connections - idle, 0),
+            'idle': idle,
+            'max_connections': self.max_connections,
+            'acquire_latency_ms': self._acquire_latency.snapshot(),
+            'connection_age_seconds': {
+                'min': round(ages[0], 1),
+                'median': round(ages[len(ages) // 2], 1),
+                'max': round(ages[-1], 1)
+            } if ages else {},
+            **counters
+        }
+
+    @staticmethod
+    def _idle_seconds(conn, now):
+        """Seconds since the connection was last returned (or created)"""
+        return now - getattr(conn, '_last_used', getattr(conn, '_created_time', now))
+
+    def _is_connection_valid(self, conn, ping=True):
+        """
+        Check if a connection is still valid
+
+        Cheap checks (closed flag, age) run first; the SELECT 1 round trip only
+        happens when ping is set and the connection has sat idle for
+        validation_idle_seconds.
+        """
         try:
-            # Check if connection is alive
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
+            if hasattr(conn, 'is_closed') and conn.is_closed():
+                logger.debug("Connection is closed")
+                return False
 
             # Check connection age
+            now = time.time()
             if hasattr(conn, '_created_time'):
-                age = time.time() - conn._created_time
+                age = now - conn._created_time
                 if age > self.connection_lifetime:
                     logger.debug(f"Connection exceeded lifetime ({age:.0f}s)")
                     return False
 
+            if not ping:
+                return True
+
+            if self._idle_seconds(conn, now) < self.validation_idle_seconds:
+                self._count('pings_skipped')
+                return True
+        except Exception:
+            return False
+
+        # Check if connection is alive
+        self._count('pings')
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
             return True
         except Exception:
+            self._count('ping_failures')
             return False
 
-    def _ensure_min_connections(self):
-        """Ensure minimum number of connections exist"""
+    def _discard_connection(self, conn):
+        """Drop a connection from the pool's bookkeeping and close it"""
         with self._lock:
-            while self._created_connections < self.min_connections and not self._closed:
-                try:
-                    conn = self._create_connection()
-                    self._pool.put(conn)
+            if conn in self._all_connections:
+                self._all_connections.remove(conn)
+                self._created_connections -= 1
+        self._count('evictions')
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _start_reaper(self):
+        """Start the idle/expired connection reaper (once per pool)"""
+        if self.reaper_interval <= 0:
+            return
+        with self._lock:
+            if self._closed or self._reaper_thread is not None:
+                return
+            self._reaper_thread = threading.Thread(target=self._reaper_loop,
+                                                   name="snowflake-pool-reaper", daemon=True)
+        self._reaper_thread.start()
+
+    def _reaper_loop(self):
+        while not self._reaper_stop.wait(self.reaper_interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.warning(f"Connection reaper pass failed: {e}")
+
+    def reap(self):
+        """
+        Close idle connections that are closed, expired, or idle past
+        idle_timeout (the last only while above min_connections), then top
+        the pool back up to min_connections
+
+        Returns:
+            Number of connections evicted
+        """
+        if self._closed:
+            return 0
+
+        # Check idle connections one at a time so the rest stay available to
+        # get_connection; each is visited at most once (put back at the tail)
+        evicted = 0
+        for _ in range(self._pool.qsize()):
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break  # borrowed meanwhile; in-use connections are never touched
+
+            with self._lock:
+                spare = self._created_connections - self.min_connections
+
+            if not self._is_connection_valid(conn, ping=False) or (
+                    spare > 0 and self._idle_seconds(conn, time.time()) > self.idle_timeout):
+                self._discard_connection(conn)
+                evicted += 1
+            else:
+                self._pool.put_nowait(conn)
+
+        if evicted:
+            logger.debug(f"Reaper evicted {evicted} connection(s)")
+            self._ensure_min_connections()
+        return evicted
+
+    def _ensure_min_connections(self):
+        """Ensure minimum number of connections exist (connects outside the lock)"""
+        self._start_reaper()
+        while True:
+            # Reserve a slot so concurrent callers don't over-create
+            with self._lock:
+                if self._closed or self._created_connections >= self.min_connections:
+                    return
+                self._created_connections += 1
+
+            try:
+                conn = self._create_connection()
+            except Exception as e:
+                with self._lock:
+                    self._created_connections -= 1
+                logger.error(f"Failed to create connection: {e}")
+                return
+
+            with self._lock:
+                if self._closed:
+                    self._created_connections -= 1
+                else:
                     self._all_connections.append(conn)
-                    self._created_connections += 1
+                    self._pool.put(conn)
                     logger.debug(f"Created connection {self._created_connections}/{self.min_connections}")
-                except Exception as e:
-                    logger.error(f"Failed to create connection: {e}")
-                    break
+                    continue
+            try:
+                conn.close()
+            except Exception:
+                pass
+            return
 
     def get_connection(self, timeout=30):
         """
@@ -195,6 +421,14 @@ class SnowflakeConnectionPool:
         Returns:
             Snowflake connection object
         """
+        start = time.perf_counter()
+        try:
+            return self._acquire(timeout)
+        finally:
+            self._acquire_latency.observe((time.perf_counter() - start) * 1000)
+
+    def _acquire(self, timeout):
+        """Reuse, create or wait for a connection (see get_connection)"""
         if self._closed:
             raise RuntimeError("Connection pool is closed")
 
@@ -214,13 +448,7 @@ class SnowflakeConnectionPool:
             else:
                 # Connection is dead, remove it
                 logger.debug("Removing invalid connection")
-                with self._lock:
-                    self._all_connections.remove(conn)
-                    self._created_connections -= 1
-                try:
-                    conn.close()
-                except:
-                    pass
+                self._discard_connection(conn)
         except queue.Empty:
             pass
 
@@ -239,14 +467,17 @@ class SnowflakeConnectionPool:
 
         # Max connections reached, wait for one to be returned
         logger.debug(f"Waiting for connection (timeout={timeout}s)")
+        self._count('waits')
         try:
             conn = self._pool.get(timeout=timeout)
             if self._is_connection_valid(conn):
                 return conn
             else:
                 # Recursive call to try again
-                return self.get_connection(timeout=timeout)
+                self._discard_connection(conn)
+                return self._acquire(timeout)
         except queue.Empty:
+            self._count('wait_timeouts')
             raise RuntimeError(f"No connection available within {timeout} seconds")
 
     def return_connection(self, conn):
@@ -262,37 +493,26 @@ class SnowflakeConnectionPool:
         if conn is None:
             return
 
-        # Check if connection is still valid before returning to pool
-        if self._is_connection_valid(conn):
+        # It was just used, so only the cheap checks run here (no ping)
+        if self._is_connection_valid(conn, ping=False):
+            conn._last_used = time.time()
             try:
                 self._pool.put_nowait(conn)
                 logger.debug("Returned connection to pool")
             except queue.Full:
                 # Pool is full, close the connection
                 logger.debug("Pool full, closing connection")
-                with self._lock:
-                    self._all_connections.remove(conn)
-                    self._created_connections -= 1
-                try:
-                    conn.close()
-                except:
-                    pass
+                self._discard_connection(conn)
         else:
             # Connection is invalid, close it
             logger.debug("Invalid connection, closing")
-            with self._lock:
-                if conn in self._all_connections:
-                    self._all_connections.remove(conn)
-                    self._created_connections -= 1
-            try:
-                conn.close()
-            except:
-                pass
+            self._discard_connection(conn)
 
     def close_all(self):
         """Close all connections and shut down the pool"""
         logger.info("Closing connection pool")
         self._closed = True
+        self._reaper_stop.set()
 
         # Close all connections
         with self._lock:
@@ -315,22 +535,62 @@ class SnowflakeConnectionPool:
             self._created_connections = 0
 
 
+# Global pool sizing (also used to bound concurrent query workers elsewhere)
+DEFAULT_MIN_CONNECTIONS = 5
+DEFAULT_MAX_CONNECTIONS = 20
+
 # Create a global connection pool instance
 _connection_pool = None
+_connection_pool_lock = threading.Lock()
 
 
 def _get_pool():
     """Get or create the global connection pool"""
     global _connection_pool
     if _connection_pool is None:
-        _connection_pool = SnowflakeConnectionPool(
-            min_connections=5,
-            max_connections=20,
-            connection_lifetime=3600  # 1 hour
-        )
+        with _connection_pool_lock:
+            if _connection_pool is None:
+                _connection_pool = SnowflakeConnectionPool(
+                    min_connections=DEFAULT_MIN_CONNECTIONS,
+                    max_connections=DEFAULT_MAX_CONNECTIONS,
+                    connection_lifetime=3600  # 1 hour
+                )
     return _connection_pool
 
 
+def warm_pool(background: bool = True) -> Optional[threading.Thread]:
+    """
+    Open the pool's minimum connections ahead of the first query
+    (call once at process startup)
+
+    Args:
+        background: Connect on a daemon thread instead of blocking the caller
+
+    Returns:
+        The warmup thread when running in the background
+    """
+    def _warm():
+        start = time.time()
+        try:
+            pool = _get_pool()
+            pool._ensure_min_connections()
+            if pool._created_connections:
+                _connection_health.record(True)
+            logger.info(f"✅ Snowflake pool warmed: {pool._created_connections} connections "
+                        f"in {time.time() - start:.1f}s")
+        except Exception as e:
+            _connection_health.record(False, str(e))
+            logger.warning(f"Snowflake pool warmup failed (connections will open on demand): {e}")
+
+    if not background:
+        _warm()
+        return None
+
+    thread = threading.Thread(target=_warm, name="snowflake-pool-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 @contextmanager
 def get_connection():
     """
@@ -351,24 +611,167 @@ def get_connection():
             pool.return_connection(conn)
 
 
-def query_to_dataframe(query, params=None):
+# Per-view query metrics (warehouse round trips vs result cache hits)
+_query_metrics: Dict[str, Dict[str, float]] = {}
+_query_metrics_lock = threading.Lock()
+
+
+def _record_query(view_name: str, duration_ms: Optional[float] = None,
+                  error: bool = False, cache_hit: bool = False):
+    """Accumulate query count/duration for a view"""
+    with _query_metrics_lock:
+        entry = _query_metrics.setdefault(view_name, {
+            'count': 0, 'errors': 0, 'cache_hits': 0, 'total_ms': 0.0, 'max_ms': 0.0
+        })
+        if cache_hit:
+            entry['cache_hits'] += 1
+            return
+        entry['count'] += 1
+        entry['errors'] += int(error)
+        if duration_ms is not None:
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """
+    Structured pool and query metrics for health endpoints
+
+    Returns:
+        Dict with the pool snapshot (or status 'not_initialized') and
+        per-view query count, errors, cache hits and durations
+    """
+    pool = _connection_pool
+    with _query_metrics_lock:
+        queries = {
+            view: {
+                'count': entry['count'],
+                'errors': entry['errors'],
+                'cache_hits': entry['cache_hits'],
+                'avg_ms': round(entry['total_ms'] / entry['count'], 1) if entry['count'] else 0.0,
+                'max_ms': round(entry['max_ms'], 1)
+            }
+            for view, entry in sorted(_query_metrics.items())
+        }
+    return {
+        'pool': pool.stats() if pool else {'status': 'not_initialized'},
+        'queries': queries
+    }
+
+
+# Result cache settings (team views refresh at most daily)
+SNOWFLAKE_CACHE_TTL_HOURS = int(os.getenv('SNOWFLAKE_CACHE_TTL_HOURS', '24'))
+
+_FROM_PATTERN = re.compile(r'\bFROM\s+([A-Za-z0-9_."$]+)', re.IGNORECASE)
+
+
+def _normalize_query(query: str) -> str:
+    """Collapse whitespace so formatting differences share a cache entry"""
+    return ' '.join(query.split()).rstrip(';').strip()
+
+
+def _query_view_name(query: str) -> str:
+    """First view/table referenced in a query (used for cache metadata)"""
+    match = _FROM_PATTERN.search(query)
+    return match.group(1).strip('"') if match else 'query'
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convert a single non-native cell value to a JSON-safe value"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if hasattr(value, 'item'):  # numpy scalar
+        return value.item()
+    return value
+
+
+def _frame_to_cache_payload(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Encode a DataFrame in a compact columnar form for the result cache
+
+    Column names and values are stored once per column instead of once per row,
+    and dtypes are kept so the frame can be rebuilt exactly on a cache hit.
+    """
+    data = []
+    for name in df.columns:
+        col = df[name]
+        if pd.api.types.is_datetime64_any_dtype(col):
+            values = [None if pd.isna(v) else v.isoformat() for v in col]
+        else:
+            values = [None if pd.api.types.is_scalar(v) and pd.isna(v) else _to_json_value(v)
+                      for v in col.tolist()]
+        data.append(values)
+
+    return {
+        'columns': [str(name) for name in df.columns],
+        'dtypes': [str(dtype) for dtype in df.dtypes],
+        'data': data,
+    }
+
+
+def _frame_from_cache_payload(payload: Dict[str, Any]) -> pd.DataFrame:
+    """Rebuild a DataFrame (with original dtypes) from a cached payload"""
+    columns = payload['columns']
+    df = pd.DataFrame({name: values for name, values in zip(columns, payload['data'])}, columns=columns)
+
+    for name, dtype in zip(columns, payload['dtypes']):
+        try:
+            if dtype.startswith('datetime64'):
+                df[name] = pd.to_datetime(df[name], utc=',' in dtype, format='ISO8601').astype(dtype)
+            elif str(df[name].dtype) != dtype:
+                df[name] = df[name].astype(dtype)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Could not restore dtype {dtype} for {name}: {e}")
+
+    return df
+
+
+def query_to_dataframe(query, params=None, cache_manager: Optional[Any] = None,
+                       team_key: Optional[str] = None,
+                       cache_ttl_hours: int = SNOWFLAKE_CACHE_TTL_HOURS):
     """
     Execute a query and return results as a pandas DataFrame
     Now uses connection pooling for better performance
+    UPDATED: Optional PostgreSQL result cache via CacheManager
 
     Args:
         query (str): SQL query to execute
         params (dict): Optional query parameters
+        cache_manager: Optional CacheManager; results are cached by normalized SQL + view name
+        team_key: Optional team identifier recorded with cached results
+        cache_ttl_hours: Time to live for cached results
 
     Returns:
         pd.DataFrame: Query results
     """
+    view_name = _query_view_name(query)
+    cache_key_args = None
+    if cache_manager is not None:
+        cache_key_args = {
+            'query_template': _normalize_query(query),
+            'team_key': team_key,
+            'view_name': view_name,
+            'query_params': params,
+        }
+        try:
+            cached = cache_manager.get_snowflake_result(**cache_key_args)
+            if isinstance(cached, dict) and 'columns' in cached:
+                _record_query(view_name, cache_hit=True)
+                return _frame_from_cache_payload(cached)
+        except Exception as e:
+            logger.warning(f"Snowflake cache lookup failed, querying warehouse: {e}")
+
     conn = None
     pool = _get_pool()
+    start_time = time.time()
+    query_start = None
 
     try:
         # Get connection from pool
         conn = pool.get_connection()
+        query_start = time.perf_counter()
         cursor = conn.cursor()
 
         if params:
@@ -379,17 +782,186 @@ def query_to_dataframe(query, params=None):
         # Fetch results into DataFrame
         df = cursor.fetch_pandas_all()
         cursor.close()
-
-        return df
+        _record_query(view_name, (time.perf_counter() - query_start) * 1000)
+        _connection_health.record(True)
 
     except Exception as e:
         logger.error(f"Query failed: {str(e)}")
+        _record_query(view_name, (time.perf_counter() - query_start) * 1000 if query_start else None,
+                      error=True)
         raise
     finally:
         if conn:
             # Return connection to pool instead of closing
             pool.return_connection(conn)
 
+    if cache_key_args is not None:
+        try:
+            cache_manager.set_snowflake_result(
+                result_data=_frame_to_cache_payload(df),
+                row_count=len(df),
+                query_duration_ms=int((time.time() - start_time) * 1000),
+                ttl_hours=cache_ttl_hours,
+                **cache_key_args
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache Snowflake result: {e}")
+
+    return df
+
+
+class ConnectionHealth:
+    """
+    Cached Snowflake connectivity state
+
+    Successful warehouse queries and periodic SELECT 1 probes keep the state
+    fresh, so callers can ask is_healthy() per job without a round trip. Only
+    the very first check, or a check after a cached failure has expired, runs
+    a probe synchronously.
+    """
+
+    def __init__(self, ttl_seconds=None, failure_ttl_seconds=None, probe=None):
+        """
+        Args:
+            ttl_seconds: How long a successful check stays fresh
+            failure_ttl_seconds: How long a failed check makes callers fail fast
+            probe: Callable that raises if Snowflake is unreachable (default: SELECT 1 on a pooled connection)
+        """
+        self.ttl_seconds = CONNECTION_HEALTH_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.failure_ttl_seconds = (CONNECTION_HEALTH_FAILURE_TTL_SECONDS if failure_ttl_seconds is None
+                                    else failure_ttl_seconds)
+        self._probe = probe or self._select_one
+        self._lock = threading.Lock()
+        self._healthy = None
+        self._checked_at = None
+        self._error = None
+        self._refreshing = False
+        self._monitor_thread = None
+
+    @staticmethod
+    def _select_one():
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+
+    def record(self, healthy: bool, error: Optional[str] = None):
+        """Store the outcome of a check (or of a real query)"""
+        with self._lock:
+            self._healthy = healthy
+            self._checked_at = time.time()
+            self._error = None if healthy else error
+
+    def refresh(self) -> bool:
+        """Probe Snowflake now and cache the result"""
+        try:
+            self._probe()
+            self.record(True)
+        except Exception as e:
+            logger.warning(f"Snowflake health check failed: {e}")
+            self.record(False, str(e))
+        finally:
+            with self._lock:
+                self._refreshing = False
+        return self._healthy
+
+    def refresh_async(self):
+        """Refresh on a daemon thread unless a refresh is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="snowflake-health-refresh", daemon=True).start()
+
+    def is_healthy(self) -> bool:
+        """
+        Cached connectivity answer for job preflight
+
+        Returns:
+            False only when the last check failed (fail fast); a stale success
+            is trusted while a background refresh runs
+        """
+        with self._lock:
+            healthy, checked_at = self._healthy, self._checked_at
+
+        if healthy is None:
+            return self.refresh()
+
+        age = time.time() - checked_at
+        if healthy:
+            if age > self.ttl_seconds:
+                self.refresh_async()
+            return True
+        if age > self.failure_ttl_seconds:
+            return self.refresh()
+        return False
+
+    @property
+    def last_error(self) -> Optional[str]:
+        return self._error
+
+    def start_monitor(self, interval: Optional[float] = None) -> threading.Thread:
+        """
+        Refresh the cached state every interval seconds on a daemon thread
+
+        Args:
+            interval: Seconds between probes (defaults to the success TTL)
+
+        Returns:
+            The monitor thread
+        """
+        interval = interval or self.ttl_seconds
+        with self._lock:
+            if self._monitor_thread is not None:
+                return self._monitor_thread
+
+            def _monitor():
+                while True:
+                    with self._lock:
+                        checked_at = self._checked_at
+                    # Real queries count as checks, so only probe when the state is stale
+                    if checked_at is None or time.time() - checked_at >= interval:
+                        self.refresh()
+                    time.sleep(interval)
+
+            self._monitor_thread = threading.Thread(target=_monitor, name="snowflake-health-monitor", daemon=True)
+        self._monitor_thread.start()
+        return self._monitor_thread
+
+    def status(self) -> Dict[str, Any]:
+        """Cached state for health endpoints"""
+        with self._lock:
+            healthy, checked_at, error = self._healthy, self._checked_at, self._error
+        return {
+            'healthy': healthy,
+            'checked_at': datetime.fromtimestamp(checked_at).isoformat() if checked_at else None,
+            'age_seconds': round(time.time() - checked_at, 1) if checked_at else None,
+            'error': error
+        }
+
+
+_connection_health = ConnectionHealth()
+
+
+def is_connection_healthy() -> bool:
+    """Cached Snowflake connectivity check for job preflight (see ConnectionHealth)"""
+    return _connection_health.is_healthy()
+
+
+def connection_health_error() -> Optional[str]:
+    """Error from the last failed connectivity check"""
+    return _connection_health.last_error
+
+
+def get_connection_health() -> Dict[str, Any]:
+    """Cached connectivity state for health endpoints"""
+    return _connection_health.status()
+
+
+def start_health_monitor(interval: Optional[float] = None) -> threading.Thread:
+    """Keep the cached connectivity state fresh in the background (call once at startup)"""
+    return _connection_health.start_monitor(interval)
+
 
 def test_connection():
     """Test Snowflake connection (now tests pool)"""
@@ -419,6 +991,9 @@ def test_connection():
             print(f"\n📊 Connection Pool Status:")
             print(f"   Active connections: {pool._created_connections}")
             print(f"   Available in pool: {pool._pool.qsize()}")
+            stats = pool.stats()
+            print(f"   Pings: {stats['pings']} (skipped {stats['pings_skipped']}), "
+                  f"evictions: {stats['evictions']}, waits: {stats['waits']}")
 
         return True
     except Exception as e:
@@ -427,11 +1002,12 @@ def test_connection():
 
 
 def close_pool():
-    """Close the connection pool (call at application shutdown)"""
+    """Close the connection pool (call at application shutdown, never per build)"""
     global _connection_pool
-    if _connection_pool:
-        _connection_pool.close_all()
-        _connection_pool = None
+    with _connection_pool_lock:
+        pool, _connection_pool = _connection_pool, None
+    if pool:
+        pool.close_all()
 
 
 if __name__ == "__main__":
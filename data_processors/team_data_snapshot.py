@@ -0,0 +1,177 @@
+# data_processors/team_data_snapshot.py
+"""
+Build-scoped snapshot of a team's indexing views
+Fetches each indexing view once per build and slices it in memory per category,
+replacing the per-category TRIM(CATEGORY) = ... round trips
+"""
+
+import logging
+import threading
+from concurrent.futures import Executor, wait
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .snowflake_connector import query_to_dataframe
+
+logger = logging.getLogger(__name__)
+
+
+class TeamDataSnapshot:
+    """In-memory copy of the five team indexing views, indexed by trimmed category"""
+
+    # Snapshot key -> view suffix
+    VIEWS = {
+        'category': 'CATEGORY_INDEXING_ALL_TIME',
+        'subcategory': 'SUBCATEGORY_INDEXING_ALL_TIME',
+        'merchant': 'MERCHANT_INDEXING_ALL_TIME',
+        'subcategory_last_year': 'SUBCATEGORY_INDEXING_LAST_FULL_YEAR',
+        'merchant_last_year': 'MERCHANT_INDEXING_LAST_FULL_YEAR',
+    }
+
+    # Views that the per-category queries filtered by AUDIENCE and ordered by PERC_AUDIENCE
+    MERCHANT_VIEWS = ('merchant', 'merchant_last_year')
+
+    def __init__(self, view_prefix: str, cache_manager: Optional[Any] = None,
+                 team_key: Optional[str] = None):
+        """
+        Initialize an empty snapshot (views are fetched lazily on first use)
+
+        Args:
+            view_prefix: Team view prefix (e.g., 'V_UTAH_JAZZ_SIL')
+            cache_manager: Optional CacheManager for the Snowflake result cache
+            team_key: Optional team identifier recorded with cached results
+        """
+        self.view_prefix = view_prefix
+        self.cache_manager = cache_manager
+        self.team_key = team_key
+
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._category_index: Dict[str, Dict[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self._view_locks = {key: threading.Lock() for key in self.VIEWS}
+
+    def view_name(self, key: str) -> str:
+        """Full Snowflake view name for a snapshot key"""
+        return f"{self.view_prefix}_{self.VIEWS[key]}"
+
+    def load(self, keys: Optional[List[str]] = None, executor: Optional[Executor] = None):
+        """
+        Eagerly fetch views (all five by default)
+
+        Args:
+            keys: Optional subset of snapshot keys to fetch
+            executor: Optional executor to fetch the views concurrently
+        """
+        keys = list(keys or self.VIEWS)
+
+        if executor is None:
+            for key in keys:
+                self._get_frame(key)
+            return
+
+        # Let every fetch settle, then re-raise the first failure
+        futures = [executor.submit(self._get_frame, key) for key in keys]
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def _get_frame(self, key: str) -> pd.DataFrame:
+        """Fetch a view on first access and build its category index"""
+        if key not in self.VIEWS:
+            raise ValueError(f"Unknown snapshot view: {key}")
+
+        if key in self._frames:
+            return self._frames[key]
+
+        # Per-view lock so concurrent callers wait for a single fetch
+        with self._view_locks[key]:
+            if key in self._frames:
+                return self._frames[key]
+
+            view_name = self.view_name(key)
+            logger.info(f"Snapshot: loading {view_name}")
+            df = query_to_dataframe(f"SELECT * FROM {view_name}",
+                                    cache_manager=self.cache_manager, team_key=self.team_key)
+
+            if 'CATEGORY' in df.columns and not df.empty:
+                trimmed = df['CATEGORY'].astype(str).str.strip()
+                index = trimmed.groupby(trimmed, sort=False).indices
+            else:
+                index = {}
+
+            with self._lock:
+                self._category_index[key] = index
+                self._frames[key] = df
+
+            logger.info(f"Snapshot: {view_name} → {len(df):,} rows, {len(index)} categories")
+            return df
+
+    def get_view(self, key: str) -> pd.DataFrame:
+        """
+        Get a copy of a full view
+
+        Args:
+            key: Snapshot key (e.g., 'category', 'merchant')
+
+        Returns:
+            Copy of the full view DataFrame
+        """
+        return self._get_frame(key).copy()
+
+    def get_slice(self, key: str, category_names: List[str],
+                  audience_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get the rows of a view matching any of the given category names
+
+        Equivalent to ``SELECT * FROM <view> WHERE TRIM(CATEGORY) = ... OR ...``.
+        Merchant views are additionally filtered to ``audience_name`` and ordered
+        by PERC_AUDIENCE descending, matching the original per-category queries.
+
+        Args:
+            key: Snapshot key
+            category_names: Category names as they appear in data
+            audience_name: Audience filter for merchant views
+
+        Returns:
+            New DataFrame (safe to modify in place)
+        """
+        df = self._get_frame(key)
+        index = self._category_index.get(key, {})
+
+        names = dict.fromkeys(name.strip() for name in category_names)
+        positions = [index[name] for name in names if name in index]
+        if not positions:
+            return df.iloc[0:0].copy()
+
+        rows = np.sort(np.concatenate(positions))
+        result = df.take(rows)
+
+        if key in self.MERCHANT_VIEWS:
+            if audience_name is not None and 'AUDIENCE' in result.columns:
+                result = result[result['AUDIENCE'] == audience_name]
+            if 'PERC_AUDIENCE' in result.columns:
+                result = result.sort_values('PERC_AUDIENCE', ascending=False, kind='stable')
+
+        return result.reset_index(drop=True)
+
+    def get_category_frames(self, category_names: List[str],
+                            audience_name: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Get all five per-category frames for CategoryAnalyzer.analyze_category
+
+        Args:
+            category_names: Category names as they appear in data
+            audience_name: Audience filter for merchant views
+
+        Returns:
+            Dictionary keyed by analyze_category argument name
+        """
+        return {
+            'category_df': self.get_slice('category', category_names),
+            'subcategory_df': self.get_slice('subcategory', category_names),
+            'merchant_df': self.get_slice('merchant', category_names, audience_name),
+            'subcategory_last_year_df': self.get_slice('subcategory_last_year', category_names),
+            'merchant_last_year_df': self.get_slice('merchant_last_year', category_names, audience_name),
+        }
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Offline test for the cached Snowflake connection health check
+Uses a fake probe instead of Snowflake
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from data_processors.snowflake_connector import ConnectionHealth
+
+
+class FakeProbe:
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    def __call__(self):
+        self.calls += 1
+        if self.error:
+            raise self.error
+
+
+def test_success_cached_for_ttl():
+    probe = FakeProbe()
+    health = ConnectionHealth(ttl_seconds=60, probe=probe)
+
+    assert all(health.is_healthy() for _ in range(10))
+    assert probe.calls == 1
+    assert health.status()['healthy'] is True
+    print("✅ One probe serves every job within the TTL")
+
+
+def test_stale_success_refreshes_in_background():
+    probe = FakeProbe()
+    health = ConnectionHealth(ttl_seconds=60, probe=probe)
+    health.record(True)
+    health._checked_at -= 120
+
+    # Snowflake went away since the last check: this job still starts, the refresh catches it
+    probe.error = RuntimeError("network unreachable")
+    assert health.is_healthy()
+
+    deadline = time.time() + 5
+    while health.status()['healthy'] and time.time() < deadline:
+        time.sleep(0.01)
+    assert probe.calls == 1
+    assert not health.is_healthy()
+    print("✅ Stale success trusted while a background refresh runs")
+
+
+def test_failure_fails_fast_then_rechecks():
+    probe = FakeProbe()
+    probe.error = RuntimeError("authentication failed")
+    health = ConnectionHealth(ttl_seconds=60, failure_ttl_seconds=30, probe=probe)
+
+    assert not health.is_healthy()
+    assert not health.is_healthy()
+    assert probe.calls == 1
+    assert health.last_error == "authentication failed"
+
+    # After the failure TTL the next job probes again
+    probe.error = None
+    health._checked_at -= 31
+    assert health.is_healthy()
+    assert probe.calls == 2 and health.last_error is None
+    print("✅ Cached failure fails fast until the failure TTL expires")
+
+
+def test_queries_keep_state_fresh():
+    probe = FakeProbe()
+    health = ConnectionHealth(ttl_seconds=60, probe=probe)
+    health.record(True)  # what a successful query_to_dataframe does
+
+    assert health.is_healthy()
+    assert probe.calls == 0
+    print("✅ Successful queries count as health checks")
+
+
+if __name__ == "__main__":
+    test_success_cached_for_ttl()
+    test_stale_success_refreshes_in_background()
+    test_failure_fails_fast_then_rechecks()
+    test_queries_keep_state_fresh()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Offline test: DemographicsProcessor gives identical results for row-level
+data and the pre-aggregated GROUPING SETS frame
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from data_processors.demographic_processor import DemographicsProcessor
+
+TEAM = 'Utah Jazz'
+LEAGUE = 'NBA'
+COMPARISON = 'Local Gen Pop (Excl. Jazz)'
+
+
+def _raw_frame(rows: int = 3000) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        'COMMUNITY': rng.choice([f'{TEAM} Fans', COMPARISON, f'{LEAGUE} Fans'], rows),
+        'GENERATION': rng.choice(['1. Millennials and Gen Z (1982 and after)', '2. Generation X (1961-1981)',
+                                  '3. Baby Boomers (1943-1960)', '4. Post-WWII (1942 and before)'], rows),
+        'INCOME_LEVELS': rng.choice(['Under $50K', '$50K-$74K', '$75K-$99K', '$100K-$149K', '$150K+'], rows),
+        'OCCUPATION_CATEGORY': rng.choice(['Professional', 'Blue Collar', 'White Collar', 'Retired'], rows),
+        'GENDER': rng.choice(['Male', 'Female'], rows),
+        'CHILDREN_HH': rng.choice([0, 1], rows),
+        'ETHNIC_GROUP': rng.choice(['White', 'Hispanic', 'Asian', None], rows),
+        'CUSTOMER_COUNT': rng.integers(1, 50, rows)
+    })
+    # Gen pop has no ethnicity data, as in the live views
+    df.loc[df['COMMUNITY'] == COMPARISON, 'ETHNIC_GROUP'] = None
+    return df
+
+
+def _process(data: pd.DataFrame):
+    processor = DemographicsProcessor(data_source=data, team_name=TEAM, league=LEAGUE,
+                                      use_ai_insights=False, comparison_population=COMPARISON)
+    return processor.process_all_demographics()
+
+
+def test_aggregated_matches_raw():
+    raw = _raw_frame()
+    aggregated = DemographicsProcessor.aggregate(raw)
+    assert len(aggregated) < len(raw) / 10
+
+    assert _process(aggregated) == _process(raw)
+    print("✅ Aggregated input produces identical demographics")
+
+
+def test_aggregated_query_covers_attributes():
+    query = DemographicsProcessor.build_aggregated_query('V_UTAH_JAZZ_SIL_COMMUNITY_DEMOGRAPHICS')
+    assert 'GROUPING SETS' in query
+    for attr in DemographicsProcessor.AGGREGATED_ATTRIBUTES:
+        assert f'(COMMUNITY, {attr})' in query
+    print("✅ Aggregated query has one grouping set per attribute")
+
+
+if __name__ == "__main__":
+    test_aggregated_matches_raw()
+    test_aggregated_query_covers_attributes()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Offline test: vectorized fan wheel merchant assignment matches the original
+per-community iterrows loop
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from data_processors.merchant_ranker import MerchantRanker
+
+
+def _legacy_assignment(merged: pd.DataFrame, communities_df: pd.DataFrame) -> pd.DataFrame:
+    """The greedy loop get_fan_wheel_data used before vectorization"""
+    selected_merchants = {}
+    used_merchants = set()
+    communities_sorted = communities_df.sort_values('COMPOSITE_INDEX', ascending=False)
+
+    for _, community_row in communities_sorted.iterrows():
+        community = community_row['COMMUNITY']
+        community_merchants = merged[merged['COMMUNITY'] == community].sort_values('PERC_AUDIENCE', ascending=False)
+        for _, merchant_row in community_merchants.iterrows():
+            if merchant_row['MERCHANT'] not in used_merchants:
+                selected_merchants[community] = merchant_row
+                used_merchants.add(merchant_row['MERCHANT'])
+                break
+
+    return pd.DataFrame(list(selected_merchants.values()))
+
+
+def _random_case(seed: int):
+    rng = random.Random(seed)
+    communities = [f"Community {i}" for i in range(10)]
+    communities_df = pd.DataFrame({
+        'COMMUNITY': communities,
+        'PERC_INDEX': [rng.randint(100, 500) for _ in communities],
+        'COMPOSITE_INDEX': [rng.randint(100, 900) for _ in communities]
+    })
+
+    # Few distinct merchants: lots of collisions across communities
+    rows = []
+    for community in communities:
+        for _ in range(rng.randint(0, 5)):
+            rows.append({'COMMUNITY': community,
+                         'MERCHANT': f"Brand {rng.randint(0, 8)}",
+                         'PERC_INDEX': rng.randint(50, 400),
+                         'PERC_AUDIENCE': round(rng.random(), 6),
+                         'AUDIENCE_COUNT': rng.randint(10, 500)})
+    merchants_df = pd.DataFrame(rows).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+    merged = merchants_df.merge(
+        communities_df[['COMMUNITY', 'PERC_INDEX', 'COMPOSITE_INDEX']].rename(columns={
+            'PERC_INDEX': 'COMMUNITY_PERC_INDEX',
+            'COMPOSITE_INDEX': 'COMMUNITY_COMPOSITE_INDEX'
+        }),
+        on='COMMUNITY',
+        how='left'
+    )
+    return merged, communities_df
+
+
+def test_assignment_matches_legacy_loop():
+    for seed in range(200):
+        merged, communities_df = _random_case(seed)
+        expected = _legacy_assignment(merged, communities_df)
+        result = MerchantRanker._assign_unique_merchants(merged, communities_df)
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert result['MERCHANT'].is_unique
+    print("✅ Vectorized assignment identical to the iterrows loop (200 cases)")
+
+
+def test_ties_keep_query_order():
+    # The old loop's default (unstable) sort left tied merchants in arbitrary order;
+    # ties now resolve to the order rows came back from the query
+    merged = pd.DataFrame({
+        'COMMUNITY': ['Gamers', 'Gamers', 'Theme Parkers', 'Theme Parkers'],
+        'MERCHANT': ['Steam', 'GameStop', 'Steam', 'Disneyland'],
+        'PERC_AUDIENCE': [0.4, 0.4, 0.4, 0.4]
+    })
+    communities_df = pd.DataFrame({'COMMUNITY': ['Theme Parkers', 'Gamers'], 'COMPOSITE_INDEX': [500, 700]})
+
+    result = MerchantRanker._assign_unique_merchants(merged, communities_df)
+    assert result['MERCHANT'].tolist() == ['Steam', 'Disneyland']
+    print("✅ Tied merchants resolved in query order")
+
+
+def test_behavior_text_unchanged():
+    ranker = MerchantRanker.__new__(MerchantRanker)
+    ranker.community_actions = {'Gamers': 'Plays games at'}
+
+    assert ranker._generate_behavior_from_community('Gamers', 'Steam') == "Plays games\nat Steam"
+    assert ranker._generate_behavior_from_community('Unknown', 'Target') == "Shops\nat Target"
+    assert MerchantRanker._format_behavior('Shops at', 'Target') == "Shops\nat Target"
+    print("✅ Behavior text formatting unchanged")
+
+
+if __name__ == "__main__":
+    test_assignment_matches_legacy_loop()
+    test_ties_keep_query_order()
+    test_behavior_text_unchanged()
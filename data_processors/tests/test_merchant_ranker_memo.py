@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Offline test for MerchantRanker's top-communities memo and combined CTE query
+Uses a fake query_to_dataframe instead of Snowflake
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import data_processors.snowflake_connector as snowflake_connector
+from data_processors.merchant_ranker import MerchantRanker
+
+COMMUNITIES = pd.DataFrame({
+    'COMMUNITY': ['Gamers', 'Theme Parkers'],
+    'PERC_AUDIENCE': [0.45, 0.30],
+    'PERC_INDEX': [210, 180],
+    'COMPOSITE_INDEX': [640, 410]
+})
+
+# Joined rows as returned by the combined query (ordered by community rank, then PERC_AUDIENCE)
+JOINED = pd.DataFrame({
+    'COMMUNITY': ['Gamers', 'Gamers', 'Theme Parkers'],
+    'COMMUNITY_PERC_AUDIENCE': [0.45, 0.45, 0.30],
+    'COMMUNITY_PERC_INDEX': [210, 210, 180],
+    'COMMUNITY_COMPOSITE_INDEX': [640, 640, 410],
+    'MERCHANT': ['STEAM', 'GAMESTOP', 'DISNEYLAND'],
+    'CATEGORY': ['Gaming', 'Gaming', 'Attractions'],
+    'SUBCATEGORY': ['Online', 'Retail', 'Parks'],
+    'PERC_INDEX': [300, 250, 400],
+    'PERC_AUDIENCE': [0.20, 0.10, 0.25],
+    'AUDIENCE_TOTAL_SPEND': [1000.0, 500.0, 2000.0],
+    'AUDIENCE_COUNT': [200, 100, 250]
+})
+
+
+class FakeWarehouse:
+    def __init__(self):
+        self.queries = []
+
+    def query(self, query, params=None, **kwargs):
+        self.queries.append(query)
+        return (JOINED if 'top_communities AS' in query else COMMUNITIES).copy()
+
+
+@contextmanager
+def _ranker_with_fake_warehouse():
+    os.environ.setdefault('OPENAI_API_KEY', 'sk-test')
+    warehouse = FakeWarehouse()
+    original_query = snowflake_connector.query_to_dataframe
+    snowflake_connector.query_to_dataframe = warehouse.query
+    try:
+        ranker = MerchantRanker(team_view_prefix='V_TEST', comparison_population='Local Gen Pop')
+        ranker.standardizer = None
+        yield ranker, warehouse
+    finally:
+        snowflake_connector.query_to_dataframe = original_query
+
+
+def test_top_communities_memoized():
+    with _ranker_with_fake_warehouse() as (ranker, warehouse):
+        _check_top_communities_memoized(ranker, warehouse)
+    print("✅ Repeat get_top_communities calls served from the memo")
+
+
+def _check_top_communities_memoized(ranker, warehouse):
+    first = ranker.get_top_communities(min_audience_pct=0.20, top_n=10)
+    first.rename(columns={'COMMUNITY': 'Community'}, inplace=True)  # callers may mutate results
+    second = ranker.get_top_communities(min_audience_pct=0.20, top_n=10)
+
+    assert len(warehouse.queries) == 1
+    pd.testing.assert_frame_equal(second, COMMUNITIES)
+
+    # Different arguments are a different key
+    ranker.get_top_communities(min_audience_pct=0.20, top_n=5)
+    assert len(warehouse.queries) == 2
+
+    ranker.clear_memo()
+    ranker.get_top_communities(min_audience_pct=0.20, top_n=10)
+    assert len(warehouse.queries) == 3
+
+
+def test_combined_query_splits_results():
+    with _ranker_with_fake_warehouse() as (ranker, warehouse):
+        _check_combined_query_splits_results(ranker, warehouse)
+    print("✅ Communities and merchants fetched in one round trip")
+
+
+def _check_combined_query_splits_results(ranker, warehouse):
+    communities_df, merchants_df = ranker.get_top_communities_with_merchants(top_n=10, top_n_per_community=5)
+
+    assert len(warehouse.queries) == 1
+    pd.testing.assert_frame_equal(communities_df, COMMUNITIES)
+    assert merchants_df['MERCHANT'].tolist() == ['DISNEYLAND', 'STEAM', 'GAMESTOP']
+    assert list(merchants_df.columns) == ['COMMUNITY', 'MERCHANT', 'CATEGORY', 'SUBCATEGORY', 'PERC_INDEX',
+                                          'PERC_AUDIENCE', 'AUDIENCE_TOTAL_SPEND', 'AUDIENCE_COUNT']
+
+    # The behaviors slide's later calls reuse the communities from the combined query
+    ranker.get_top_communities(min_audience_pct=0.20, top_n=10)
+    assert len(warehouse.queries) == 1
+
+
+if __name__ == "__main__":
+    test_top_communities_memoized()
+    test_combined_query_splits_results()
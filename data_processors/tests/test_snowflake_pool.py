@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Offline test for the process-wide SnowflakeConnectionPool lifecycle,
+validation, reaping and metrics
+Uses fake connections instead of Snowflake
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import data_processors.snowflake_connector as connector
+from data_processors.snowflake_connector import SnowflakeConnectionPool
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        self.conn.queries.append(query)
+
+    def fetch_pandas_all(self):
+        return pd.DataFrame({'MERCHANT': ['Target', 'Costco']})
+
+    def close(self):
+        pass
+
+
+class FakePool(SnowflakeConnectionPool):
+    """Pool whose connections take connect_delay seconds to open"""
+
+    def __init__(self, connect_delay: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.connect_delay = connect_delay
+        self.connects = 0
+
+    def _create_connection(self):
+        time.sleep(self.connect_delay)
+        self.connects += 1
+        conn = FakeConnection()
+        conn._created_time = time.time()
+        return conn
+
+
+def test_concurrent_warmup_creates_min_connections():
+    pool = FakePool(connect_delay=0.05, min_connections=5, max_connections=10)
+
+    threads = [threading.Thread(target=pool._ensure_min_connections) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool.connects == 5
+    assert pool._created_connections == 5
+    assert pool._pool.qsize() == 5
+    print("✅ Concurrent warmups open exactly min_connections")
+
+
+def test_warm_pool_and_close_pool():
+    original = connector._connection_pool
+    pool = FakePool(connect_delay=0.05, min_connections=3, max_connections=5)
+    connector._connection_pool = pool
+    try:
+        thread = connector.warm_pool()
+        assert thread is not None and thread.daemon
+        thread.join(timeout=5)
+        assert pool._pool.qsize() == 3
+
+        # Borrowing and returning leaves the shared pool open
+        with connector.get_connection() as conn:
+            assert not conn.closed
+        assert connector._connection_pool is pool and not pool._closed
+
+        connections = list(pool._all_connections)
+        connector.close_pool()
+        assert connector._connection_pool is None
+        assert pool._closed
+        assert len(connections) == 3 and all(conn.closed for conn in connections)
+    finally:
+        connector._connection_pool = original
+    print("✅ Pool warmed in the background and closed only by the host")
+
+
+def test_recently_used_connections_skip_ping():
+    pool = FakePool(min_connections=1, max_connections=3, validation_idle_seconds=60, reaper_interval=0)
+
+    for _ in range(3):
+        conn = pool.get_connection()
+        pool.return_connection(conn)
+    assert conn.queries == []
+    assert pool.stats()['pings'] == 0 and pool.stats()['pings_skipped'] == 3
+
+    # Idle past the threshold: one SELECT 1 before reuse
+    conn._last_used -= 120
+    assert pool.get_connection() is conn
+    assert conn.queries == ['SELECT 1']
+    pool.return_connection(conn)
+
+    # Closed connections are dropped without a round trip
+    conn.closed = True
+    replacement = pool.get_connection()
+    assert replacement is not conn and conn.queries == ['SELECT 1']
+
+    stats = pool.stats()
+    assert stats['pings'] == 1 and stats['evictions'] == 1 and stats['connections'] == 1
+    print("✅ Pings only for idle connections; closed ones dropped without a round trip")
+
+
+def test_reap_idle_and_expired_connections():
+    pool = FakePool(min_connections=1, max_connections=5, idle_timeout=10, reaper_interval=0)
+    borrowed = [pool.get_connection() for _ in range(3)]
+    for conn in borrowed:
+        pool.return_connection(conn)
+        conn._last_used -= 60
+    borrowed[1]._created_time -= 7200  # past connection_lifetime
+
+    assert pool.reap() == 2
+    assert borrowed[1].closed
+    assert sum(conn.closed for conn in borrowed) == 2
+    assert pool.stats()['connections'] == 1 and pool._pool.qsize() == 1
+    assert pool.stats()['evictions'] == 2
+    print("✅ Reaper evicts expired and idle connections down to min_connections")
+
+
+def test_reap_leaves_other_connections_available():
+    pool = FakePool(min_connections=1, max_connections=5, idle_timeout=3600, reaper_interval=0)
+    borrowed = [pool.get_connection() for _ in range(4)]
+    for conn in borrowed:
+        pool.return_connection(conn)
+
+    available = []
+    check = pool._is_connection_valid
+
+    def observing_check(conn, ping=True):
+        available.append(pool._pool.qsize())
+        return check(conn, ping=ping)
+
+    pool._is_connection_valid = observing_check
+    assert pool.reap() == 0
+    assert available == [3, 3, 3, 3]  # only the connection being checked is out of the pool
+    assert pool._pool.qsize() == 4
+    print("✅ Reaper checks one connection at a time")
+
+
+def test_background_reaper_runs_until_close():
+    pool = FakePool(min_connections=1, max_connections=5, idle_timeout=0, reaper_interval=0.02)
+    borrowed = [pool.get_connection() for _ in range(3)]
+    for conn in borrowed:
+        pool.return_connection(conn)
+
+    deadline = time.time() + 5
+    while pool.stats()['connections'] > 1 and time.time() < deadline:
+        time.sleep(0.01)
+    assert pool.stats()['connections'] == 1
+
+    pool.close_all()
+    pool._reaper_thread.join(timeout=1)
+    assert not pool._reaper_thread.is_alive()
+    print("✅ Background reaper trims idle connections and stops with the pool")
+
+
+def test_wait_counters():
+    pool = FakePool(min_connections=1, max_connections=1, reaper_interval=0)
+    held = pool.get_connection()
+
+    try:
+        pool.get_connection(timeout=0.05)
+        assert False, "expected a timeout"
+    except RuntimeError:
+        pass
+    pool.return_connection(held)
+
+    stats = pool.stats()
+    assert stats['waits'] == 1 and stats['wait_timeouts'] == 1
+    print("✅ Waits and wait timeouts counted")
+
+
+def test_pool_and_query_metrics():
+    original_pool, original_metrics = connector._connection_pool, dict(connector._query_metrics)
+    pool = FakePool(min_connections=1, max_connections=3, reaper_interval=0)
+    connector._connection_pool = pool
+    connector._query_metrics.clear()
+    try:
+        held = pool.get_connection()
+        for _ in range(2):
+            connector.query_to_dataframe("SELECT * FROM V_TEST_MERCHANT WHERE COMMUNITY = 'Gamers'")
+
+        metrics = connector.get_pool_metrics()
+        pool_metrics = metrics['pool']
+        assert pool_metrics['active'] == 1 and pool_metrics['idle'] == 1
+        assert pool_metrics['acquire_latency_ms']['count'] == 3
+        assert sum(pool_metrics['acquire_latency_ms']['buckets'].values()) == 3
+        assert set(pool_metrics['connection_age_seconds']) == {'min', 'median', 'max'}
+
+        view = metrics['queries']['V_TEST_MERCHANT']
+        assert view['count'] == 2 and view['errors'] == 0 and view['cache_hits'] == 0
+        pool.return_connection(held)
+    finally:
+        connector._connection_pool = original_pool
+        connector._query_metrics.clear()
+        connector._query_metrics.update(original_metrics)
+    print("✅ Pool and per-view query metrics reported")
+
+
+if __name__ == "__main__":
+    test_concurrent_warmup_creates_min_connections()
+    test_warm_pool_and_close_pool()
+    test_recently_used_connections_skip_ping()
+    test_reap_idle_and_expired_connections()
+    test_reap_leaves_other_connections_available()
+    test_background_reaper_runs_until_close()
+    test_wait_counters()
+    test_pool_and_query_metrics()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Offline test for the Snowflake result cache in query_to_dataframe
+Uses a fake pool and an in-memory stand-in for CacheManager
+"""
+
+import json
+import sys
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import data_processors.snowflake_connector as connector
+
+
+def _warehouse_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'CATEGORY': ['Restaurants', None, 'Auto'],
+        'AUDIENCE_COUNT': np.array([10, 20, 30], dtype='int64'),
+        'PERC_AUDIENCE': [0.1, np.nan, 0.3333333333333333],
+        'IS_EMERGING': [True, False, True],
+        'LOADED_AT': pd.to_datetime(['2024-01-01 00:00', None, '2024-03-01 12:30']),
+    })
+
+
+class FakeCursor:
+    def __init__(self, executed):
+        self.executed = executed
+
+    def execute(self, query, params=None):
+        self.executed.append(query)
+
+    def fetch_pandas_all(self):
+        return _warehouse_frame()
+
+    def close(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.executed = []
+
+    def get_connection(self):
+        pool = self
+        return type('Conn', (), {'cursor': lambda self: FakeCursor(pool.executed)})()
+
+    def return_connection(self, conn):
+        pass
+
+
+class FakeCacheManager:
+    """Stores payloads through JSON like the JSONB column does"""
+
+    def __init__(self):
+        self.entries = {}
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def _key(self, query_template, team_key, view_name, **params):
+        return json.dumps([query_template, team_key, view_name, params], sort_keys=True)
+
+    def get_snowflake_result(self, query_template, team_key, view_name, **params):
+        key = self._key(query_template, team_key, view_name, **params)
+        if key in self.entries:
+            self.stats['hits'] += 1
+            return json.loads(self.entries[key])
+        self.stats['misses'] += 1
+        return None
+
+    def set_snowflake_result(self, query_template, team_key, view_name, result_data,
+                             query_duration_ms=None, ttl_hours=24, row_count=None, **params):
+        self.entries[self._key(query_template, team_key, view_name, **params)] = json.dumps(result_data)
+
+
+def test_repeat_query_skips_warehouse():
+    pool = FakePool()
+    cache = FakeCacheManager()
+
+    # Swap in the fake pool for this test only; the module-level singleton is restored afterwards
+    with mock.patch.object(connector, '_connection_pool', pool):
+        first = connector.query_to_dataframe("SELECT * FROM V_TEST_CATEGORY_INDEXING_ALL_TIME",
+                                             cache_manager=cache, team_key='test')
+        # Whitespace differences share the same cache entry
+        second = connector.query_to_dataframe("SELECT *\n  FROM V_TEST_CATEGORY_INDEXING_ALL_TIME;",
+                                              cache_manager=cache, team_key='test')
+
+    assert len(pool.executed) == 1
+    assert cache.stats == {'hits': 1, 'misses': 1}
+    pd.testing.assert_frame_equal(first, second)
+    print("✅ Repeat query served from cache")
+
+
+def test_payload_round_trip_keeps_dtypes():
+    df = _warehouse_frame()
+    payload = json.loads(json.dumps(connector._frame_to_cache_payload(df)))
+    restored = connector._frame_from_cache_payload(payload)
+
+    pd.testing.assert_frame_equal(df, restored)
+    assert list(payload) == ['columns', 'dtypes', 'data']
+    print("✅ Columnar payload restores values and dtypes")
+
+
+def test_view_name_and_normalization():
+    assert connector._query_view_name("select * from V_X_MERCHANT WHERE A = 1") == 'V_X_MERCHANT'
+    assert connector._normalize_query("SELECT  *\n FROM T ;") == "SELECT * FROM T"
+    print("✅ Cache key parts extracted")
+
+
+if __name__ == "__main__":
+    test_repeat_query_skips_warehouse()
+    test_payload_round_trip_keeps_dtypes()
+    test_view_name_and_normalization()
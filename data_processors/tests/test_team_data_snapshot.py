@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Offline test for TeamDataSnapshot
+Checks that in-memory category slices match the old per-category TRIM(CATEGORY) queries
+"""
+
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import data_processors.team_data_snapshot as snapshot_module
+from data_processors.team_data_snapshot import TeamDataSnapshot
+
+
+def _fake_view() -> pd.DataFrame:
+    """Small indexing view with untrimmed category names"""
+    return pd.DataFrame({
+        'CATEGORY': ['Restaurants ', 'Auto', 'Restaurants', 'Travel', 'Auto'],
+        'AUDIENCE': ['Jazz Fans', 'Jazz Fans', 'Other', 'Jazz Fans', 'Jazz Fans'],
+        'MERCHANT': ['A', 'B', 'C', 'D', 'E'],
+        'PERC_AUDIENCE': [0.10, 0.20, 0.30, 0.50, 0.40],
+    })
+
+
+def _fake_queries(queries: list):
+    """Patch the snapshot's warehouse query for the duration of a with block"""
+    def fake_query(query, params=None, **kwargs):
+        queries.append(query)
+        return _fake_view()
+
+    return mock.patch.object(snapshot_module, 'query_to_dataframe', fake_query)
+
+
+def test_one_fetch_per_view():
+    queries = []
+    with _fake_queries(queries):
+        snapshot = TeamDataSnapshot('V_TEST')
+        for _ in range(3):
+            snapshot.get_category_frames(['Restaurants'], audience_name='Jazz Fans')
+
+    assert len(queries) == len(TeamDataSnapshot.VIEWS)
+    print("✅ Each view fetched once")
+
+
+def test_slices_match_filters():
+    with _fake_queries([]):
+        snapshot = TeamDataSnapshot('V_TEST')
+        frames = snapshot.get_category_frames(['Restaurants', 'Auto'], audience_name='Jazz Fans')
+
+        # Non-merchant views: TRIM(CATEGORY) match only, original row order
+        assert frames['category_df']['MERCHANT'].tolist() == ['A', 'B', 'C', 'E']
+
+        # Merchant views: audience filter + ORDER BY PERC_AUDIENCE DESC
+        assert frames['merchant_df']['MERCHANT'].tolist() == ['E', 'B', 'A']
+        assert frames['merchant_df'].index.tolist() == [0, 1, 2]
+
+        # Unknown category gives an empty frame with the same columns
+        empty = snapshot.get_slice('category', ['Gambling'])
+        assert empty.empty and list(empty.columns) == list(_fake_view().columns)
+    print("✅ Slices match per-category query semantics")
+
+
+def test_slices_are_independent_copies():
+    with _fake_queries([]):
+        snapshot = TeamDataSnapshot('V_TEST')
+        frames = snapshot.get_category_frames(['Auto'], audience_name='Jazz Fans')
+        frames['category_df'].loc[:, 'MERCHANT'] = 'CHANGED'
+
+        again = snapshot.get_slice('category', ['Auto'])
+        assert again['MERCHANT'].tolist() == ['B', 'E']
+    print("✅ Slices do not share state with the snapshot")
+
+
+if __name__ == "__main__":
+    test_one_fetch_per_view()
+    test_slices_match_filters()
+    test_slices_are_independent_copies()
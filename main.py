@@ -4,6 +4,7 @@ Entry point for the Sports Innovation Lab PowerPoint generator
 """
 
 import argparse
+import atexit
 import logging
 import sys
 from pathlib import Path
@@ -17,7 +18,8 @@ from pptx.util import Inches
 sys.path.append(str(Path(__file__).parent))
 
 from report_builder.pptx_builder import PowerPointBuilder, build_report
-from data_processors.snowflake_connector import test_connection
+from data_processors.snowflake_connector import (test_connection, warm_pool, close_pool,
+                                                 is_connection_healthy, connection_health_error)
 from utils.team_config_manager import TeamConfigManager
 
 
@@ -93,10 +95,10 @@ def generate_single_slide(team_key: str,
     print(f"\nTeam: {team_config['team_name']}")
     print(f"Slide Type: {slide_type}")
 
-    # Test connection
-    print("\n🔍 Testing Snowflake connection...")
-    if not test_connection():
-        raise Exception("Failed to connect to Snowflake")
+    # Check Snowflake connection (cached across builds)
+    print("\n🔍 Checking Snowflake connection...")
+    if not is_connection_healthy():
+        raise Exception(f"Failed to connect to Snowflake: {connection_health_error()}")
     print("✅ Connected to Snowflake")
 
     # Create presentation with SIL template
@@ -123,7 +125,7 @@ def generate_single_slide(team_key: str,
 
     # Generate the specific slide
     if slide_type == 'demographics':
-        from slide_generators.demographics_slide import DemographicsSlide
+        from slide_generators.demographics_slide import DemographicsSlide, chart_sizes
         from data_processors.demographic_processor import DemographicsProcessor
         from data_processors.snowflake_connector import query_to_dataframe
         from visualizations.demographic_charts import DemographicCharts
@@ -156,14 +158,15 @@ def generate_single_slide(team_key: str,
             team_colors=team_config.get('colors'),
             team_config=team_config
         )
-        charts = charter.create_all_demographic_charts(
+        charts = charter.render_demographic_charts(
             data,
+            target_sizes=chart_sizes(),
             output_dir=chart_dir
         )
         print(f"   • Generated {len(charts)} charts")
 
         generator = DemographicsSlide(pres)
-        pres = generator.generate(data, chart_dir, team_config)
+        pres = generator.generate(data, chart_dir, team_config, charts=charts)
 
     elif slide_type == 'behaviors':
         from slide_generators.behaviors_slide import BehaviorsSlide
@@ -322,10 +325,10 @@ def generate_report(team_key: str,
     print(f"View Prefix: {team_config['view_prefix']}")
     print(f"Category Mode: {team_config.get('category_mode', 'standard')}")
 
-    # Test Snowflake connection
-    print("\n🔍 Testing Snowflake connection...")
-    if not test_connection():
-        raise Exception("Failed to connect to Snowflake")
+    # Check Snowflake connection (cached across builds)
+    print("\n🔍 Checking Snowflake connection...")
+    if not is_connection_healthy():
+        raise Exception(f"Failed to connect to Snowflake: {connection_health_error()}")
     print("✅ Connected to Snowflake")
 
     # Build presentation
@@ -558,6 +561,10 @@ Examples:
             parser.print_help()
             return 1
 
+        # One Snowflake pool for every build in this run, closed at exit
+        warm_pool()
+        atexit.register(close_pool)
+
         # Check if this is a single slide request
         # Pattern: team_name slide_type (e.g., "utah_jazz demographics")
         if len(args.teams) == 2 and not ',' in args.teams[0] and args.teams[1] in ['demographics', 'behaviors'] or (len(args.teams) == 2 and args.teams[1].startswith('category:')):
@@ -36,7 +36,7 @@ try:
     from utils.team_config_manager import TeamConfigManager
     from data_processors.demographic_processor import DemographicsProcessor
     from data_processors.category_analyzer import CategoryAnalyzer
-    from data_processors.snowflake_connector import query_to_dataframe
+    from data_processors.snowflake_connector import query_to_dataframe, get_pool_metrics
     from utils.cache_manager import CacheManager
     from utils.logo_manager import LogoManager
 except ImportError as e:
@@ -223,6 +223,18 @@ def get_system_status() -> Dict[str, Any]:
         else:
             status["components"]["cache"] = {"status": "not_available"}
         
+        # Snowflake pool and per-view query metrics
+        try:
+            status["components"]["snowflake_pool"] = {
+                "status": "available",
+                **get_pool_metrics()
+            }
+        except Exception as e:
+            status["components"]["snowflake_pool"] = {
+                "status": "error",
+                "error": str(e)
+            }
+        
         # Check logo manager
         if logo_manager:
             status["components"]["logo_manager"] = {"status": "available"}
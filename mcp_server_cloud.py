@@ -52,7 +52,7 @@ except ImportError as e:
     logger.warning(f"CategoryAnalyzer not available: {e}")
 
 try:
-    from data_processors.snowflake_connector import query_to_dataframe
+    from data_processors.snowflake_connector import query_to_dataframe, get_pool_metrics
     logger.info("Snowflake connector imported successfully")
 except ImportError as e:
     logger.warning(f"Snowflake connector not available: {e}")
@@ -254,6 +254,18 @@ def get_system_status() -> Dict[str, Any]:
         else:
             status["components"]["cache"] = {"status": "not_available"}
         
+        # Snowflake pool and per-view query metrics
+        try:
+            status["components"]["snowflake_pool"] = {
+                "status": "available",
+                **get_pool_metrics()
+            }
+        except Exception as e:
+            status["components"]["snowflake_pool"] = {
+                "status": "error",
+                "error": str(e)
+            }
+        
         # Check logo manager
         if logo_manager:
             status["components"]["logo_manager"] = {"status": "available"}
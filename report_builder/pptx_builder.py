@@ -5,12 +5,18 @@ Combines all slide generators to create the complete sponsorship insights report
 UPDATED: Added demographic overview slide with AI insights
 UPDATED: Added support for emerging categories with tiered selection
 UPDATED: Added real-time progress tracking
+UPDATED: Progress goes through a per-build ProgressReporter (contextvar), not a class-level instance
 """
 
+import contextvars
 import logging
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+import pandas as pd
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
@@ -20,12 +26,14 @@ from pptx.enum.text import PP_ALIGN
 from data_processors.demographic_processor import DemographicsProcessor
 from data_processors.merchant_ranker import MerchantRanker
 from data_processors.category_analyzer import CategoryAnalyzer
-from data_processors.snowflake_connector import query_to_dataframe
+from data_processors.snowflake_connector import query_to_dataframe, DEFAULT_MAX_CONNECTIONS
+from data_processors.team_data_snapshot import TeamDataSnapshot
+from data_processors.merchant_standardization_planner import MerchantStandardizationPlanner
 
 # Import slide generators
 from slide_generators.title_slide import TitleSlide
 from slide_generators.demographic_overview_slide import DemographicOverviewSlide  # NEW
-from slide_generators.demographics_slide import DemographicsSlide  # Now single slide
+from slide_generators.demographics_slide import DemographicsSlide, chart_sizes as demographic_chart_sizes  # Now single slide
 from slide_generators.behaviors_slide import BehaviorsSlide
 from slide_generators.category_slide import CategorySlide
 
@@ -34,6 +42,8 @@ from visualizations.demographic_charts import DemographicCharts
 
 # Import utilities
 from utils.team_config_manager import TeamConfigManager
+from utils.progress import ProgressReporter, progress_context, report_progress
+from utils.image_budget import ImageBudget, budget_context
 
 # from utils.logo_downloader import LogoDownloader  # Not implemented yet
 
@@ -43,28 +53,22 @@ logger = logging.getLogger(__name__)
 DEFAULT_FONT_FAMILY = "Red Hat Display"
 FALLBACK_FONT = "Arial"
 
+# Concurrent category analysis (1 = sequential); never more than the Snowflake pool can serve
+DEFAULT_ANALYSIS_WORKERS = int(os.getenv('CATEGORY_ANALYSIS_WORKERS', '8'))
 
-def update_progress(progress: int, message: str):
-    """Update job progress if running in a job context"""
-    # Use the callback if available
-    if (hasattr(PowerPointBuilder._current_instance, 'progress_callback') and
-            PowerPointBuilder._current_instance.progress_callback):
-        try:
-            PowerPointBuilder._current_instance.progress_callback(progress, message)
-        except Exception as e:
-            logger.debug(f"Error calling progress callback: {e}")
+# Charts are rendered in memory; set to also keep PNG copies in the build's charts dir
+SAVE_DEBUG_CHARTS = os.getenv('SAVE_DEBUG_CHARTS', 'false').lower() == 'true'
 
-    # Always log the progress
-    logger.info(f"Progress: {progress}% - {message}")
+
+# Progress for the active build (see utils.progress); kept under its original name for callers
+update_progress = report_progress
 
 
 class PowerPointBuilder:
     """Main orchestrator for building complete PowerPoint presentations"""
 
-    # Class variable to store current instance for progress updates
-    _current_instance = None
-
-    def __init__(self, team_key: str, job_id: Optional[str] = None, cache_manager: Optional[Any] = None, progress_callback: Optional[callable] = None):
+    def __init__(self, team_key: str, job_id: Optional[str] = None, cache_manager: Optional[Any] = None,
+                 progress_callback: Optional[callable] = None, analysis_workers: Optional[int] = None):
         """
         Initialize the PowerPoint builder with proper 16:9 formatting
 
@@ -72,6 +76,8 @@ class PowerPointBuilder:
             team_key: Team identifier (e.g., 'utah_jazz', 'dallas_cowboys')
             job_id: Optional job ID for progress tracking
             cache_manager: Optional CacheManager instance for caching
+            progress_callback: Optional callable(progress, message) for progress updates
+            analysis_workers: Threads for concurrent category analysis (1 disables the pipeline)
         """
         # Store job_id for progress tracking
         self.job_id = job_id
@@ -79,12 +85,13 @@ class PowerPointBuilder:
         # Store cache_manager for passing to components
         self.cache_manager = cache_manager
 
-        # Set as current instance for progress updates
-        PowerPointBuilder._current_instance = self
-
-        # Store progress callback
+        # Store progress callback (reported through a per-build ProgressReporter)
         self.progress_callback = progress_callback
 
+        # Category analysis concurrency (bounded by the Snowflake connection pool)
+        workers = DEFAULT_ANALYSIS_WORKERS if analysis_workers is None else analysis_workers
+        self.analysis_workers = max(1, min(workers, DEFAULT_MAX_CONNECTIONS))
+
         self.team_key = team_key
         self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
@@ -114,6 +121,15 @@ class PowerPointBuilder:
             cache_manager=self.cache_manager
         )
 
+        # Build-scoped snapshot of the indexing views (one fetch per view per build)
+        self.data_snapshot = TeamDataSnapshot(self.view_prefix, cache_manager=self.cache_manager,
+                                              team_key=self.team_key)
+
+        # Demographics are processed once per build and shared by the overview and detail slides
+        self._demographic_data = None
+        self._demographics_loaded = False
+        self._demographics_error = None
+
         # Validate and set presentation font
         self.presentation_font = self._validate_font()
 
@@ -153,6 +169,9 @@ class PowerPointBuilder:
         # Track progress
         self.slides_created = []
 
+        # Embedded image bytes for this deck (see utils.image_budget)
+        self.image_budget = ImageBudget()
+
         logger.info(f"Initialized PowerPoint builder for {self.team_name} (16:9 format)")
         logger.info(f"Using font: {self.presentation_font}")
 
@@ -237,6 +256,18 @@ class PowerPointBuilder:
         logger.info(f"Starting presentation build for {self.team_name}")
         logger.info(f"Font: {self.presentation_font}")
 
+        # Progress and images from this build (including its worker threads) stay with this build
+        with progress_context(ProgressReporter(self.progress_callback, job_id=self.job_id)), \
+                budget_context(self.image_budget):
+            return self._build_presentation(include_custom_categories, custom_category_count,
+                                            category_mode, custom_categories)
+
+    def _build_presentation(self,
+                            include_custom_categories: bool,
+                            custom_category_count: Optional[int],
+                            category_mode: Optional[str],
+                            custom_categories: Optional[str]) -> Path:
+        """Build the presentation with this build's progress reporter and image budget active"""
         try:
             # Check category mode from team config or override with passed parameters
             if category_mode:
@@ -289,9 +320,8 @@ class PowerPointBuilder:
                 logger.info(f"Standard mode: {len(fixed_categories)} fixed + {custom_count} custom categories")
 
             total_categories = len(fixed_categories) + custom_count
-
-            # Progress milestones
-            progress_per_category = 40 // total_categories if total_categories > 0 else 5  # Categories take up ~40% of progress (50-90%)
+            logger.info(f"Planned {total_categories} categories "
+                        f"({self.analysis_workers} analysis worker{'s' if self.analysis_workers != 1 else ''})")
 
             # 1. Create title slide (25-30%)
             update_progress(28, "Creating title slide...")
@@ -304,12 +334,12 @@ class PowerPointBuilder:
             update_progress(32, "Instructions slide added")
 
             # 3. Create demographic overview slide (32-37%)
-            update_progress(33, "Generating demographic AI insights...")
+            update_progress(33, "Loading demographics and generating AI insights...")
             self._create_demographic_overview_slide()
             update_progress(37, "Demographic overview completed")
 
             # 4. Create detailed demographics slide (37-45%)
-            update_progress(38, "Loading demographic data from Snowflake...")
+            update_progress(38, "Building demographics slide...")
             self._create_demographics_slide()
             update_progress(45, "Demographics charts completed")
 
@@ -319,37 +349,25 @@ class PowerPointBuilder:
             update_progress(50, "Behaviors slide completed")
 
             # 6. Create category slides (50-85%)
-            current_progress = 50
-            update_progress(current_progress, "Starting category analysis...")
-
-            # Fixed categories (only in standard mode)
-            for i, category_key in enumerate(fixed_categories):
-                current_progress = 50 + (i * progress_per_category)
-                update_progress(
-                    current_progress,
-                    f"Analyzing {category_key} category ({i + 1}/{len(fixed_categories)})..."
-                )
-                self._create_category_slide(category_key, is_custom=False)
-                update_progress(
-                    current_progress + progress_per_category - 1,
-                    f"Completed {category_key} slides"
-                )
+            with self._category_executor() as executor:
+                update_progress(50, "Loading team category data...")
+                self._load_data_snapshot(executor=executor)
 
-            # 7. Custom categories (if requested) OR fully custom categories
-            if category_mode == 'custom':
-                # Fully custom mode - create slides for team's selected categories
-                base_progress = 50 + (len(fixed_categories) * progress_per_category)
-                update_progress(base_progress, "Creating custom category slides...")
-                self._create_fully_custom_category_slides(custom_categories)
-                update_progress(85, "All custom categories completed")
-            elif include_custom_categories:
-                # Standard mode - use existing custom category logic
-                base_progress = 50 + (len(fixed_categories) * progress_per_category)
-                update_progress(base_progress, "Identifying top custom categories...")
-                self._create_custom_category_slides(custom_category_count)
-                update_progress(85, "All custom categories completed")
-            else:
-                update_progress(85, "All categories completed")
+                # Fixed categories (only in standard mode)
+                category_jobs = [self._category_job(category_key) for category_key in fixed_categories]
+
+                # 7. Custom categories (if requested) OR fully custom categories
+                if category_mode == 'custom':
+                    # Fully custom mode - create slides for team's selected categories
+                    category_jobs += self._plan_fully_custom_category_jobs(custom_categories)
+                elif include_custom_categories:
+                    # Standard mode - use existing custom category logic
+                    update_progress(51, "Identifying top custom categories...")
+                    category_jobs += self._plan_custom_category_jobs(custom_category_count)
+
+                self._create_category_slides(category_jobs, executor=executor)
+
+            update_progress(85, "All categories completed")
 
             # 8. Add SIL branding slide (85-87%)
             update_progress(86, "Adding branding slide...")
@@ -372,15 +390,6 @@ class PowerPointBuilder:
             logger.error(f"Error building presentation: {str(e)}")
             raise
 
-        finally:
-            # ADD THIS: Clean up connection pool after all processing
-            try:
-                from data_processors.snowflake_connector import close_pool
-                close_pool()
-                logger.info("✓ Snowflake connection pool closed")
-            except Exception as e:
-                logger.debug(f"Error closing pool: {e}")
-
     def _create_demographic_overview_slide(self):
         """
         NEW: Create the demographic overview slide with AI insights
@@ -407,35 +416,66 @@ class PowerPointBuilder:
             # Create a fallback slide
             self._add_placeholder_slide("Demographic Overview - Error loading data")
 
-    def _get_demographic_ai_insights(self) -> str:
+    def _load_demographics(self) -> pd.DataFrame:
         """
-        Get AI-generated demographic insights for the overview slide
+        Load demographics pre-aggregated per community x attribute in Snowflake
+        (falls back to the row-level view if the aggregate query fails)
 
         Returns:
-            AI-generated insights text or fallback text
+            DataFrame accepted by DemographicsProcessor
         """
+        demographics_view = self.config_manager.get_view_name(self.team_key, 'demographics')
         try:
-            # Load demographics data
-            demographics_view = self.config_manager.get_view_name(self.team_key, 'demographics')
+            query = DemographicsProcessor.build_aggregated_query(demographics_view)
+            return query_to_dataframe(query, cache_manager=self.cache_manager, team_key=self.team_key)
+        except Exception as e:
+            logger.warning(f"Aggregated demographics query failed, loading raw rows: {e}")
             query = f"SELECT * FROM {demographics_view}"
-            df = query_to_dataframe(query)
+            return query_to_dataframe(query, cache_manager=self.cache_manager, team_key=self.team_key)
 
-            if df.empty:
-                logger.warning("No demographics data found for AI insights")
-                return self._get_fallback_demographic_insight()
+    def _get_demographic_data(self) -> Optional[Dict[str, Any]]:
+        """
+        Fetch and process demographics once per build (AI insight included),
+        shared by the overview slide, DemographicsSlide and DemographicCharts
+
+        Returns:
+            process_all_demographics() result, or None if no data was found
+        """
+        if not self._demographics_loaded:
+            self._demographics_loaded = True
+            try:
+                df = self._load_demographics()
+
+                if df.empty:
+                    logger.warning("No demographics data found")
+                else:
+                    processor = DemographicsProcessor(
+                        data_source=df,
+                        team_name=self.team_name,
+                        league=self.league,
+                        use_ai_insights=True,
+                        comparison_population=self.team_config.get('comparison_population')
+                    )
+                    self._demographic_data = processor.process_all_demographics()
+            except Exception as e:
+                self._demographics_error = e
 
-            comparison_population = self.team_config.get('comparison_population')
+        if self._demographics_error is not None:
+            raise self._demographics_error
+        return self._demographic_data
 
-            # Process demographics with AI insights enabled
-            processor = DemographicsProcessor(
-                data_source=df,
-                team_name=self.team_name,
-                league=self.league,
-                use_ai_insights=True,  # Enable AI insights
-                comparison_population=comparison_population  # ADD THIS LINE
-            )
+    def _get_demographic_ai_insights(self) -> str:
+        """
+        Get AI-generated demographic insights for the overview slide
 
-            demographic_data = processor.process_all_demographics()
+        Returns:
+            AI-generated insights text or fallback text
+        """
+        try:
+            demographic_data = self._get_demographic_data()
+
+            if demographic_data is None:
+                return self._get_fallback_demographic_insight()
 
             # Get the AI-generated insight
             ai_insights = demographic_data.get('key_insights')
@@ -573,39 +613,24 @@ class PowerPointBuilder:
         logger.info("Creating demographics slide...")
 
         try:
-            # Load demographics data
-            update_progress(39, "Querying demographic data...")
-            demographics_view = self.config_manager.get_view_name(self.team_key, 'demographics')
-            query = f"SELECT * FROM {demographics_view}"
-            df = query_to_dataframe(query)
+            # Reuse the demographics processed for the overview slide
+            update_progress(39, "Loading processed demographic data...")
+            demographic_data = self._get_demographic_data()
 
-            if df.empty:
-                logger.warning("No demographics data found")
+            if demographic_data is None:
                 self._add_placeholder_slide("Demographics data not available")
                 return
 
-            comparison_population = self.team_config.get('comparison_population')
-
-            # Process demographics
-            update_progress(41, "Processing demographic data...")
-            processor = DemographicsProcessor(
-                data_source=df,
-                team_name=self.team_name,
-                league=self.league,
-                comparison_population=comparison_population  # ADD THIS LINE
-            )
-
-            demographic_data = processor.process_all_demographics()
-
             # Generate charts
             update_progress(43, "Generating demographic charts...")
             charter = DemographicCharts(
                 team_colors=self.team_config.get('colors'),
                 team_config=self.team_config  # ADD THIS LINE!
             )
-            charts = charter.create_all_demographic_charts(
+            charts = charter.render_demographic_charts(
                 demographic_data,
-                output_dir=self.charts_dir
+                target_sizes=demographic_chart_sizes(),
+                output_dir=self.charts_dir if SAVE_DEBUG_CHARTS else None
             )
 
             # Create single demographics slide with all 6 charts
@@ -615,8 +640,9 @@ class PowerPointBuilder:
 
             self.presentation = demo_generator.generate(
                 demographic_data=demographic_data,
-                chart_dir=self.charts_dir,
-                team_config=self.team_config
+                chart_dir=None,
+                team_config=self.team_config,
+                charts=charts
             )
 
             self.slides_created.append("Demographics Slide (All 6 Charts)")
@@ -632,7 +658,10 @@ class PowerPointBuilder:
 
         try:
             update_progress(47, "Loading behavior data...")
-            behaviors_generator = BehaviorsSlide(self.presentation)
+            behaviors_generator = BehaviorsSlide(
+                self.presentation,
+                charts_dir=self.charts_dir if SAVE_DEBUG_CHARTS else None
+            )
             behaviors_generator.default_font = self.presentation_font
 
             update_progress(48, "Generating fan wheel visualization...")
@@ -648,26 +677,36 @@ class PowerPointBuilder:
             logger.error(f"Error creating behaviors slide: {str(e)}")
             self._add_placeholder_slide("Behaviors slide - error loading data")
 
-    def _create_fixed_category_slides(self):
-        """Create slides for all fixed categories"""
-        logger.info("Creating fixed category slides...")
-
-        # Define fixed categories based on team type
-        is_womens_team = self._is_womens_team()
-
-        fixed_categories = ['restaurants', 'athleisure', 'finance', 'gambling', 'travel', 'auto']
-        if is_womens_team:
-            fixed_categories.extend(['beauty', 'health'])
+    def _load_data_snapshot(self, executor: Optional[Executor] = None):
+        """
+        Eagerly fetch the team indexing views for the category slides
 
-        for category_key in fixed_categories:
-            self._create_category_slide(category_key, is_custom=False)
+        A failed view is not kept in the snapshot, so each category retries it while
+        preparing and falls back to its own placeholder slide if it fails again.
+        """
+        try:
+            self.data_snapshot.load(executor=executor)
+        except Exception as e:
+            logger.warning(f"Could not preload team category data: {str(e)}")
+
+    def _category_job(self, category_key: str, is_custom: bool = False,
+                      custom_cat_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Describe one category to analyze (the input of _prepare_category)"""
+        return {
+            'category_key': category_key,
+            'is_custom': is_custom,
+            'custom_cat_info': custom_cat_info
+        }
 
-    def _create_custom_category_slides(self, custom_count: Optional[int] = None):
+    def _plan_custom_category_jobs(self, custom_count: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Create slides for custom categories using tiered selection
+        Select custom categories using tiered selection
         Now includes both established and emerging categories
+
+        Returns:
+            Category jobs for the selected custom categories
         """
-        logger.info("Creating custom category slides...")
+        logger.info("Selecting custom categories...")
 
         # Determine number of custom categories
         is_womens_team = self._is_womens_team()
@@ -676,27 +715,15 @@ class PowerPointBuilder:
 
         # Get all data needed for custom category selection
         try:
-            # Calculate base progress for custom categories
             fixed_categories = ['restaurants', 'athleisure', 'finance', 'gambling', 'travel', 'auto']
             if is_womens_team:
                 fixed_categories.extend(['beauty', 'health'])
 
-            progress_per_category = 35 // (len(fixed_categories) + custom_count) if (
-                                                                                                len(fixed_categories) + custom_count) > 0 else 5
-            base_progress = 50 + (len(fixed_categories) * progress_per_category)
-
-            # Load category data
-            update_progress(base_progress + 1, "Loading category data for custom analysis...")
-            category_query = f"SELECT * FROM {self.view_prefix}_CATEGORY_INDEXING_ALL_TIME"
-            all_category_df = query_to_dataframe(category_query)
-
-            # NEW: Load merchant data for verification
-            update_progress(base_progress + 2, "Loading merchant data...")
-            merchant_query = f"SELECT * FROM {self.view_prefix}_MERCHANT_INDEXING_ALL_TIME"
-            all_merchant_df = query_to_dataframe(merchant_query)
+            # Load category and merchant data (from the build snapshot)
+            all_category_df = self.data_snapshot.get_view('category')
+            all_merchant_df = self.data_snapshot.get_view('merchant')
 
             # Get custom categories using the new tiered selection
-            update_progress(base_progress + 3, "Analyzing custom categories...")
             custom_categories = self.category_analyzer.get_custom_categories(
                 category_df=all_category_df,
                 merchant_df=all_merchant_df,  # NEW: Pass merchant data
@@ -712,178 +739,211 @@ class PowerPointBuilder:
                             f"(audience: {cat.get('audience_pct', 0) * 100:.1f}%, "
                             f"composite: {cat.get('composite_index', 0):.1f})")
 
-            # Create slides for each custom category
-            for i, custom_cat in enumerate(custom_categories[:custom_count]):
-                category_name = custom_cat['display_name'].strip()  # Strip here!
-                is_emerging = custom_cat.get('is_emerging', False)
-
-                current_progress = base_progress + 5 + (i * progress_per_category)
-                update_progress(
-                    current_progress,
-                    f"Creating custom category {i + 1}/{custom_count}: {category_name}"
-                )
-
-                logger.info(f"Creating custom category slide {i + 1}: {category_name} "
-                            f"{'[EMERGING]' if is_emerging else '[ESTABLISHED]'}")
-
-                # Pass the stripped category name
-                self._create_category_slide(
-                    category_key=category_name,
+            # Pass the stripped category name
+            return [
+                self._category_job(
+                    custom_cat['display_name'].strip(),  # Strip here!
                     is_custom=True,
                     custom_cat_info=custom_cat
                 )
+                for custom_cat in custom_categories[:custom_count]
+            ]
 
         except Exception as e:
-            logger.error(f"Error creating custom category slides: {str(e)}")
+            logger.error(f"Error selecting custom categories: {str(e)}")
+            return []
+
+    def _plan_fully_custom_category_jobs(self, selected_categories: List[str]) -> List[Dict[str, Any]]:
+        """
+        Category jobs for fully custom categories selected by the team
+        """
+        logger.info(f"Planning fully custom category slides for {len(selected_categories)} categories...")
+
+        return [
+            self._category_job(
+                category_name,
+                is_custom=True,
+                custom_cat_info={'display_name': category_name, 'is_emerging': False}
+            )
+            for category_name in selected_categories
+        ]
+
+    def _category_executor(self):
+        """
+        Thread pool for concurrent category analysis, or a null context when running sequentially
+
+        Workers run CategoryAnalyzer.prepare_category, then analyze_prepared_category once the
+        calling thread has resolved merchant names for the whole build with a single
+        MerchantStandardizationPlanner.resolve(); they never touch the presentation.
+        Bounded by the Snowflake pool size so workers never queue on connections.
+        """
+        if self.analysis_workers <= 1:
+            return nullcontext(None)
+
+        return ThreadPoolExecutor(
+            max_workers=self.analysis_workers,
+            thread_name_prefix=f"category-{self.team_key}"
+        )
 
-    def _create_fully_custom_category_slides(self, selected_categories: List[str]):
+    def _create_category_slides(self, category_jobs: List[Dict[str, Any]],
+                                executor: Optional[Executor] = None):
         """
-        Create slides for fully custom categories selected by the team
+        Analyze categories and render their slides in job order
+
+        Runs in three phases: prepare every category (filtering + picking the merchants
+        to display), standardize the merchants of all categories in one pass, then
+        finish the analyses. With an executor the per-category phases run concurrently;
+        rendering stays on this thread so slide order is deterministic.
+        Progress is reported as each category is rendered, so it is monotonic (52-85%).
         """
-        logger.info(f"Creating fully custom category slides for {len(selected_categories)} categories...")
-        
+        total = len(category_jobs)
+        if total == 0:
+            return
+
+        def run(fn, *args):
+            """Run fn for every job (concurrently with an executor), keeping errors per job"""
+            if executor is None:
+                return [self._capture(fn, *job_args) for job_args in zip(*args)]
+            # Each task runs in a copy of this context so it reports to this build's progress
+            futures = [executor.submit(contextvars.copy_context().run, self._capture, fn, *job_args)
+                       for job_args in zip(*args)]
+            return [future.result() for future in futures]
+
+        update_progress(52, f"Analyzing {total} categories...")
+        prepared = run(self._prepare_category, category_jobs)
+
+        # One cache lookup + one parallel API pass for every merchant the build displays
+        planner = MerchantStandardizationPlanner(self.category_analyzer.standardizer)
+        for item in prepared:
+            if isinstance(item, dict):
+                planner.add(item['merchants_to_standardize'])
+        name_mapping = planner.resolve()
+
+        analyzed = run(self._analyze_prepared_category, prepared, [name_mapping] * total)
+
+        for i, job in enumerate(category_jobs):
+            category_key = job['category_key']
+            update_progress(
+                52 + (i * 33) // total,
+                f"Analyzing {category_key} category ({i + 1}/{total})..."
+            )
+
+            try:
+                results = analyzed[i]
+                if isinstance(results, Exception):
+                    raise results
+
+                if results:
+                    self._render_category_slides(results)
+
+            except Exception as e:
+                logger.error(f"Error creating {category_key} slides: {str(e)}")
+                self._add_placeholder_slide(f"{category_key.title()} - error loading data")
+
+            update_progress(
+                52 + ((i + 1) * 33) // total,
+                f"Completed {category_key} slides"
+            )
+
+    @staticmethod
+    def _capture(fn, *args):
+        """Call fn, returning the exception instead of raising it"""
         try:
-            # Calculate progress per category
-            progress_per_category = 35 // len(selected_categories) if len(selected_categories) > 0 else 5
-            base_progress = 50  # Start at 50 since no fixed categories in custom mode
-            
-            # Load category data
-            update_progress(base_progress + 1, "Loading category data for custom analysis...")
-            category_query = f"SELECT * FROM {self.view_prefix}_CATEGORY_INDEXING_ALL_TIME"
-            all_category_df = query_to_dataframe(category_query)
-            
-            # Load merchant data
-            update_progress(base_progress + 2, "Loading merchant data...")
-            merchant_query = f"SELECT * FROM {self.view_prefix}_MERCHANT_INDEXING_ALL_TIME"
-            all_merchant_df = query_to_dataframe(merchant_query)
-            
-            # Create slides for each selected category
-            for i, category_name in enumerate(selected_categories):
-                current_progress = base_progress + 3 + (i * progress_per_category)
-                update_progress(
-                    current_progress,
-                    f"Creating custom category {i + 1}/{len(selected_categories)}: {category_name}"
-                )
-                
-                logger.info(f"Creating fully custom category slide {i + 1}: {category_name}")
-                
-                # Create the category slide
-                self._create_category_slide(
-                    category_key=category_name,
-                    is_custom=True,
-                    custom_cat_info={'display_name': category_name, 'is_emerging': False}
-                )
-                
-                update_progress(
-                    current_progress + progress_per_category - 1,
-                    f"Completed {category_name} slides"
-                )
-                
+            return fn(*args)
         except Exception as e:
-            logger.error(f"Error creating fully custom category slides: {str(e)}")
+            return e
 
-    def _create_category_slide(self, category_key: str, is_custom: bool = False,
-                               custom_cat_info: Optional[Dict[str, Any]] = None):
+    def _prepare_category(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Create slides for a single category
+        Load a category's data and run the first analysis phase (thread-safe)
+
+        Returns:
+            Prepared category data, or None if the category has no configuration
         """
-        try:
-            logger.info(f"Creating slides for {category_key} {'[CUSTOM]' if is_custom else '[FIXED]'}...")
-
-            # Load category data
-            if is_custom:
-                # FIX: Strip whitespace from category_key for custom categories
-                category_key = category_key.strip()
-                cat_config = self.category_analyzer.create_custom_category_config(category_key)
-                cat_names = [category_key]  # Now using the stripped key
-            else:
-                cat_config = self.category_analyzer.categories.get(category_key, {})
-                cat_names = cat_config.get('category_names_in_data', [])
+        category_key = job['category_key']
+        is_custom = job.get('is_custom', False)
+        custom_cat_info = job.get('custom_cat_info')
+        logger.info(f"Analyzing {category_key} {'[CUSTOM]' if is_custom else '[FIXED]'}...")
+
+        # Load category data
+        if is_custom:
+            # FIX: Strip whitespace from category_key for custom categories
+            category_key = category_key.strip()
+            cat_config = self.category_analyzer.create_custom_category_config(category_key)
+            cat_names = [category_key]  # Now using the stripped key
+        else:
+            cat_config = self.category_analyzer.categories.get(category_key, {})
+            cat_names = cat_config.get('category_names_in_data', [])
+
+        if not cat_names:
+            logger.warning(f"No configuration found for {category_key}")
+            return None
+
+        # Slice ALL_TIME and LAST_FULL_YEAR data from the build snapshot
+        # (equivalent to TRIM(CATEGORY) = ... filters, merchants limited to the team audience)
+        category_frames = self.data_snapshot.get_category_frames(
+            cat_names,
+            audience_name=self.category_analyzer.audience_name
+        )
 
-            if not cat_names:
-                logger.warning(f"No configuration found for {category_key}")
-                return
+        # Config passed explicitly instead of registering custom configs on the
+        # shared analyzer, so concurrent analyses don't interfere
+        prepared = self.category_analyzer.prepare_category(
+            category_key=category_key,
+            **category_frames,
+            category_config=cat_config
+        )
+        prepared['custom_cat_info'] = custom_cat_info
+        return prepared
 
-            # Build WHERE clause - also strip each cat name for safety
-            category_where = " OR ".join([f"TRIM(CATEGORY) = '{cat.strip()}'" for cat in cat_names])
-
-            # Load data
-            category_df = query_to_dataframe(f"""
-                SELECT * FROM {self.view_prefix}_CATEGORY_INDEXING_ALL_TIME 
-                WHERE {category_where}
-            """)
-
-            subcategory_df = query_to_dataframe(f"""
-                SELECT * FROM {self.view_prefix}_SUBCATEGORY_INDEXING_ALL_TIME 
-                WHERE {category_where}
-            """)
-
-            merchant_df = query_to_dataframe(f"""
-                SELECT * FROM {self.view_prefix}_MERCHANT_INDEXING_ALL_TIME 
-                WHERE {category_where}
-                AND AUDIENCE = '{self.category_analyzer.audience_name}'
-                ORDER BY PERC_AUDIENCE DESC
-            """)
-
-            # NEW: Load LAST_FULL_YEAR data for specific insights
-            subcategory_last_year_df = query_to_dataframe(f"""
-                SELECT * FROM {self.view_prefix}_SUBCATEGORY_INDEXING_LAST_FULL_YEAR 
-                WHERE {category_where}
-            """)
-
-            merchant_last_year_df = query_to_dataframe(f"""
-                SELECT * FROM {self.view_prefix}_MERCHANT_INDEXING_LAST_FULL_YEAR 
-                WHERE {category_where}
-                AND AUDIENCE = '{self.category_analyzer.audience_name}'
-                ORDER BY PERC_AUDIENCE DESC
-            """)
-
-            # Add config for custom categories temporarily
-            if is_custom:
-                self.category_analyzer.categories[category_key] = cat_config
-
-            # Analyze category
-            results = self.category_analyzer.analyze_category(
-                category_key=category_key,
-                category_df=category_df,
-                subcategory_df=subcategory_df,
-                merchant_df=merchant_df,
-                subcategory_last_year_df=subcategory_last_year_df,  # NEW
-                merchant_last_year_df=merchant_last_year_df,  # NEW
-                validate=False
-            )
+    def _analyze_prepared_category(self, prepared: Optional[Dict[str, Any]],
+                                   name_mapping: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Finish a prepared category's analysis (thread-safe)
 
-            # NEW: Add emerging flag from custom_cat_info if available
-            if custom_cat_info and 'is_emerging' in custom_cat_info:
-                results['is_emerging'] = custom_cat_info['is_emerging']
+        Args:
+            prepared: Output of _prepare_category (None or an exception is passed through)
+            name_mapping: Merchant names resolved for the whole build
 
-            # Clean up temporary config
-            if is_custom:
-                del self.category_analyzer.categories[category_key]
+        Returns:
+            Analysis results, or None if the category has no configuration
+        """
+        if prepared is None or isinstance(prepared, Exception):
+            return prepared
 
-            # Create slides
-            category_generator = CategorySlide(self.presentation)
-            category_generator.default_font = self.presentation_font
+        results = self.category_analyzer.analyze_prepared_category(
+            prepared,
+            validate=False,
+            name_mapping=name_mapping
+        )
 
-            # Category analysis slide
-            self.presentation = category_generator.generate(results, self.team_config)
+        # NEW: Add emerging flag from custom_cat_info if available
+        custom_cat_info = prepared.get('custom_cat_info')
+        if custom_cat_info and 'is_emerging' in custom_cat_info:
+            results['is_emerging'] = custom_cat_info['is_emerging']
 
-            # Track slide with emerging tag if applicable
-            slide_name = f"{results['display_name']} Analysis"
-            if results.get('is_emerging', False):
-                slide_name += " [EMERGING]"
-            self.slides_created.append(slide_name)
+        return results
 
-            # Brand analysis slide
-            self.presentation = category_generator.generate_brand_slide(results, self.team_config)
-            self.slides_created.append(f"{results['display_name']} Brands")
+    def _render_category_slides(self, results: Dict[str, Any]):
+        """Render the analysis and brand slides for an analyzed category"""
+        category_generator = CategorySlide(self.presentation)
+        category_generator.default_font = self.presentation_font
 
-            logger.info(f"✓ Created {results['display_name']} slides" +
-                        (" [EMERGING]" if results.get('is_emerging', False) else ""))
+        # Category analysis slide
+        self.presentation = category_generator.generate(results, self.team_config)
 
-        except Exception as e:
-            logger.error(f"Error creating {category_key} slides: {str(e)}")
-            self._add_placeholder_slide(f"{category_key.title()} - error loading data")
+        # Track slide with emerging tag if applicable
+        slide_name = f"{results['display_name']} Analysis"
+        if results.get('is_emerging', False):
+            slide_name += " [EMERGING]"
+        self.slides_created.append(slide_name)
+
+        # Brand analysis slide
+        self.presentation = category_generator.generate_brand_slide(results, self.team_config)
+        self.slides_created.append(f"{results['display_name']} Brands")
+
+        logger.info(f"✓ Created {results['display_name']} slides" +
+                    (" [EMERGING]" if results.get('is_emerging', False) else ""))
 
     def _add_placeholder_slide(self, message: str):
         """Add a placeholder slide when data is not available"""
@@ -916,6 +976,13 @@ class PowerPointBuilder:
         self.presentation.save(str(output_path))
         logger.info(f"Presentation saved to: {output_path}")
 
+        images = self.image_budget.summary()
+        logger.info(f"Deck size: {output_path.stat().st_size / 1024 / 1024:.1f} MB "
+                    f"(images {images['embedded_bytes'] / 1024 / 1024:.1f} MB of "
+                    f"{images['budget_bytes'] / 1024 / 1024:.1f} MB budget)")
+        if self.image_budget.over_budget:
+            logger.warning(f"⚠️ Deck images exceed the {images['budget_bytes'] / 1024 / 1024:.1f} MB budget")
+
         # Create summary file
         self._create_summary_file(output_path)
 
@@ -959,6 +1026,19 @@ class PowerPointBuilder:
             if self.presentation_font != DEFAULT_FONT_FAMILY:
                 f.write(f"  Note: Using fallback font as {DEFAULT_FONT_FAMILY} was not available\n")
 
+            # Add image budget
+            images = self.image_budget.summary()
+            f.write(f"\nImage Budget:\n")
+            f.write(f"  Deck Size: {pptx_path.stat().st_size / 1024:,.0f} KB\n")
+            f.write(f"  Images: {images['images']} unique ({images['placements']} placed)\n")
+            f.write(f"  Embedded: {images['embedded_bytes'] / 1024:,.0f} KB "
+                    f"(from {images['source_bytes'] / 1024:,.0f} KB of sources)\n")
+            f.write(f"  Budget: {images['budget_bytes'] / 1024:,.0f} KB"
+                    f"{' - OVER BUDGET' if self.image_budget.over_budget else ''}\n")
+            for entry in images['largest']:
+                f.write(f"    {entry['name']}: {entry['embedded_bytes'] / 1024:,.0f} KB "
+                        f"({entry['pixels'][0]}x{entry['pixels'][1]} px)\n")
+
         logger.info(f"Summary saved to: {summary_path}")
 
     def check_font_installation(self) -> Dict[str, Any]:
@@ -1055,34 +1135,26 @@ def build_report(team_key: str, **kwargs) -> Path:
     Returns:
         Path to generated PowerPoint file
     """
-    try:
-        # Extract job_id and callback if provided in kwargs
-        job_id = kwargs.pop('job_id', None)
-        cache_manager = kwargs.pop('cache_manager', None)
-        progress_callback = kwargs.pop('progress_callback', None)
-
-        builder = PowerPointBuilder(team_key, job_id=job_id, cache_manager=cache_manager,
-                                    progress_callback=progress_callback)
-
-        # Log font status
-        font_status = builder.check_font_installation()
-        if not font_status['font_available']:
-            logger.warning(f"Font '{DEFAULT_FONT_FAMILY}' not installed on system")
-            logger.info("Installation instructions:")
-            for instruction in font_status['instructions']:
-                logger.info(f"  {instruction}")
-
-        return builder.build_presentation(**kwargs)
-
-    finally:
-        # Clean up connection pool after report generation
-        try:
-            from data_processors.snowflake_connector import close_pool
-            close_pool()
-            logger.info("✓ Snowflake connection pool closed")
-        except Exception as e:
-            logger.debug(f"Error closing connection pool: {e}")
-            # Don't raise - we want the report to still return successfully
+    # Extract job_id and callback if provided in kwargs
+    job_id = kwargs.pop('job_id', None)
+    cache_manager = kwargs.pop('cache_manager', None)
+    progress_callback = kwargs.pop('progress_callback', None)
+    analysis_workers = kwargs.pop('analysis_workers', None)
+
+    # The Snowflake pool is shared with other builds; the host process closes it at exit
+    builder = PowerPointBuilder(team_key, job_id=job_id, cache_manager=cache_manager,
+                                progress_callback=progress_callback,
+                                analysis_workers=analysis_workers)
+
+    # Log font status
+    font_status = builder.check_font_installation()
+    if not font_status['font_available']:
+        logger.warning(f"Font '{DEFAULT_FONT_FAMILY}' not installed on system")
+        logger.info("Installation instructions:")
+        for instruction in font_status['instructions']:
+            logger.info(f"  {instruction}")
+
+    return builder.build_presentation(**kwargs)
 
 
 def validate_fonts_before_build():
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Offline test for category slides when a team indexing view fails to load
+Uses a fake analyzer and records slides instead of building a presentation
+"""
+
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import data_processors.team_data_snapshot as snapshot_module
+from data_processors.team_data_snapshot import TeamDataSnapshot
+from report_builder.pptx_builder import PowerPointBuilder
+
+
+class FakeAnalyzer:
+    """Passes each category's frames straight through as its analysis results"""
+
+    audience_name = 'Jazz Fans'
+    standardizer = None
+    categories = {
+        'restaurants': {'category_names_in_data': ['Restaurants']},
+        'auto': {'category_names_in_data': ['Auto']},
+    }
+
+    def prepare_category(self, category_key, category_config, **frames):
+        return {'category_key': category_key, 'merchants_to_standardize': set(), **frames}
+
+    def analyze_prepared_category(self, prepared, validate=True, name_mapping=None):
+        return {'category_key': prepared['category_key'], 'rows': len(prepared['category_df'])}
+
+
+def _fake_queries(failures: dict):
+    """Patch the snapshot's warehouse query; failures maps a view suffix to how many calls raise"""
+    def fake_query(query, params=None, **kwargs):
+        for suffix in failures:
+            if query.endswith(suffix) and failures[suffix] != 0:
+                failures[suffix] -= 1
+                raise RuntimeError(f"simulated failure for {suffix}")
+        return pd.DataFrame({
+            'CATEGORY': ['Restaurants', 'Auto', 'Auto'],
+            'AUDIENCE': ['Jazz Fans', 'Jazz Fans', 'Jazz Fans'],
+            'MERCHANT': ['A', 'B', 'C'],
+            'PERC_AUDIENCE': [0.3, 0.2, 0.1],
+        })
+
+    return mock.patch.object(snapshot_module, 'query_to_dataframe', fake_query)
+
+
+def _make_builder():
+    """PowerPointBuilder wired to fakes (skips template, fonts and team config)"""
+    builder = PowerPointBuilder.__new__(PowerPointBuilder)
+    builder.team_key = 'test_team'
+    builder.category_analyzer = FakeAnalyzer()
+    builder.data_snapshot = TeamDataSnapshot('V_TEST')
+    builder.rendered = []
+    builder.placeholders = []
+    builder._render_category_slides = lambda results: builder.rendered.append(results['category_key'])
+    builder._add_placeholder_slide = builder.placeholders.append
+    return builder
+
+
+def _build_category_slides(builder):
+    builder._load_data_snapshot()
+    jobs = [builder._category_job(key) for key in ('restaurants', 'auto')]
+    builder._create_category_slides(jobs)
+
+
+def test_failed_view_gives_placeholders():
+    builder = _make_builder()
+    with _fake_queries({'MERCHANT_INDEXING_LAST_FULL_YEAR': -1}):
+        _build_category_slides(builder)
+
+    assert builder.rendered == []
+    assert builder.placeholders == ["Restaurants - error loading data", "Auto - error loading data"]
+    print("✅ Missing view turns each category into a placeholder slide")
+
+
+def test_transient_failure_is_retried_per_category():
+    builder = _make_builder()
+    with _fake_queries({'SUBCATEGORY_INDEXING_ALL_TIME': 1}):
+        _build_category_slides(builder)
+
+    assert builder.rendered == ['restaurants', 'auto']
+    assert builder.placeholders == []
+    print("✅ View that failed during preload is fetched again for the categories")
+
+
+if __name__ == "__main__":
+    test_failed_view_gives_placeholders()
+    test_transient_failure_is_retried_per_category()
@@ -12,6 +12,8 @@ from pathlib import Path
 import logging
 from typing import Optional, Tuple
 
+from utils.image_budget import add_picture
+
 logger = logging.getLogger(__name__)
 
 # Default font configuration
@@ -159,31 +161,14 @@ class BaseSlide:
             slide: Slide object
             image_path: Path to image file
             left, top: Position in inches
-            width, height: Size in inches (maintains aspect if only one specified)
+            width, height: Size in inches (maintains aspect if only one specified; one is required)
         """
-        if width and height:
-            slide.shapes.add_picture(
-                str(image_path),
-                Inches(left), Inches(top),
-                width=Inches(width), height=Inches(height)
-            )
-        elif width:
-            slide.shapes.add_picture(
-                str(image_path),
-                Inches(left), Inches(top),
-                width=Inches(width)
-            )
-        elif height:
-            slide.shapes.add_picture(
-                str(image_path),
-                Inches(left), Inches(top),
-                height=Inches(height)
-            )
-        else:
-            slide.shapes.add_picture(
-                str(image_path),
-                Inches(left), Inches(top)
-            )
+        add_picture(
+            slide.shapes, image_path,
+            Inches(left), Inches(top),
+            width=Inches(width) if width else None,
+            height=Inches(height) if height else None
+        )
 
     def save(self, output_path: Path) -> Path:
         """
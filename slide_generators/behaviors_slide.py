@@ -4,8 +4,10 @@ Generate Fan Behaviors slide for PowerPoint presentations
 Combines fan wheel and community index chart with insights
 UPDATED with 6.5" community chart and centered text alignment
 ENHANCED with AI-powered insight generation and dynamic font sizing
+UPDATED: Charts rendered in memory (optional per-job charts_dir for debug copies)
 """
 
+from io import BytesIO
 from pathlib import Path
 from typing import Dict, Optional, Any
 from pptx import Presentation
@@ -23,25 +25,33 @@ from .base_slide import BaseSlide
 from data_processors.merchant_ranker import MerchantRanker
 from visualizations.fan_wheel import FanWheel  # Updated to use enhanced fan wheel
 from visualizations.community_index_chart import CommunityIndexChart
+from utils.image_budget import add_picture
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Placed chart widths in inches (charts are rendered for these sizes)
+COMMUNITY_CHART_WIDTH = 6.5
+FAN_WHEEL_WIDTH = 5.5
+
 
 class BehaviorsSlide(BaseSlide):
     """Generate the Fan Behaviors slide with fan wheel and community index chart"""
 
-    def __init__(self, presentation: Presentation = None, use_ai_insights: bool = True):
+    def __init__(self, presentation: Presentation = None, use_ai_insights: bool = True,
+                 charts_dir: Optional[Path] = None):
         """
         Initialize behaviors slide generator
 
         Args:
             presentation: Existing presentation to add slide to (creates new if None)
             use_ai_insights: Whether to use AI for insight generation
+            charts_dir: Optional per-job directory for debug copies of the chart PNGs
         """
         super().__init__(presentation)
+        self.charts_dir = Path(charts_dir) if charts_dir else None
         self.use_ai_insights = use_ai_insights and bool(os.getenv('OPENAI_API_KEY'))
 
         if use_ai_insights and not os.getenv('OPENAI_API_KEY'):
@@ -78,10 +88,10 @@ class BehaviorsSlide(BaseSlide):
 
         # Create visualizations
         logger.info("Generating fan wheel visualization with logo support...")
-        fan_wheel_path = self._create_fan_wheel(merchant_ranker, team_config)
+        fan_wheel_image = self._create_fan_wheel(merchant_ranker, team_config)
 
         logger.info("Generating community index chart...")
-        chart_path = self._create_community_chart(merchant_ranker, colors)
+        chart_image = self._create_community_chart(merchant_ranker, colors)
 
         # Use the content layout (SIL white layout #12)
         slide = self.add_content_slide()
@@ -96,15 +106,15 @@ class BehaviorsSlide(BaseSlide):
         # Add elements with 6.5" chart coordinated positioning
         self._add_insight_text(slide, insight)  # TOP left - large text
         self._add_chart_titles(slide, team_name)  # Titles for both sides
-        self._add_community_chart(slide, chart_path)  # LEFT chart - 6.5" wide
-        self._add_fan_wheel(slide, fan_wheel_path)  # RIGHT wheel - 5.5" diameter
+        self._add_community_chart(slide, chart_image)  # LEFT chart - 6.5" wide
+        self._add_fan_wheel(slide, fan_wheel_image)  # RIGHT wheel - 5.5" diameter
         self._add_chart_explanation(slide)  # BOTTOM left explanation
 
         logger.info(f"Generated behaviors slide for {team_name}")
         return self.presentation
 
     def _create_fan_wheel(self, merchant_ranker: MerchantRanker,
-                          team_config: Dict[str, Any]) -> Path:
+                          team_config: Dict[str, Any]) -> BytesIO:
         """Create fan wheel visualization with logo support"""
         # Get data
         wheel_data = merchant_ranker.get_fan_wheel_data(
@@ -126,13 +136,10 @@ class BehaviorsSlide(BaseSlide):
         if logo_report['missing_list']:
             logger.debug(f"Missing logos for: {', '.join(logo_report['missing_list'])}")
 
-        output_path = Path('temp_fan_wheel.png')
-        fan_wheel.create(wheel_data, output_path)
-
-        return output_path
+        return fan_wheel.create(wheel_data, self._debug_chart_path('fan_wheel.png'), placed_width=FAN_WHEEL_WIDTH)
 
     def _create_community_chart(self, merchant_ranker: MerchantRanker,
-                                team_colors: Dict[str, str]) -> Path:
+                                team_colors: Dict[str, str]) -> BytesIO:
         """Create community index chart"""
         # Get data with COMPOSITE_INDEX
         communities_df = merchant_ranker.get_top_communities(
@@ -149,10 +156,11 @@ class BehaviorsSlide(BaseSlide):
 
         # Create chart
         chart = CommunityIndexChart(team_colors)
-        output_path = Path('temp_community_chart.png')
-        chart.create(data, output_path)
+        return chart.create(data, self._debug_chart_path('community_chart.png'), placed_width=COMMUNITY_CHART_WIDTH)
 
-        return output_path
+    def _debug_chart_path(self, filename: str) -> Optional[Path]:
+        """Debug copy location for a chart (None unless charts_dir is set)"""
+        return self.charts_dir / filename if self.charts_dir else None
 
     def _add_header(self, slide, team_name: str):
         """Add header with team name and slide title"""
@@ -249,21 +257,21 @@ class BehaviorsSlide(BaseSlide):
         p.font.bold = True
         p.alignment = PP_ALIGN.CENTER
 
-    def _add_community_chart(self, slide, image_path: Path):
+    def _add_community_chart(self, slide, image: BytesIO):
         """Add community index chart - LEFT side, 6.5" WIDTH"""
         left = Inches(0.4)  # Left margin
         top = Inches(2.4)  # Below title
-        width = Inches(6.5)  # 6.5" width
+        width = Inches(COMMUNITY_CHART_WIDTH)  # 6.5" width
 
-        slide.shapes.add_picture(str(image_path), left, top, width=width)
+        add_picture(slide.shapes, image, left, top, width=width, name='community_chart')
 
-    def _add_fan_wheel(self, slide, image_path: Path):
+    def _add_fan_wheel(self, slide, image: BytesIO):
         """Add fan wheel - RIGHT side, 5.5" diameter"""
-        width = Inches(5.5)  # 5.5" diameter
+        width = Inches(FAN_WHEEL_WIDTH)  # 5.5" diameter
         left = Inches(7.4165)
         top = Inches(1.35)  # Vertical position
 
-        slide.shapes.add_picture(str(image_path), left, top, width=width)
+        add_picture(slide.shapes, image, left, top, width=width, name='fan_wheel')
 
     def _add_chart_explanation(self, slide):
         """Add explanation text below community chart - CENTERED with 6.5" chart"""
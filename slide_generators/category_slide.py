@@ -20,7 +20,8 @@ import io
 
 from .base_slide import BaseSlide
 from data_processors.category_analyzer import CategoryAnalyzer, CategoryMetrics
-from utils.logo_manager import LogoManager
+from utils.logo_manager import get_logo_manager
+from utils.image_budget import add_picture
 
 logger = logging.getLogger(__name__)
 
@@ -216,8 +217,8 @@ class CategorySlide(BaseSlide):
         """
         super().__init__(presentation)
 
-        # Initialize LogoManager
-        self.logo_manager = LogoManager()
+        # Shared LogoManager (one filename index per process)
+        self.logo_manager = get_logo_manager()
 
         # Colors for the slide - UPDATED with EQUAL color and emerging category
         self.colors = {
@@ -425,8 +426,8 @@ class CategorySlide(BaseSlide):
         if logo_path.exists():
             try:
                 # Add logo at top left, similar to reference image
-                pic = slide.shapes.add_picture(
-                    str(logo_path),
+                pic = add_picture(
+                    slide.shapes, logo_path,
                     Inches(2.2),  # Left margin
                     Inches(0.8),  # Top position
                     height=Inches(0.3)  # Height - width will scale proportionally
@@ -847,10 +848,11 @@ class CategorySlide(BaseSlide):
 
                 # Add the logo directly without circle background
                 try:
-                    pic = slide.shapes.add_picture(
-                        image_stream,
+                    pic = add_picture(
+                        slide.shapes, image_stream,
                         x, y,
-                        display_size, display_size
+                        display_size, display_size,
+                        name=merchant_name
                     )
                 except Exception as e:
                     logger.error(f"Failed to add logo for {merchant_name}: {e}")
@@ -879,11 +881,12 @@ class CategorySlide(BaseSlide):
 
                 # Add the logo centered within the circle
                 try:
-                    pic = slide.shapes.add_picture(
-                        image_stream,
+                    pic = add_picture(
+                        slide.shapes, image_stream,
                         x + offset,
                         y + offset,
-                        logo_display_size, logo_display_size
+                        logo_display_size, logo_display_size,
+                        name=merchant_name
                     )
 
                     # Ensure the logo is on top of the circle
@@ -1164,10 +1167,11 @@ class CategorySlide(BaseSlide):
             try:
                 if has_colored_bg:
                     # For colored background logos, add directly
-                    pic = slide.shapes.add_picture(
-                        image_stream,
+                    pic = add_picture(
+                        slide.shapes, image_stream,
                         logo_x, logo_y,
-                        logo_size, logo_size
+                        logo_size, logo_size,
+                        name=merchant_name
                     )
                 else:
                     # For white/transparent background logos, add with circle border
@@ -1187,11 +1191,12 @@ class CategorySlide(BaseSlide):
                     # Add logo slightly smaller to fit in circle
                     logo_display_size = Inches(0.45)
                     offset = (logo_size - logo_display_size) / 2
-                    pic = slide.shapes.add_picture(
-                        image_stream,
+                    pic = add_picture(
+                        slide.shapes, image_stream,
                         logo_x + offset,
                         logo_y + offset,
-                        logo_display_size, logo_display_size
+                        logo_display_size, logo_display_size,
+                        name=merchant_name
                     )
 
                     # Ensure logo is on top
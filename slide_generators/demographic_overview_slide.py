@@ -17,6 +17,8 @@ from pptx.enum.shapes import MSO_SHAPE
 import logging
 
 from .base_slide import BaseSlide
+from utils.image_budget import add_picture
+from utils.asset_manifest import asset_manifest
 
 logger = logging.getLogger(__name__)
 
@@ -175,8 +177,8 @@ class DemographicOverviewSlide(BaseSlide):
             run.font.color.rgb = RGBColor(255, 255, 255)  # White text on blue background
             run.font.bold = False
 
-    def _add_fan_image(self, slide, team_name: str):
-        """Add the team fan image from assets directory"""
+    def _find_source_fan_image(self, team_name: str) -> Optional[Path]:
+        """Find the full-size fan image in assets/logos/fans (used when assets aren't compiled)"""
         # Convert team name to filename format (remove spaces)
         team_filename = team_name.replace(" ", "")
 
@@ -214,6 +216,20 @@ class DemographicOverviewSlide(BaseSlide):
                 image_path = potential_path
                 logger.info(f"Found fan image at: {image_path}")
                 break
+        else:
+            logger.warning(f"Searched in: {fans_dir}")
+            logger.warning(f"Expected filename pattern: {base_filename}.[png/jpg/jpeg]")
+
+        return image_path
+
+    def _add_fan_image(self, slide, team_name: str):
+        """Add the team fan image from assets directory"""
+        # Pre-baked, slide-ready image from assets/compile_assets.py; fall back to the source file
+        image_path = asset_manifest.fan_image(team_name)
+        if image_path is not None:
+            logger.info(f"Using compiled fan image: {image_path}")
+        else:
+            image_path = self._find_source_fan_image(team_name)
 
         if image_path and image_path.exists():
             try:
@@ -225,9 +241,11 @@ class DemographicOverviewSlide(BaseSlide):
                 height = Inches(5)
 
                 # Add the picture
-                picture = slide.shapes.add_picture(
-                    str(image_path),
-                    left, top, width, height
+                # Photo: JPEG flattened onto the white slide (the circle crop's corners are transparent)
+                picture = add_picture(
+                    slide.shapes, image_path,
+                    left, top, width, height,
+                    photo=True
                 )
 
                 # Apply circular crop to the image
@@ -263,8 +281,6 @@ class DemographicOverviewSlide(BaseSlide):
                 self._add_image_placeholder_fallback(slide)
         else:
             logger.warning(f"Fan image not found for {team_name}")
-            logger.warning(f"Searched in: {fans_dir}")
-            logger.warning(f"Expected filename pattern: {base_filename}.[png/jpg/jpeg]")
             # Add fallback placeholder
             self._add_image_placeholder_fallback(slide)
 
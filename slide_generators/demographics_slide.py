@@ -4,10 +4,12 @@ Generate complete demographics slide for PowerPoint presentations
 Includes all charts arranged according to the reference layout
 Updated with optimized layout for gender horizontal bars
 Updated legend: removed KEY label, centered items, updated text
+UPDATED: Charts can be passed as in-memory PNG buffers keyed by chart name
 """
 
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
@@ -15,11 +17,33 @@ from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
 import logging
 
+from utils.image_budget import add_picture
+from visualizations.demographic_charts import DEMOGRAPHIC_CHART_DPI
+
 logger = logging.getLogger(__name__)
 
 # Default font
 DEFAULT_FONT_FAMILY = "Red Hat Display"
 
+# Chart placements on the slide: name -> (left, top, width, height) in inches
+# REALIGNED LAYOUT: Back to original alignment now that gender uses horizontal bars
+CHART_PLACEMENTS = {
+    # Top row - Gender back to narrow width, aligning with bottom row
+    'gender_chart': (0.5, 1.1, 1.5, 2.5),  # Back to 1.5" width
+    'income_chart': (2.2, 1.1, 4.8, 2.5),  # Original position
+    'occupation_chart': (7.2, 1.1, 5.6, 2.5),  # Original position
+
+    # Bottom row - Ethnicity chart is 2.8" tall but placed as if 2.5" to maintain alignment
+    'ethnicity_chart': (0.5, 4.2, 4.5, 2.5),  # Will bleed 0.3" below its space
+    'generation_chart': (5.2, 4.2, 4.5, 2.5),  # Original height
+    'children_chart': (9.8, 4.2, 3.0, 2.5)  # Original height
+}
+
+
+def chart_sizes() -> Dict[str, Tuple[float, float]]:
+    """Placed (width, height) in inches of each demographic chart"""
+    return {name: (width, height) for name, (_, _, width, height) in CHART_PLACEMENTS.items()}
+
 
 class DemographicsSlide:
     """Generate the complete demographics slide with all charts"""
@@ -67,17 +91,19 @@ class DemographicsSlide:
 
     def generate(self,
                  demographic_data: Dict[str, Any],
-                 chart_dir: Path,
+                 chart_dir: Optional[Path],
                  team_config: Dict[str, Any],
-                 slide_index: Optional[int] = None) -> Presentation:
+                 slide_index: Optional[int] = None,
+                 charts: Optional[Dict[str, BytesIO]] = None) -> Presentation:
         """
         Generate the complete demographics slide
 
         Args:
             demographic_data: Processed demographic data
-            chart_dir: Directory containing chart images
+            chart_dir: Directory containing chart images (used for charts not in `charts`)
             team_config: Team configuration
             slide_index: Where to insert slide (None = append)
+            charts: Rendered chart PNGs keyed by chart name (e.g. 'gender_chart')
 
         Returns:
             Updated presentation object
@@ -101,7 +127,7 @@ class DemographicsSlide:
         self._add_chart_headers(slide)
 
         # Add demographic charts with optimized spacing
-        self._add_charts(slide, chart_dir)
+        self._add_charts(slide, chart_dir, charts)
 
         # Add centered legend without KEY label
         self._add_legend_box(slide, team_name, team_short, demographic_data.get('league', 'League'))
@@ -194,41 +220,35 @@ class DemographicsSlide:
             p.font.color.rgb = RGBColor(255, 255, 255)
             p.alignment = PP_ALIGN.CENTER
 
-    def _add_charts(self, slide, chart_dir: Path):
+    def _add_charts(self, slide, chart_dir: Optional[Path], charts: Optional[Dict[str, BytesIO]] = None):
         """Add all demographic charts with realigned spacing for horizontal gender bars"""
-        chart_dir = Path(chart_dir)
-
-        # REALIGNED LAYOUT: Back to original alignment now that gender uses horizontal bars
-        chart_positions = [
-            # Top row - Gender back to narrow width, aligning with bottom row
-            ('gender_chart', 0.5, 1.1, 1.5, 2.5),  # Back to 1.5" width
-            ('income_chart', 2.2, 1.1, 4.8, 2.5),  # Original position
-            ('occupation_chart', 7.2, 1.1, 5.6, 2.5),  # Original position
-
-            # Bottom row - Ethnicity chart is 2.8" tall but placed as if 2.5" to maintain alignment
-            ('ethnicity_chart', 0.5, 4.2, 4.5, 2.5),  # Will bleed 0.3" below its space
-            ('generation_chart', 5.2, 4.2, 4.5, 2.5),  # Original height
-            ('children_chart', 9.8, 4.2, 3.0, 2.5)  # Original height
-        ]
+        charts = charts or {}
+
+        for chart_name, (left, top, width, height) in CHART_PLACEMENTS.items():
+            image = charts.get(chart_name)
 
-        for chart_name, left, top, width, height in chart_positions:
-            # Try both regular and hires versions
-            chart_path = chart_dir / f'{chart_name}_hires.png'
-            if not chart_path.exists():
-                chart_path = chart_dir / f'{chart_name}.png'
+            if image is None and chart_dir is not None:
+                # Try both regular and hires versions
+                chart_path = Path(chart_dir) / f'{chart_name}_hires.png'
+                if not chart_path.exists():
+                    chart_path = Path(chart_dir) / f'{chart_name}.png'
+                if chart_path.exists():
+                    image = str(chart_path)
 
-            if chart_path.exists():
+            if image is not None:
                 try:
-                    pic = slide.shapes.add_picture(
-                        str(chart_path),
+                    pic = add_picture(
+                        slide.shapes, image,
                         Inches(left), Inches(top),
-                        width=Inches(width), height=Inches(height)
+                        width=Inches(width), height=Inches(height),
+                        name=chart_name,
+                        dpi=DEMOGRAPHIC_CHART_DPI
                     )
                     logger.info(f"Added {chart_name} to slide: {width}x{height} inches at ({left}, {top})")
                 except Exception as e:
                     logger.warning(f"Could not add {chart_name}: {e}")
             else:
-                logger.warning(f"Chart not found: {chart_path}")
+                logger.warning(f"Chart not found: {chart_name}")
                 self._add_chart_placeholder(slide, chart_name, left, top, width, height)
 
     def _add_chart_placeholder(self, slide, chart_name: str, left: float, top: float,
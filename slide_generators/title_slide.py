@@ -14,6 +14,8 @@ from pptx.enum.shapes import MSO_SHAPE
 import logging
 
 from .base_slide import BaseSlide
+from utils.image_budget import add_picture
+from utils.asset_manifest import asset_manifest
 
 logger = logging.getLogger(__name__)
 
@@ -132,6 +134,11 @@ class TitleSlide(BaseSlide):
 
             logo_path = project_root / 'assets' / 'logos' / 'teams' / f"{team_name}.png"
 
+            # Prefer the pre-baked, slide-sized logo from assets/compile_assets.py
+            compiled_logo = asset_manifest.team_logo(team_config.get('team_name', ''))
+            if compiled_logo is not None:
+                logo_path = compiled_logo
+
             # Check if file exists
             if not logo_path.exists():
                 logger.warning(f"Team logo not found at {logo_path}, falling back to text")
@@ -144,8 +151,8 @@ class TitleSlide(BaseSlide):
 
             # Add the logo first to get its dimensions
             try:
-                logo = slide.shapes.add_picture(
-                    str(logo_path),
+                logo = add_picture(
+                    slide.shapes, logo_path,
                     Inches(0),  # Temporary position
                     Inches(0),
                     height=logo_height
@@ -207,8 +214,8 @@ class TitleSlide(BaseSlide):
                 logo_height = Inches(1.0)  # Reasonable size for corner logo
 
                 try:
-                    sil_logo = slide.shapes.add_picture(
-                        str(sil_logo_path),
+                    sil_logo = add_picture(
+                        slide.shapes, sil_logo_path,
                         Inches(0.5),  # Left margin
                         Inches(6.0),  # Bottom position
                         height=logo_height
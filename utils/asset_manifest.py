@@ -0,0 +1,80 @@
+# utils/asset_manifest.py
+"""
+Pre-baked team assets
+assets/compile_assets.py writes slide-ready fan images and team logos to
+assets/compiled/ with a manifest keyed by team. Slide generators resolve them
+here with a dict lookup instead of probing the source folders on every build;
+None means the asset wasn't compiled and callers fall back to the source files.
+"""
+
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+COMPILED_ASSETS_DIR = PROJECT_ROOT / 'assets' / 'compiled'
+MANIFEST_PATH = COMPILED_ASSETS_DIR / 'manifest.json'
+
+
+def team_asset_key(team_name: str) -> str:
+    """Manifest key for a team: 'Utah Jazz', 'UtahJazz' and 'utah_jazz' all map to 'utahjazz'"""
+    return re.sub(r'[^0-9a-z]', '', (team_name or '').casefold())
+
+
+class AssetManifest:
+    """Read-only view of assets/compiled/manifest.json (loaded once per process)"""
+
+    def __init__(self, manifest_path: Path = MANIFEST_PATH):
+        self.manifest_path = Path(manifest_path)
+        self._lock = threading.Lock()
+        self._teams: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._teams is None:
+            with self._lock:
+                if self._teams is None:
+                    try:
+                        with open(self.manifest_path) as f:
+                            self._teams = json.load(f).get('teams', {})
+                        logger.info(f"Loaded compiled assets for {len(self._teams)} teams")
+                    except FileNotFoundError:
+                        logger.info("No compiled asset manifest; using source assets "
+                                    "(run assets/compile_assets.py)")
+                        self._teams = {}
+                    except Exception as e:
+                        logger.warning(f"Could not read asset manifest {self.manifest_path}: {e}")
+                        self._teams = {}
+        return self._teams
+
+    def reload(self):
+        """Re-read the manifest on next lookup (e.g. after recompiling)"""
+        with self._lock:
+            self._teams = None
+
+    def entry(self, team_name: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry for a team, or None"""
+        return self._load().get(team_asset_key(team_name))
+
+    def _asset(self, team_name: str, kind: str) -> Optional[Path]:
+        entry = self.entry(team_name)
+        if not entry or not entry.get(kind):
+            return None
+        path = self.manifest_path.parent / entry[kind]
+        return path if path.exists() else None
+
+    def fan_image(self, team_name: str) -> Optional[Path]:
+        """Slide-ready fan image (circle-cropped JPEG on white) for a team"""
+        return self._asset(team_name, 'fan_image')
+
+    def team_logo(self, team_name: str) -> Optional[Path]:
+        """Slide-ready team logo (PNG) for a team"""
+        return self._asset(team_name, 'team_logo')
+
+
+# Global asset manifest instance
+asset_manifest = AssetManifest()
@@ -1,21 +1,49 @@
 """
 CacheManager - Centralized caching layer for SIL PowerPoint Generator
 Integrates with existing PostgreSQL connection pool for optimal performance
+UPDATED: In-process L1 cache with buffered hit-count/statistics writes
+UPDATED: Hit/miss statistics aggregated in memory by CacheStatsWriter
 """
 
+import atexit
 import hashlib
 import json
 import logging
+import os
+import threading
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 from contextlib import contextmanager
 import time
 
 from psycopg2.extras import RealDictCursor, Json, execute_values
 import psycopg2
+import psycopg2.pool
+
+from .cache_stats import CacheStatsWriter
+from .local_cache import LocalCache
 
 logger = logging.getLogger(__name__)
 
+# In-process L1 cache settings
+L1_MAX_ENTRIES = int(os.getenv('CACHE_L1_MAX_ENTRIES', '5000'))
+L1_SNOWFLAKE_MAX_ENTRIES = int(os.getenv('CACHE_L1_SNOWFLAKE_MAX_ENTRIES', '16'))
+L1_TTL_SECONDS = int(os.getenv('CACHE_L1_TTL_SECONDS', '300'))
+
+# How often buffered hit counts and statistics are written to PostgreSQL
+FLUSH_INTERVAL_SECONDS = float(os.getenv('CACHE_FLUSH_INTERVAL_SECONDS', '10'))
+
+CACHE_TYPES = ['merchant_names', 'ai_insights', 'snowflake_results', 'logos']
+
+# Cache type -> (table, key column, has last_accessed column)
+HIT_COUNT_TABLES = {
+    'merchant_names': ('cache_merchant_names', 'cache_key', True),
+    'ai_insights': ('cache_ai_insights', 'cache_key', True),
+    'snowflake_results': ('cache_snowflake_results', 'cache_key', True),
+    'logos': ('cache_logos', 'merchant_name', False),
+}
+
 
 class CacheManager:
     """
@@ -23,22 +51,68 @@ class CacheManager:
     Uses PostgreSQL as the cache backend for persistence and sharing across instances.
     """
 
-    def __init__(self, connection_pool):
+    def __init__(self, connection_pool, l1_max_entries: int = L1_MAX_ENTRIES,
+                 l1_ttl_seconds: float = L1_TTL_SECONDS,
+                 flush_interval: float = FLUSH_INTERVAL_SECONDS):
         """
         Initialize with existing PostgreSQL connection pool.
 
         Args:
-            connection_pool: SimpleConnectionPool instance from PostgreSQLJobStore
+            connection_pool: ThreadedConnectionPool instance from PostgreSQLJobStore
+            l1_max_entries: Max in-process entries per cache family (0 disables L1)
+            l1_ttl_seconds: Time to live for in-process entries
+            flush_interval: Seconds between writes of buffered hit counts/statistics
         """
         self.pool = connection_pool
+        self.flush_interval = flush_interval
+
+        # L1: one bounded LRU/TTL cache per family; PostgreSQL is only queried on an L1 miss
+        self.l1_enabled = l1_max_entries > 0 and l1_ttl_seconds > 0
+        self._l1 = {
+            cache_type: LocalCache(
+                max_entries=min(l1_max_entries, L1_SNOWFLAKE_MAX_ENTRIES)
+                if cache_type == 'snowflake_results' else l1_max_entries,
+                ttl_seconds=l1_ttl_seconds if self.l1_enabled else 0
+            )
+            for cache_type in CACHE_TYPES
+        }
+
+        # Buffered hit_count writes, flushed by a background timer
+        self._pending_lock = threading.Lock()
+        self._pending_hit_counts = {cache_type: Counter() for cache_type in HIT_COUNT_TABLES}
+        self._flush_stop = threading.Event()
+        self._flush_thread = None
+
+        # Hit/miss statistics are counted in memory and upserted periodically
+        self.stats_writer = CacheStatsWriter(self._get_connection, flush_interval=flush_interval)
+
         self._ensure_cache_stats()
 
+        # Drain buffered counts when the process exits
+        atexit.register(self.close)
+
+    def _acquire_connection(self, timeout: float = 5.0):
+        """
+        Get a connection, waiting briefly if the pool is exhausted.
+
+        psycopg2's pools raise PoolError instead of blocking, which concurrent
+        category analysis threads can hit during bursts of cache lookups.
+        """
+        deadline = time.time() + timeout
+        while True:
+            try:
+                return self.pool.getconn()
+            except psycopg2.pool.PoolError:
+                if time.time() >= deadline:
+                    raise
+                time.sleep(0.05)
+
     @contextmanager
     def _get_connection(self):
         """Get a connection from the pool."""
         conn = None
         try:
-            conn = self.pool.getconn()
+            conn = self._acquire_connection()
             yield conn
         except Exception as e:
             if conn:
@@ -52,8 +126,7 @@ class CacheManager:
         """Initialize cache statistics for today if not exists."""
         with self._get_connection() as conn:
             with conn.cursor() as cur:
-                cache_types = ['merchant_names', 'ai_insights', 'snowflake_results', 'logos']
-                for cache_type in cache_types:
+                for cache_type in CACHE_TYPES:
                     cur.execute("""
                         INSERT INTO cache_statistics (cache_type, date, hits, misses)
                         VALUES (%s, CURRENT_DATE, 0, 0)
@@ -61,17 +134,80 @@ class CacheManager:
                     """, (cache_type,))
                 conn.commit()
 
-    def _update_stats(self, cache_type: str, hit: bool):
-        """Update cache statistics."""
-        with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                field = 'hits' if hit else 'misses'
-                cur.execute(f"""
-                    UPDATE cache_statistics
-                    SET {field} = {field} + 1
-                    WHERE cache_type = %s AND date = CURRENT_DATE
-                """, (cache_type,))
-                conn.commit()
+    def _update_stats(self, cache_type: str, hit: bool, count: int = 1):
+        """Count cache lookups (persisted by the stats writer)."""
+        if hit:
+            self.stats_writer.record(cache_type, hits=count)
+        else:
+            self.stats_writer.record(cache_type, misses=count)
+
+    def _record_hits(self, cache_type: str, keys: List[str]):
+        """Buffer hit_count increments for cache entries (written by flush())."""
+        if not keys:
+            return
+        with self._pending_lock:
+            self._pending_hit_counts[cache_type].update(keys)
+        self._start_flusher()
+
+    def _start_flusher(self):
+        """Start the background flush timer on first buffered write."""
+        if self._flush_thread is not None and self._flush_thread.is_alive():
+            return
+        with self._pending_lock:
+            if self._flush_thread is not None and self._flush_thread.is_alive():
+                return
+            if self._flush_stop.is_set():
+                return
+            self._flush_thread = threading.Thread(
+                target=self._flush_loop, name="cache-hit-count-flusher", daemon=True
+            )
+            self._flush_thread.start()
+
+    def _flush_loop(self):
+        while not self._flush_stop.wait(self.flush_interval):
+            self._flush_hit_counts()
+
+    def flush(self):
+        """Write buffered hit counts and statistics."""
+        self._flush_hit_counts()
+        self.stats_writer.flush()
+
+    def _flush_hit_counts(self):
+        """Write buffered hit_count increments in one transaction."""
+        with self._pending_lock:
+            hit_counts = {t: counts for t, counts in self._pending_hit_counts.items() if counts}
+            self._pending_hit_counts = {cache_type: Counter() for cache_type in HIT_COUNT_TABLES}
+
+        if not hit_counts:
+            return
+
+        try:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    for cache_type, counts in hit_counts.items():
+                        table, key_column, has_last_accessed = HIT_COUNT_TABLES[cache_type]
+                        last_accessed = ", last_accessed = NOW()" if has_last_accessed else ""
+                        execute_values(cur, f"""
+                            UPDATE {table} AS t
+                            SET hit_count = t.hit_count + v.n{last_accessed}
+                            FROM (VALUES %s) AS v(key, n)
+                            WHERE t.{key_column} = v.key
+                        """, list(counts.items()))
+                    conn.commit()
+        except Exception as e:
+            # Keep the counts for the next flush rather than losing them
+            logger.warning(f"Failed to flush cache hit counts: {e}")
+            with self._pending_lock:
+                for cache_type, counts in hit_counts.items():
+                    self._pending_hit_counts[cache_type].update(counts)
+
+    def close(self):
+        """Stop the flush timers and write any buffered updates."""
+        self._flush_stop.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join(timeout=self.flush_interval + 5)
+        self._flush_hit_counts()
+        self.stats_writer.close()
 
     # ==================== MERCHANT NAME CACHE ====================
 
@@ -87,6 +223,12 @@ class CacheManager:
         """
         start_time = time.time()
 
+        local = self._l1['merchant_names'].get(raw_name)
+        if local is not None:
+            self._record_hits('merchant_names', [raw_name])
+            self._update_stats('merchant_names', True)
+            return local[0], local[1], True
+
         with self._get_connection() as conn:
             with conn.cursor() as cur:
                 # Check cache
@@ -98,22 +240,16 @@ class CacheManager:
 
                 result = cur.fetchone()
 
-                if result:
-                    # Update hit count and last accessed
-                    cur.execute("""
-                        UPDATE cache_merchant_names
-                        SET hit_count = hit_count + 1, last_accessed = NOW()
-                        WHERE cache_key = %s
-                    """, (raw_name,))
-                    conn.commit()
-
-                    self._update_stats('merchant_names', True)
-                    logger.debug(f"Merchant cache HIT: {raw_name} -> {result[0]} ({time.time() - start_time:.3f}s)")
-                    return result[0], result[1], True
-                else:
-                    self._update_stats('merchant_names', False)
-                    logger.debug(f"Merchant cache MISS: {raw_name} ({time.time() - start_time:.3f}s)")
-                    return raw_name, 0.0, False
+        if result:
+            self._l1['merchant_names'].set(raw_name, (result[0], result[1]))
+            self._record_hits('merchant_names', [raw_name])
+            self._update_stats('merchant_names', True)
+            logger.debug(f"Merchant cache HIT: {raw_name} -> {result[0]} ({time.time() - start_time:.3f}s)")
+            return result[0], result[1], True
+        else:
+            self._update_stats('merchant_names', False)
+            logger.debug(f"Merchant cache MISS: {raw_name} ({time.time() - start_time:.3f}s)")
+            return raw_name, 0.0, False
 
     def set_merchant_name(self, raw_name: str, standardized_name: str,
                           confidence_score: float = 0.95, source: str = 'api'):
@@ -142,8 +278,45 @@ class CacheManager:
                 """, (raw_name, standardized_name, confidence_score, source))
                 conn.commit()
 
+        self._l1['merchant_names'].set(raw_name, (standardized_name, confidence_score))
         logger.info(f"Cached merchant name: {raw_name} -> {standardized_name}")
 
+    def set_merchant_names_batch(self, mappings: Dict[str, str],
+                                 confidence_score: float = 0.95, source: str = 'api'):
+        """
+        Add or update many merchant names in one statement.
+
+        Args:
+            mappings: Dict mapping raw_name to standardized_name
+            confidence_score: Confidence in the mappings (0-1)
+            source: Source of the mappings (api, manual, ml, etc.)
+        """
+        if not mappings:
+            return
+
+        rows = [(raw_name, standardized_name, confidence_score, source)
+                for raw_name, standardized_name in mappings.items()]
+
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO cache_merchant_names 
+                        (cache_key, standardized_name, confidence_score, source, expires_at)
+                    VALUES %s
+                    ON CONFLICT (cache_key) 
+                    DO UPDATE SET
+                        standardized_name = EXCLUDED.standardized_name,
+                        confidence_score = EXCLUDED.confidence_score,
+                        source = EXCLUDED.source,
+                        expires_at = EXCLUDED.expires_at,
+                        last_accessed = NOW()
+                """, rows, template="(%s, %s, %s, %s, NOW() + INTERVAL '30 days')", page_size=500)
+                conn.commit()
+
+        for raw_name, standardized_name in mappings.items():
+            self._l1['merchant_names'].set(raw_name, (standardized_name, confidence_score))
+        logger.info(f"Cached {len(rows)} merchant names in one batch")
+
     def get_merchant_names_batch(self, raw_names: List[str]) -> Dict[str, Tuple[str, float, bool]]:
         """
         Get multiple merchant names in one query (efficient for batch processing).
@@ -160,41 +333,48 @@ class CacheManager:
         start_time = time.time()
         results = {}
 
-        with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                # Get all cached values in one query
-                cur.execute("""
-                    SELECT cache_key, standardized_name, confidence_score
-                    FROM cache_merchant_names
-                    WHERE cache_key = ANY(%s) AND expires_at > NOW()
-                """, (raw_names,))
-
-                cached = {row[0]: (row[1], row[2]) for row in cur.fetchall()}
-
-                # Update hit counts for found entries
-                if cached:
+        # Serve what we can from L1, query PostgreSQL for the rest
+        local_cache = self._l1['merchant_names']
+        cached = {}
+        for raw_name in dict.fromkeys(raw_names):
+            local = local_cache.get(raw_name)
+            if local is not None:
+                cached[raw_name] = local
+        remaining = [name for name in dict.fromkeys(raw_names) if name not in cached]
+
+        if remaining:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    # Get all cached values in one query
                     cur.execute("""
-                        UPDATE cache_merchant_names
-                        SET hit_count = hit_count + 1, last_accessed = NOW()
-                        WHERE cache_key = ANY(%s)
-                    """, (list(cached.keys()),))
-                    conn.commit()
-
-                # Build results
-                hits = 0
-                for raw_name in raw_names:
-                    if raw_name in cached:
-                        results[raw_name] = (cached[raw_name][0], cached[raw_name][1], True)
-                        hits += 1
-                    else:
-                        results[raw_name] = (raw_name, 0.0, False)
-
-                # Update stats
-                self._update_stats('merchant_names', True)  # Count as hit if any found
-
-                hit_rate = (hits / len(raw_names)) * 100 if raw_names else 0
-                logger.info(
-                    f"Merchant batch lookup: {hits}/{len(raw_names)} hits ({hit_rate:.1f}%) in {time.time() - start_time:.3f}s")
+                        SELECT cache_key, standardized_name, confidence_score
+                        FROM cache_merchant_names
+                        WHERE cache_key = ANY(%s) AND expires_at > NOW()
+                    """, (remaining,))
+
+                    for row in cur.fetchall():
+                        cached[row[0]] = (row[1], row[2])
+                        local_cache.set(row[0], (row[1], row[2]))
+
+        # Buffer hit counts for found entries
+        self._record_hits('merchant_names', list(cached.keys()))
+
+        # Build results
+        hits = 0
+        for raw_name in raw_names:
+            if raw_name in cached:
+                results[raw_name] = (cached[raw_name][0], cached[raw_name][1], True)
+                hits += 1
+            else:
+                results[raw_name] = (raw_name, 0.0, False)
+
+        # Update stats
+        self._update_stats('merchant_names', True, hits)
+        self._update_stats('merchant_names', False, len(raw_names) - hits)
+
+        hit_rate = (hits / len(raw_names)) * 100 if raw_names else 0
+        logger.info(
+            f"Merchant batch lookup: {hits}/{len(raw_names)} hits ({hit_rate:.1f}%) in {time.time() - start_time:.3f}s")
 
         return results
 
@@ -223,32 +403,30 @@ class CacheManager:
         """
         cache_key = self._generate_ai_cache_key(prompt_template, team_key=team_key, **context)
 
-        with self._get_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT response_data, model_used, tokens_used
-                    FROM cache_ai_insights
-                    WHERE cache_key = %s AND expires_at > NOW()
-                """, (cache_key,))
-
-                result = cur.fetchone()
-
-                if result:
-                    # Update hit count
+        local = self._l1['ai_insights'].get(cache_key)
+        if local is None:
+            with self._get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute("""
-                        UPDATE cache_ai_insights
-                        SET hit_count = hit_count + 1, last_accessed = NOW()
-                        WHERE cache_key = %s
+                        SELECT response_data, model_used, tokens_used
+                        FROM cache_ai_insights
+                        WHERE cache_key = %s AND expires_at > NOW()
                     """, (cache_key,))
-                    conn.commit()
 
-                    self._update_stats('ai_insights', True)
-                    logger.info(f"AI cache HIT: {prompt_template} for {team_key}")
-                    return dict(result)
-                else:
-                    self._update_stats('ai_insights', False)
-                    logger.debug(f"AI cache MISS: {prompt_template} for {team_key}")
-                    return None
+                    result = cur.fetchone()
+
+            if not result:
+                self._update_stats('ai_insights', False)
+                logger.debug(f"AI cache MISS: {prompt_template} for {team_key}")
+                return None
+
+            local = dict(result)
+            self._l1['ai_insights'].set(cache_key, local)
+
+        self._record_hits('ai_insights', [cache_key])
+        self._update_stats('ai_insights', True)
+        logger.info(f"AI cache HIT: {prompt_template} for {team_key}")
+        return dict(local)
 
     def set_ai_insight(self, prompt_template: str, insight_type: str,
                        response_data: Dict[str, Any], model_used: str = 'gpt-4',
@@ -287,6 +465,12 @@ class CacheManager:
                       insight_type, Json(response_data), model_used, tokens_used, ttl_days))
                 conn.commit()
 
+        self._l1['ai_insights'].set(cache_key, {
+            'response_data': response_data,
+            'model_used': model_used,
+            'tokens_used': tokens_used
+        })
+
         logger.info(f"Cached AI insight: {prompt_template} for {team_key} (TTL: {ttl_days} days)")
 
     # ==================== SNOWFLAKE RESULTS CACHE ====================
@@ -297,55 +481,56 @@ class CacheManager:
         combined = f"{query_template}:{params_str}"
         return hashlib.sha256(combined.encode()).hexdigest()
 
-    def get_snowflake_result(self, query_template: str, team_key: str,
-                             view_name: str, **params) -> Optional[List[Dict]]:
+    def get_snowflake_result(self, query_template: str, team_key: Optional[str],
+                             view_name: str, **params) -> Optional[Union[List[Dict], Dict[str, Any]]]:
         """
         Get cached Snowflake query result.
 
         Args:
-            query_template: Query identifier
+            query_template: Query identifier (query_to_dataframe uses the normalized SQL)
             team_key: Team identifier
             view_name: Snowflake view name
             **params: Query parameters
 
         Returns:
-            Cached result data or None if not found
+            Cached result data (columnar dict from query_to_dataframe) or None if not found
         """
         cache_key = self._generate_snowflake_cache_key(
             query_template, team_key=team_key, view_name=view_name, **params
         )
 
-        with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT result_data, row_count
-                    FROM cache_snowflake_results
-                    WHERE cache_key = %s AND expires_at > NOW()
-                """, (cache_key,))
-
-                result = cur.fetchone()
-
-                if result:
-                    # Update hit count
+        l1 = self._l1['snowflake_results']
+        local = l1.get(cache_key)
+        if local is None:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
                     cur.execute("""
-                        UPDATE cache_snowflake_results
-                        SET hit_count = hit_count + 1, last_accessed = NOW()
-                        WHERE cache_key = %s
+                        SELECT result_data, row_count,
+                               EXTRACT(EPOCH FROM expires_at - NOW()) AS remaining_seconds
+                        FROM cache_snowflake_results
+                        WHERE cache_key = %s AND expires_at > NOW()
                     """, (cache_key,))
-                    conn.commit()
 
-                    self._update_stats('snowflake_results', True)
-                    logger.info(f"Snowflake cache HIT: {view_name} for {team_key} ({result[1]} rows)")
-                    return result[0]
-                else:
-                    self._update_stats('snowflake_results', False)
-                    logger.debug(f"Snowflake cache MISS: {view_name} for {team_key}")
-                    return None
+                    result = cur.fetchone()
+
+            if not result:
+                self._update_stats('snowflake_results', False)
+                logger.debug(f"Snowflake cache MISS: {view_name} for {team_key}")
+                return None
+
+            local = (result[0], result[1])
+            # The L1 copy must not outlive the row it was read from
+            l1.set(cache_key, local, ttl_seconds=min(l1.ttl_seconds, float(result[2])))
 
-    def set_snowflake_result(self, query_template: str, team_key: str,
-                             view_name: str, result_data: List[Dict],
+        self._record_hits('snowflake_results', [cache_key])
+        self._update_stats('snowflake_results', True)
+        logger.info(f"Snowflake cache HIT: {view_name} for {team_key} ({local[1]} rows)")
+        return local[0]
+
+    def set_snowflake_result(self, query_template: str, team_key: Optional[str],
+                             view_name: str, result_data: Union[List[Dict], Dict[str, Any]],
                              query_duration_ms: Optional[int] = None,
-                             ttl_hours: int = 24, **params):
+                             ttl_hours: int = 24, row_count: Optional[int] = None, **params):
         """
         Cache a Snowflake query result.
 
@@ -353,14 +538,17 @@ class CacheManager:
             query_template: Query identifier
             team_key: Team identifier
             view_name: Snowflake view name
-            result_data: Query results to cache
+            result_data: Query results to cache (list of rows or columnar dict)
             query_duration_ms: Original query execution time
             ttl_hours: Time to live in hours
+            row_count: Number of rows (defaults to len(result_data) for row lists)
             **params: Query parameters
         """
         cache_key = self._generate_snowflake_cache_key(
             query_template, team_key=team_key, view_name=view_name, **params
         )
+        if row_count is None:
+            row_count = len(result_data)
 
         with self._get_connection() as conn:
             with conn.cursor() as cur:
@@ -377,11 +565,14 @@ class CacheManager:
                         expires_at = EXCLUDED.expires_at,
                         last_accessed = NOW()
                 """, (cache_key, query_template, team_key, view_name,
-                      params.get('time_period'), Json(result_data), len(result_data),
+                      params.get('time_period'), Json(result_data), row_count,
                       query_duration_ms, ttl_hours))
                 conn.commit()
 
-        logger.info(f"Cached Snowflake result: {view_name} for {team_key} ({len(result_data)} rows, TTL: {ttl_hours}h)")
+        l1 = self._l1['snowflake_results']
+        l1.set(cache_key, (result_data, row_count), ttl_seconds=min(l1.ttl_seconds, ttl_hours * 3600))
+
+        logger.info(f"Cached Snowflake result: {view_name} for {team_key} ({row_count} rows, TTL: {ttl_hours}h)")
 
     # ==================== LOGO CACHE ====================
 
@@ -395,31 +586,29 @@ class CacheManager:
         Returns:
             Logo URL or None if not found/not cached
         """
-        with self._get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT logo_url, logo_found
-                    FROM cache_logos
-                    WHERE merchant_name = %s AND expires_at > NOW()
-                """, (merchant_name,))
-
-                result = cur.fetchone()
-
-                if result:
-                    # Update hit count
+        result = self._l1['logos'].get(merchant_name)
+        if result is None:
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
                     cur.execute("""
-                        UPDATE cache_logos
-                        SET hit_count = hit_count + 1
-                        WHERE merchant_name = %s
+                        SELECT logo_url, logo_found
+                        FROM cache_logos
+                        WHERE merchant_name = %s AND expires_at > NOW()
                     """, (merchant_name,))
-                    conn.commit()
 
-                    self._update_stats('logos', True)
-                    # Return None if we previously determined no logo exists
-                    return result[0] if result[1] else None
-                else:
-                    self._update_stats('logos', False)
-                    return None
+                    result = cur.fetchone()
+
+            if not result:
+                self._update_stats('logos', False)
+                return None
+
+            result = (result[0], result[1])
+            self._l1['logos'].set(merchant_name, result)
+
+        self._record_hits('logos', [merchant_name])
+        self._update_stats('logos', True)
+        # Return None if we previously determined no logo exists
+        return result[0] if result[1] else None
 
     def set_logo_url(self, merchant_name: str, logo_url: Optional[str],
                      source: str = 'api', ttl_days: int = 60):
@@ -450,34 +639,47 @@ class CacheManager:
                 """, (merchant_name, logo_url, source, logo_found, ttl_days))
                 conn.commit()
 
+        self._l1['logos'].set(merchant_name, (logo_url, logo_found))
+
         status = "found" if logo_found else "not found"
         logger.info(f"Cached logo lookup: {merchant_name} - {status}")
 
     # ==================== CACHE MANAGEMENT ====================
 
     def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
-        """Get comprehensive cache statistics."""
+        """Get comprehensive cache statistics (persisted plus unflushed counts)."""
         stats = {}
 
+        # Get today's hit/miss stats (no flush can land between the two reads)
+        with self.stats_writer.paused():
+            with self._get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT cache_type, hits, misses
+                        FROM cache_statistics
+                        WHERE date = CURRENT_DATE
+                    """)
+                    persisted = {row[0]: (row[1], row[2]) for row in cur.fetchall()}
+            pending = self.stats_writer.pending()
+
+        for cache_type in list(persisted) + [t for t in pending if t not in persisted]:
+            unflushed = pending.get(cache_type, {'hits': 0, 'misses': 0})
+            hits, misses = persisted.get(cache_type, (0, 0))
+            hits += unflushed['hits']
+            misses += unflushed['misses']
+            total = hits + misses
+            hit_rate = (hits / total * 100) if total > 0 else 0
+            stats[cache_type] = {
+                'hits': hits,
+                'misses': misses,
+                'total': total,
+                'hit_rate': hit_rate,
+                'unflushed_hits': unflushed['hits'],
+                'unflushed_misses': unflushed['misses']
+            }
+
         with self._get_connection() as conn:
             with conn.cursor() as cur:
-                # Get today's hit/miss stats
-                cur.execute("""
-                    SELECT cache_type, hits, misses
-                    FROM cache_statistics
-                    WHERE date = CURRENT_DATE
-                """)
-
-                for row in cur.fetchall():
-                    total = row[1] + row[2]
-                    hit_rate = (row[1] / total * 100) if total > 0 else 0
-                    stats[row[0]] = {
-                        'hits': row[1],
-                        'misses': row[2],
-                        'total': total,
-                        'hit_rate': hit_rate
-                    }
-
                 # Get cache sizes and space usage
                 cur.execute("SELECT * FROM get_cache_stats()")
                 for row in cur.fetchall():
@@ -490,6 +692,11 @@ class CacheManager:
                             'space_mb': float(row[4])
                         })
 
+        # In-process L1 counters for this worker
+        for cache_type, local_cache in self._l1.items():
+            if cache_type in stats:
+                stats[cache_type]['l1'] = local_cache.stats()
+
         return stats
 
     def clean_expired_entries(self) -> Dict[str, int]:
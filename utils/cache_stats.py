@@ -0,0 +1,120 @@
+"""
+CacheStatsWriter - Aggregated cache hit/miss statistics
+Counts lookups in memory and upserts them into cache_statistics periodically,
+so lookups never wait on (or contend for) the shared per-day statistics rows
+"""
+
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStatsWriter:
+    """
+    In-memory hit/miss counters per cache type with a background flush.
+    Each flush writes one INSERT ... ON CONFLICT DO UPDATE per cache type, dated
+    with the database's CURRENT_DATE (the date CacheManager.get_cache_stats reads).
+    """
+
+    def __init__(self, get_connection: Callable[[], ContextManager], flush_interval: float = 10.0):
+        """
+        Initialize the writer (the flush timer starts on the first recorded lookup).
+
+        Args:
+            get_connection: Context manager factory yielding a PostgreSQL connection
+            flush_interval: Seconds between flushes
+        """
+        self._get_connection = get_connection
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, Counter] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, cache_type: str, hits: int = 0, misses: int = 0):
+        """
+        Count cache lookups.
+
+        Args:
+            cache_type: Cache family (merchant_names, ai_insights, ...)
+            hits: Number of hits to add
+            misses: Number of misses to add
+        """
+        if hits <= 0 and misses <= 0:
+            return
+        with self._lock:
+            counts = self._pending.setdefault(cache_type, Counter())
+            counts['hits'] += max(hits, 0)
+            counts['misses'] += max(misses, 0)
+        self._start()
+
+    def pending(self) -> Dict[str, Dict[str, int]]:
+        """Counts not yet persisted, by cache type."""
+        with self._lock:
+            return {
+                cache_type: {'hits': counts['hits'], 'misses': counts['misses']}
+                for cache_type, counts in self._pending.items()
+            }
+
+    @contextmanager
+    def paused(self):
+        """
+        Hold off flushes, so persisted rows read inside the block plus pending()
+        count every lookup exactly once.
+        """
+        with self._flush_lock:
+            yield
+
+    def _start(self):
+        """Start the background flush timer if it is not running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._stop.is_set() or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run, name="cache-stats-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Upsert all pending counts into cache_statistics."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, {}
+
+            try:
+                with self._get_connection() as conn:
+                    with conn.cursor() as cur:
+                        for cache_type, counts in sorted(batch.items()):
+                            cur.execute("""
+                                INSERT INTO cache_statistics (cache_type, date, hits, misses)
+                                VALUES (%s, CURRENT_DATE, %s, %s)
+                                ON CONFLICT (cache_type, date) DO UPDATE SET
+                                    hits = cache_statistics.hits + EXCLUDED.hits,
+                                    misses = cache_statistics.misses + EXCLUDED.misses
+                            """, (cache_type, counts['hits'], counts['misses']))
+                        conn.commit()
+            except Exception as e:
+                # Keep the counts for the next flush rather than losing them
+                logger.warning(f"Failed to flush cache statistics: {e}")
+                with self._lock:
+                    for cache_type, counts in batch.items():
+                        self._pending.setdefault(cache_type, Counter()).update(counts)
+
+    def close(self):
+        """Stop the flush timer and drain pending counts."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
@@ -2,18 +2,150 @@
 """
 Enhanced Logo Manager for Fan Wheel Integration
 Handles local logo files with fallback strategies
+UPDATED: Logo files are found through a shared filename index instead of probing the disk
 """
 
 import logging
+import os
+import threading
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Iterable, Optional, Dict, Tuple
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import re
 import unicodedata
 
+from .local_cache import LocalCache
+
 logger = logging.getLogger(__name__)
 
+# Prepared logos kept per LogoManager (the shared one serves /api/logos, so names come from users)
+LOGO_CACHE_MAX_ENTRIES = int(os.getenv('LOGO_CACHE_MAX_ENTRIES', '2000'))
+LOGO_CACHE_TTL_SECONDS = float(os.getenv('LOGO_CACHE_TTL_SECONDS', '3600'))
+
+# Common abbreviations/variations: merchant name fragment -> logo filenames to try
+MERCHANT_LOGO_ALIASES = {
+    'mcdonalds': ['mcdonalds', 'mcd', 'mcdonald'],
+    'taco bell': ['tacobell', 'taco_bell'],
+    'kwik trip': ['kwiktrip', 'kwik_trip'],
+    'auto zone': ['autozone', 'auto_zone'],
+    'krispy kreme': ['krispykreme', 'krispy_kreme', 'kk'],
+    'jewel osco': ['jewelosco', 'jewel_osco', 'jewel'],
+    'binny\'s': ['binnys', 'binny', 'binnys_beverage'],
+    'ulta': ['ulta', 'ulta_beauty'],
+    'grubhub': ['grubhub', 'grub_hub'],
+    'wayfair': ['wayfair'],
+    # Add O'Reilly specific mappings
+    'oreilly': ['oreilly_auto_parts', 'oreillyautoparts', 'oreilly_auto'],
+    'o\'reilly': ['oreilly_auto_parts', 'oreillyautoparts', 'oreilly_auto'],
+    'oreillyauto': ['oreilly_auto_parts', 'oreillyautoparts'],
+    'oreillyautoparts': ['oreilly_auto_parts'],
+    # Add Dave & Buster's specific mappings
+    'dave & buster': ['dave_&_busters', 'dave_and_busters', 'daveandbusters', 'dave_busters'],
+    'dave&buster': ['dave_&_busters', 'dave_and_busters', 'daveandbusters'],
+    'davebusters': ['dave_&_busters', 'dave_and_busters', 'daveandbusters'],
+    # Add EōS Fitness specific mappings
+    'eōs fitness': ['eos_fitness', 'eos', 'eosfitness'],
+    'eos fitness': ['eos_fitness', 'eos', 'eosfitness'],
+}
+
+
+def normalize_logo_name(name: str) -> str:
+    """Index key for a logo filename or search name (unicode-normalized, casefolded)"""
+    return unicodedata.normalize('NFC', name).casefold()
+
+
+class LogoIndex:
+    """Filename index of a logo directory, rebuilt when the directory's mtime changes"""
+
+    # Preferred extension when a name exists in several formats
+    EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff')
+
+    def __init__(self, logo_dir: Path):
+        self.logo_dir = Path(logo_dir)
+        self._lock = threading.Lock()
+        self._files: Dict[str, Path] = {}
+        self._mtime = None
+        self.generation = 0  # bumped on every rebuild
+
+    def refresh(self) -> int:
+        """Rebuild the index if the directory changed; returns the index generation"""
+        try:
+            mtime = os.stat(self.logo_dir).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        if mtime != self._mtime or self.generation == 0:
+            with self._lock:
+                if mtime != self._mtime or self.generation == 0:
+                    self._files = self._scan()
+                    self._mtime = mtime
+                    self.generation += 1
+                    logger.debug(f"Indexed {len(self._files)} logos in {self.logo_dir}")
+        return self.generation
+
+    def _scan(self) -> Dict[str, Path]:
+        files = {}
+        try:
+            entries = [entry for entry in os.scandir(self.logo_dir) if entry.is_file()]
+        except FileNotFoundError:
+            return files
+
+        paths = [Path(entry.path) for entry in entries if Path(entry.name).suffix.lower() in self.EXTENSIONS]
+        paths.sort(key=lambda path: (self.EXTENSIONS.index(path.suffix.lower()), path.name))
+        for path in paths:
+            files.setdefault(normalize_logo_name(path.stem), path)
+        return files
+
+    def find(self, names: Iterable[str]) -> Optional[Path]:
+        """First indexed file matching any of the names (call refresh() first)"""
+        files = self._files
+        for name in names:
+            path = files.get(normalize_logo_name(name))
+            if path is not None:
+                return path
+        return None
+
+
+_NOT_CACHED = object()
+
+_registry_lock = threading.Lock()
+_logo_indexes: Dict[Path, LogoIndex] = {}
+_logo_managers: Dict[Path, 'LogoManager'] = {}
+
+
+def _default_logo_dir() -> Path:
+    return Path(__file__).parent.parent / 'assets' / 'logos' / 'merchants'
+
+
+def get_logo_index(logo_dir: Path) -> LogoIndex:
+    """Process-wide filename index for a logo directory"""
+    key = Path(logo_dir).resolve()
+    with _registry_lock:
+        if key not in _logo_indexes:
+            _logo_indexes[key] = LogoIndex(key)
+        return _logo_indexes[key]
+
+
+def get_logo_manager(logo_dir: Optional[Path] = None) -> 'LogoManager':
+    """
+    Process-wide LogoManager (shared by FanWheel, CategorySlide and the API endpoints)
+
+    Args:
+        logo_dir: Path to logo directory (defaults to assets/logos/merchants)
+
+    Returns:
+        The shared LogoManager for that directory
+    """
+    key = Path(logo_dir or _default_logo_dir()).resolve()
+    with _registry_lock:
+        manager = _logo_managers.get(key)
+    if manager is None:
+        manager = LogoManager(key)
+        with _registry_lock:
+            manager = _logo_managers.setdefault(key, manager)
+    return manager
+
 
 class LogoManager:
     """Manage local logo files with intelligent fallbacks"""
@@ -27,16 +159,21 @@ class LogoManager:
         """
         # Set default logo directory
         if logo_dir is None:
-            logo_dir = Path(__file__).parent.parent / 'assets' / 'logos' / 'merchants'
+            logo_dir = _default_logo_dir()
 
         self.logo_dir = Path(logo_dir)
         self.logo_dir.mkdir(parents=True, exist_ok=True)
 
-        # Cache for loaded logos
-        self._logo_cache: Dict[str, Optional[Image.Image]] = {}
+        # Bounded, thread-safe cache of prepared logos and misses (cleared whenever the index is rebuilt)
+        self._logo_cache = LocalCache(max_entries=LOGO_CACHE_MAX_ENTRIES, ttl_seconds=LOGO_CACHE_TTL_SECONDS)
+        self._generation_lock = threading.Lock()
 
         # Supported image formats
-        self.supported_formats = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff'}
+        self.supported_formats = set(LogoIndex.EXTENSIONS)
+
+        # Filename index shared with every other LogoManager on this directory
+        self.index = get_logo_index(self.logo_dir)
+        self._index_generation = None
 
         logger.info(f"LogoManager initialized with directory: {self.logo_dir}")
 
@@ -51,13 +188,21 @@ class LogoManager:
         Returns:
             PIL Image or None if not found
         """
+        # Logos added or removed since the last call invalidate the cache
+        generation = self.index.refresh()
+        with self._generation_lock:
+            if generation != self._index_generation:
+                self._logo_cache.clear()
+                self._index_generation = generation
+
         # Check cache first
         cache_key = f"{merchant_name}_{size[0]}x{size[1]}"
-        if cache_key in self._logo_cache:
-            return self._logo_cache[cache_key]
+        cached = self._logo_cache.get(cache_key, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached
 
         # Try to find logo file
-        logo_path = self._find_logo_file(merchant_name)
+        logo_path = self.index.find(self._generate_search_names(merchant_name))
 
         if logo_path:
             try:
@@ -66,7 +211,7 @@ class LogoManager:
                 logo = self._prepare_logo(logo, size)
 
                 # Cache the result
-                self._logo_cache[cache_key] = logo
+                self._logo_cache.set(cache_key, logo)
                 logger.debug(f"Loaded logo for {merchant_name} from {logo_path}")
                 return logo
 
@@ -74,7 +219,7 @@ class LogoManager:
                 logger.warning(f"Failed to load logo for {merchant_name}: {e}")
 
         # Logo not found - cache None to avoid repeated lookups
-        self._logo_cache[cache_key] = None
+        self._logo_cache.set(cache_key, None)
         logger.debug(f"No logo found for {merchant_name}")
         return None
 
@@ -88,17 +233,8 @@ class LogoManager:
         Returns:
             Path to logo file or None
         """
-        # Generate possible filename variations
-        search_names = self._generate_search_names(merchant_name)
-
-        # Search for files with any supported extension
-        for search_name in search_names:
-            for ext in self.supported_formats:
-                logo_path = self.logo_dir / f"{search_name}{ext}"
-                if logo_path.exists():
-                    return logo_path
-
-        return None
+        self.index.refresh()
+        return self.index.find(self._generate_search_names(merchant_name))
 
     def _generate_search_names(self, merchant_name: str) -> list[str]:
         """
@@ -169,39 +305,13 @@ class LogoManager:
         variations.append(no_apostrophe.lower().replace(' ', '_'))
         variations.append(no_apostrophe.lower().replace(' ', '-'))
 
-        # Common abbreviations/variations
-        name_mapping = {
-            'mcdonalds': ['mcdonalds', 'mcd', 'mcdonald'],
-            'taco bell': ['tacobell', 'taco_bell'],
-            'kwik trip': ['kwiktrip', 'kwik_trip'],
-            'auto zone': ['autozone', 'auto_zone'],
-            'krispy kreme': ['krispykreme', 'krispy_kreme', 'kk'],
-            'jewel osco': ['jewelosco', 'jewel_osco', 'jewel'],
-            'binny\'s': ['binnys', 'binny', 'binnys_beverage'],
-            'ulta': ['ulta', 'ulta_beauty'],
-            'grubhub': ['grubhub', 'grub_hub'],
-            'wayfair': ['wayfair'],
-            # Add O'Reilly specific mappings
-            'oreilly': ['oreilly_auto_parts', 'oreillyautoparts', 'oreilly_auto'],
-            'o\'reilly': ['oreilly_auto_parts', 'oreillyautoparts', 'oreilly_auto'],
-            'oreillyauto': ['oreilly_auto_parts', 'oreillyautoparts'],
-            'oreillyautoparts': ['oreilly_auto_parts'],
-            # Add Dave & Buster's specific mappings
-            'dave & buster': ['dave_&_busters', 'dave_and_busters', 'daveandbusters', 'dave_busters'],
-            'dave&buster': ['dave_&_busters', 'dave_and_busters', 'daveandbusters'],
-            'davebusters': ['dave_&_busters', 'dave_and_busters', 'daveandbusters'],
-            # Add EōS Fitness specific mappings
-            'eōs fitness': ['eos_fitness', 'eos', 'eosfitness'],
-            'eos fitness': ['eos_fitness', 'eos', 'eosfitness'],
-        }
-
         merchant_lower = merchant_name.lower()
         # Also check the version without special characters
         merchant_clean = re.sub(r"[^a-zA-Z0-9\s]", '', merchant_lower)
         # Also check the Unicode-normalized version
         merchant_normalized = ascii_only.lower()
 
-        for key, aliases in name_mapping.items():
+        for key, aliases in MERCHANT_LOGO_ALIASES.items():
             if key in merchant_lower or key in merchant_clean or key in merchant_normalized:
                 variations.extend(aliases)
 
@@ -337,18 +447,10 @@ class LogoManager:
 
         # Check which files exist
         print(f"\nChecking for files in: {self.logo_dir}")
-        found = False
-        for search_name in search_names:
-            for ext in self.supported_formats:
-                logo_path = self.logo_dir / f"{search_name}{ext}"
-                if logo_path.exists():
-                    print(f"  ✓ FOUND: {logo_path.name}")
-                    found = True
-                    break
-            if found:
-                break
-
-        if not found:
+        logo_path = self._find_logo_file(merchant_name)
+        if logo_path:
+            print(f"  ✓ FOUND: {logo_path.name}")
+        else:
             print("  ✗ No matching files found")
 
             # Show similar files
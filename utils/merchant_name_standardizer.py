@@ -7,10 +7,12 @@ Maintains the same interface as the original but uses centralized caching
 import json
 import asyncio
 import logging
-from typing import Dict, List, Optional, TYPE_CHECKING
+import threading
+import time
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 from pathlib import Path
 import pandas as pd
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, RateLimitError
 import os
 from dotenv import load_dotenv
 
@@ -23,6 +25,55 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Concurrent OpenAI batches per standardize_merchants call
+DEFAULT_MAX_CONCURRENT_BATCHES = int(os.getenv('OPENAI_MAX_CONCURRENT_BATCHES', '4'))
+
+# Process-wide OpenAI budget shared by all standardizers and threads
+OPENAI_REQUESTS_PER_MINUTE = int(os.getenv('OPENAI_REQUESTS_PER_MINUTE', '500'))
+OPENAI_TOKENS_PER_MINUTE = int(os.getenv('OPENAI_TOKENS_PER_MINUTE', '150000'))
+
+STANDARDIZE_MAX_TOKENS = 1500
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from any event loop.
+    Callers reserve tokens up front and sleep off any deficit, so concurrent
+    batches across threads share one per-minute budget.
+    """
+
+    def __init__(self, per_minute: int, capacity: Optional[int] = None):
+        """
+        Args:
+            per_minute: Refill rate (tokens per minute)
+            capacity: Maximum burst size (defaults to one minute of tokens)
+        """
+        self.rate = max(per_minute, 1) / 60.0
+        self.capacity = float(capacity or max(per_minute, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1) -> float:
+        """Take tokens now and return how long to wait before using them (seconds)"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self, amount: float = 1):
+        """Wait until the requested tokens are available"""
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_request_bucket = TokenBucket(OPENAI_REQUESTS_PER_MINUTE)
+_token_bucket = TokenBucket(OPENAI_TOKENS_PER_MINUTE)
+
 
 class MerchantNameStandardizer:
     """
@@ -30,20 +81,31 @@ class MerchantNameStandardizer:
     Maintains backward compatibility while using centralized cache
     """
 
-    def __init__(self, cache_enabled: bool = True, cache_manager: Optional['CacheManager'] = None):
+    def __init__(self, cache_enabled: bool = True, cache_manager: Optional['CacheManager'] = None,
+                 client: Optional[Any] = None,
+                 max_concurrent_batches: int = DEFAULT_MAX_CONCURRENT_BATCHES):
         """
         Initialize standardizer with OpenAI client and caching
 
         Args:
             cache_enabled: Whether to use caching
             cache_manager: Optional CacheManager instance. If not provided, falls back to file cache
+            client: Optional client exposing chat.completions.create (e.g., a fake for offline tests)
+            max_concurrent_batches: Maximum OpenAI batches in flight at once
         """
         api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
+        if not api_key and client is None:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-        self.client = AsyncOpenAI(api_key=api_key)
+        # One AsyncOpenAI client per thread: callers run standardization on their own
+        # event loops (one per category), possibly from several analysis threads at once
+        self._api_key = api_key
+        self._client_local = threading.local()
+        self._client_override = client
         self.batch_size = 15  # Optimal batch size for API efficiency
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self.request_bucket = _request_bucket
+        self.token_bucket = _token_bucket
         self.cache_enabled = cache_enabled
 
         # Use provided CacheManager or fall back to file-based cache
@@ -56,6 +118,7 @@ class MerchantNameStandardizer:
         self._cache_misses = 0
 
         # Initialize file cache as fallback
+        self._file_cache_lock = threading.Lock()
         if not self.use_postgres_cache and cache_enabled:
             self.cache_file = Path(__file__).parent.parent / 'cache' / 'merchant_names.json'
             self.cache_file.parent.mkdir(exist_ok=True)
@@ -65,6 +128,23 @@ class MerchantNameStandardizer:
 
         logger.info(f"Initialized MerchantNameStandardizer (PostgreSQL cache: {self.use_postgres_cache})")
 
+    @property
+    def client(self) -> AsyncOpenAI:
+        """OpenAI client for the current thread (or the client assigned explicitly)"""
+        if self._client_override is not None:
+            return self._client_override
+
+        client = getattr(self._client_local, 'client', None)
+        if client is None:
+            client = AsyncOpenAI(api_key=self._api_key)
+            self._client_local.client = client
+        return client
+
+    @client.setter
+    def client(self, value):
+        """Use a single explicit client for all threads"""
+        self._client_override = value
+
     def _load_file_cache(self) -> Dict[str, str]:
         """Load existing cache from file (fallback method)"""
         try:
@@ -83,9 +163,11 @@ class MerchantNameStandardizer:
             return
 
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.file_cache, f, indent=2)
-            logger.debug(f"Saved file cache with {len(self.file_cache)} entries")
+            with self._file_cache_lock:
+                snapshot = dict(self.file_cache)
+                with open(self.cache_file, 'w') as f:
+                    json.dump(snapshot, f, indent=2)
+            logger.debug(f"Saved file cache with {len(snapshot)} entries")
         except Exception as e:
             logger.warning(f"Failed to save file cache: {e}")
 
@@ -127,7 +209,25 @@ class MerchantNameStandardizer:
             )
         else:
             # Fall back to file cache
-            self.file_cache[original.upper()] = standardized
+            with self._file_cache_lock:
+                self.file_cache[original.upper()] = standardized
+
+    def cache_name_mappings(self, mappings: Dict[str, str]):
+        """Cache a batch of name mappings (one PostgreSQL statement or one file write)"""
+        if not self.cache_enabled or not mappings:
+            return
+
+        if self.use_postgres_cache:
+            self.cache_manager.set_merchant_names_batch(
+                mappings,
+                confidence_score=0.95,
+                source='openai'
+            )
+        else:
+            with self._file_cache_lock:
+                for original, standardized in mappings.items():
+                    self.file_cache[original.upper()] = standardized
+            self._save_file_cache()
 
     async def standardize_merchants(self, merchant_names: List[str]) -> Dict[str, str]:
         """
@@ -178,41 +278,33 @@ class MerchantNameStandardizer:
             new_results = await self._process_uncached_names(uncached_names)
             results.update(new_results)
 
-            # Update cache
-            if self.use_postgres_cache and self.cache_enabled:
-                # Batch insert for PostgreSQL (more efficient)
-                for original, standardized in new_results.items():
-                    self.cache_manager.set_merchant_name(
-                        original,
-                        standardized,
-                        confidence_score=0.95,
-                        source='openai'
-                    )
-            else:
-                # Original caching logic
-                for original, standardized in new_results.items():
-                    self.cache_name_mapping(original, standardized)
-                self._save_file_cache()
+            # Update cache (single bulk upsert or single file write)
+            self.cache_name_mappings(new_results)
         else:
             logger.info(f"All {len(merchant_names)} names found in cache")
 
         return results
 
     async def _process_uncached_names(self, names: List[str]) -> Dict[str, str]:
-        """Process names that aren't in cache"""
-        all_results = {}
+        """Process names that aren't in cache (batches run concurrently)"""
+        batches = [names[i:i + self.batch_size] for i in range(0, len(names), self.batch_size)]
 
-        # Process in batches
-        for i in range(0, len(names), self.batch_size):
-            batch = names[i:i + self.batch_size]
-            logger.debug(f"Processing batch {i // self.batch_size + 1}: {len(batch)} names")
+        # Semaphore is created here so it belongs to the caller's event loop
+        semaphore = asyncio.Semaphore(self.max_concurrent_batches)
 
-            batch_results = await self._standardize_batch_with_retry(batch)
-            all_results.update(batch_results)
+        async def run_batch(batch_number: int, batch: List[str]) -> Dict[str, str]:
+            async with semaphore:
+                logger.debug(f"Processing batch {batch_number}: {len(batch)} names")
+                return await self._standardize_batch_with_retry(batch)
 
-            # Small delay to be respectful to API
-            if i + self.batch_size < len(names):
-                await asyncio.sleep(0.1)
+        batch_results = await asyncio.gather(
+            *(run_batch(number, batch) for number, batch in enumerate(batches, start=1))
+        )
+
+        # Merge in batch order so results match sequential processing
+        all_results = {}
+        for results in batch_results:
+            all_results.update(results)
 
         return all_results
 
@@ -231,16 +323,31 @@ class MerchantNameStandardizer:
                     logger.error("All attempts failed, using fallback formatting")
                     return {name: self._fallback_format(name) for name in names}
 
-                # Exponential backoff
-                await asyncio.sleep(2 ** attempt)
+                # Honor Retry-After on rate limits, otherwise exponential backoff
+                await asyncio.sleep(self._retry_delay(e, attempt))
 
         return {}
 
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """Seconds to wait before retrying a failed batch"""
+        if isinstance(error, RateLimitError):
+            retry_after = error.response.headers.get('retry-after') if error.response is not None else None
+            try:
+                return max(float(retry_after), 2 ** attempt)
+            except (TypeError, ValueError):
+                pass
+        return 2 ** attempt
+
     async def _standardize_batch(self, names: List[str]) -> Dict[str, str]:
         """Standardize a single batch using OpenAI"""
-        self._api_calls += 1
         prompt = self._create_prompt(names)
 
+        # Stay inside the shared requests/tokens per minute budget
+        await self.request_bucket.acquire()
+        await self.token_bucket.acquire(len(prompt) // 4 + STANDARDIZE_MAX_TOKENS)
+        self._api_calls += 1
+
         response = await self.client.chat.completions.create(
             model="gpt-4",
             messages=[
@@ -254,7 +361,7 @@ class MerchantNameStandardizer:
                 }
             ],
             temperature=0,
-            max_tokens=1500
+            max_tokens=STANDARDIZE_MAX_TOKENS
         )
 
         response_text = response.choices[0].message.content.strip()
@@ -0,0 +1,74 @@
+# utils/progress.py
+"""
+Per-build progress reporting
+Each build owns a ProgressReporter; the active reporter is held in a contextvar,
+so slide generators and analyzers can call report_progress() without a reference
+to the builder, and concurrent builds in one process never share a channel.
+Worker threads see the reporter when tasks are submitted with
+contextvars.copy_context().run (see PowerPointBuilder._create_category_slides).
+"""
+
+import contextvars
+import logging
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """Forwards progress for one build to its callback"""
+
+    def __init__(self, callback: Optional[Callable[[int, str], None]] = None, job_id: Optional[str] = None):
+        """
+        Args:
+            callback: Optional callable(progress, message), e.g. a job store update
+            job_id: Optional job ID (included in log lines)
+        """
+        self.callback = callback
+        self.job_id = job_id
+
+    def update(self, progress: int, message: str):
+        """Send a progress update to the callback and log it"""
+        if self.callback:
+            try:
+                self.callback(progress, message)
+            except Exception as e:
+                logger.debug(f"Error calling progress callback: {e}")
+
+        prefix = f"[{self.job_id}] " if self.job_id else ""
+        logger.info(f"{prefix}Progress: {progress}% - {message}")
+
+
+_current_reporter: contextvars.ContextVar[Optional[ProgressReporter]] = contextvars.ContextVar(
+    'progress_reporter', default=None
+)
+
+
+def use_reporter(reporter: ProgressReporter) -> contextvars.Token:
+    """Make reporter the active one for this context; pass the token to reset_reporter"""
+    return _current_reporter.set(reporter)
+
+
+def reset_reporter(token: contextvars.Token):
+    """Restore the reporter that was active before use_reporter"""
+    _current_reporter.reset(token)
+
+
+@contextmanager
+def progress_context(reporter: ProgressReporter):
+    """Run a block with reporter as the active progress channel"""
+    token = use_reporter(reporter)
+    try:
+        yield reporter
+    finally:
+        reset_reporter(token)
+
+
+def report_progress(progress: int, message: str):
+    """Report progress to the active build (logs only when there is none)"""
+    reporter = _current_reporter.get()
+    if reporter is not None:
+        reporter.update(progress, message)
+    else:
+        logger.info(f"Progress: {progress}% - {message}")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Offline test: compiled team assets are resolved through the manifest
+Compiles a throwaway project tree with one fan photo and one team logo
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+# Add project root and assets directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent / 'assets'))
+
+from compile_assets import compile_assets
+from utils.asset_manifest import AssetManifest, team_asset_key
+
+
+def _project(root: Path):
+    (root / 'assets' / 'logos' / 'fans').mkdir(parents=True)
+    (root / 'assets' / 'logos' / 'teams').mkdir(parents=True)
+    (root / 'config').mkdir()
+    Image.new('RGB', (1600, 1200), (0, 43, 92)).save(root / 'assets' / 'logos' / 'fans' / 'UtahJazz_Fanpic.png')
+    Image.new('RGBA', (1000, 1000), (249, 161, 27, 255)).save(root / 'assets' / 'logos' / 'teams' / 'utah_jazz.png')
+    (root / 'config' / 'team_config.yaml').write_text('teams:\n  utah_jazz:\n    team_name: "Utah Jazz"\n')
+
+
+def test_compiled_assets_resolved_by_team_name():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _project(root)
+        manifest = compile_assets(root)
+
+        entry = manifest['teams']['utahjazz']
+        assert entry['team_name'] == 'Utah Jazz'
+
+        assets = AssetManifest(root / 'assets' / 'compiled' / 'manifest.json')
+        fan_image = assets.fan_image('Utah Jazz')
+        image = Image.open(fan_image)
+        assert image.format == 'JPEG' and image.size == (1100, 1100)  # square crop, 5" at 220 dpi
+        assert image.getpixel((0, 0)) == (255, 255, 255)  # outside the circle is white
+
+        assert assets.team_logo('utah_jazz') == assets.team_logo('UTAH JAZZ')
+        assert Image.open(assets.team_logo('Utah Jazz')).size == (484, 484)  # 2.2" at 220 dpi
+        assert assets.fan_image('Oakland Roots') is None
+    print("✅ Compiled fan image and logo found by team name")
+
+
+def test_unchanged_sources_skipped():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _project(root)
+        compile_assets(root)
+        fan_image = root / 'assets' / 'compiled' / 'fans' / 'utahjazz.jpg'
+        compiled_at = fan_image.stat().st_mtime_ns
+
+        compile_assets(root)
+        assert fan_image.stat().st_mtime_ns == compiled_at
+    print("✅ Recompiling skips unchanged sources")
+
+
+def test_missing_manifest_falls_back():
+    assets = AssetManifest(Path(tempfile.gettempdir()) / 'no_such_dir' / 'manifest.json')
+    assert assets.fan_image('Utah Jazz') is None
+    assert team_asset_key('Utah Jazz') == team_asset_key('UtahJazz') == 'utahjazz'
+    print("✅ Missing manifest means source assets are used")
+
+
+if __name__ == "__main__":
+    test_compiled_assets_resolved_by_team_name()
+    test_unchanged_sources_skipped()
+    test_missing_manifest_falls_back()
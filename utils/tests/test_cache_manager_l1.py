@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Offline test for the CacheManager L1 layer and buffered hit-count/statistics writes
+Uses a fake PostgreSQL pool that records every statement
+"""
+
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import utils.cache_manager as cache_module
+from utils.cache_manager import CacheManager
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._result = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, params=None):
+        sql = ' '.join(sql.split())
+        self.db.statements.append((sql, params))
+        self._result = []
+        if sql.startswith('SELECT standardized_name'):
+            row = self.db.merchants.get(params[0])
+            self._result = [row] if row else []
+        elif sql.startswith('SELECT cache_key, standardized_name'):
+            self._result = [(k, *self.db.merchants[k]) for k in params[0] if k in self.db.merchants]
+        elif sql.startswith('INSERT INTO cache_statistics') and len(params) == 4:
+            cache_type, _, hits, misses = params
+            persisted = self.db.stats.get(cache_type, (0, 0))
+            self.db.stats[cache_type] = (persisted[0] + hits, persisted[1] + misses)
+        elif sql.startswith('SELECT result_data, row_count'):
+            row = self.db.snowflake_results.get(params[0])
+            self._result = [row] if row else []
+        elif sql.startswith('SELECT cache_type, hits, misses'):
+            self._result = [(t, h, m) for t, (h, m) in self.db.stats.items()]
+
+    def fetchone(self):
+        return self._result[0] if self._result else None
+
+    def fetchall(self):
+        return list(self._result)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self.db)
+
+    def commit(self):
+        self.db.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+        self.stats = {}
+        self.merchants = {"MCDONALD'S #123": ("McDonald's", 0.95), 'STARBUCKS': ('Starbucks', 0.95)}
+        self.snowflake_results = {}  # cache_key -> (result_data, row_count, seconds until expires_at)
+
+    def getconn(self):
+        return FakeConnection(self)
+
+    def putconn(self, conn):
+        pass
+
+
+def _fake_execute_values(cur, sql, argslist, template=None, page_size=100):
+    cur.execute(sql, list(argslist))
+
+
+# Batched writes go through the fake cursor; patched for this module's tests only
+_execute_values_patch = mock.patch.object(cache_module, 'execute_values', _fake_execute_values)
+_managers = []
+
+
+def setup_module(module):
+    _execute_values_patch.start()
+
+
+def teardown_module(module):
+    # Flush leftover counts while writes still go to the fakes (close is also registered atexit)
+    for manager in _managers:
+        manager.close()
+    _execute_values_patch.stop()
+
+
+def _make_manager():
+    pool = FakePool()
+    manager = CacheManager(pool, flush_interval=3600)
+    _managers.append(manager)
+    pool.statements.clear()
+    pool.commits = 0
+    return manager, pool
+
+
+def test_l1_serves_repeat_lookups():
+    manager, pool = _make_manager()
+
+    for _ in range(50):
+        assert manager.get_merchant_name('STARBUCKS') == ('Starbucks', 0.95, True)
+
+    selects = [s for s, _ in pool.statements if s.startswith('SELECT')]
+    assert len(selects) == 1
+    assert not any(s.startswith('UPDATE') for s, _ in pool.statements)
+    print("✅ Repeat lookups served from L1 without writes")
+
+
+def test_batch_uses_l1_for_known_names():
+    manager, pool = _make_manager()
+    manager.get_merchant_name('STARBUCKS')
+    pool.statements.clear()
+
+    results = manager.get_merchant_names_batch(['STARBUCKS', "MCDONALD'S #123", 'UNKNOWN'])
+    assert results['STARBUCKS'] == ('Starbucks', 0.95, True)
+    assert results["MCDONALD'S #123"] == ("McDonald's", 0.95, True)
+    assert results['UNKNOWN'] == ('UNKNOWN', 0.0, False)
+
+    (sql, params), = pool.statements
+    assert params == (["MCDONALD'S #123", 'UNKNOWN'],)
+    print("✅ Batch lookup only queries names missing from L1")
+
+
+def test_flush_batches_hit_counts_and_stats():
+    manager, pool = _make_manager()
+    for _ in range(5):
+        manager.get_merchant_name('STARBUCKS')
+    manager.get_merchant_name('UNKNOWN')
+
+    manager.flush()
+
+    hit_updates = [(s, p) for s, p in pool.statements if s.startswith('UPDATE cache_merchant_names')]
+    assert len(hit_updates) == 1
+    assert hit_updates[0][1] == [('STARBUCKS', 5)]
+
+    stat_upserts = [p for s, p in pool.statements if s.startswith('INSERT INTO cache_statistics')]
+    assert len(stat_upserts) == 1
+    assert stat_upserts[0][2:] == (5, 1)
+    assert pool.commits == 2
+
+    # Nothing pending after a flush
+    pool.statements.clear()
+    manager.flush()
+    assert pool.statements == []
+    manager.close()
+    print("✅ Hit counts and statistics flushed in batches")
+
+
+def test_stats_include_unflushed_counts():
+    manager, pool = _make_manager()
+    manager.get_merchant_name('STARBUCKS')
+    manager.flush()
+    manager.get_merchant_name('STARBUCKS')
+    manager.get_merchant_name('UNKNOWN')
+
+    stats = manager.get_cache_stats()['merchant_names']
+    assert (stats['hits'], stats['misses']) == (2, 1)
+    assert (stats['unflushed_hits'], stats['unflushed_misses']) == (1, 1)
+
+    # Draining at shutdown persists the rest without double counting
+    manager.close()
+    assert pool.stats['merchant_names'] == (2, 1)
+    stats = manager.get_cache_stats()['merchant_names']
+    assert (stats['hits'], stats['misses'], stats['unflushed_hits']) == (2, 1, 0)
+    print("✅ Stats combine persisted and unflushed counts")
+
+
+def test_batch_upsert_is_one_statement():
+    manager, pool = _make_manager()
+    manager.set_merchant_names_batch({'SHELL OIL 123': 'Shell', 'CHEVRON 0456': 'Chevron'}, source='openai')
+
+    (sql, rows), = pool.statements
+    assert sql.startswith('INSERT INTO cache_merchant_names')
+    assert rows == [('SHELL OIL 123', 'Shell', 0.95, 'openai'), ('CHEVRON 0456', 'Chevron', 0.95, 'openai')]
+    assert pool.commits == 1
+
+    # Written through to L1
+    assert manager.get_merchant_name('CHEVRON 0456') == ('Chevron', 0.95, True)
+    assert len(pool.statements) == 1
+    print("✅ Batch of names written in one statement")
+
+
+def test_l1_never_outlives_snowflake_rows():
+    manager, pool = _make_manager()
+    l1 = manager._l1['snowflake_results']
+    key = manager._generate_snowflake_cache_key('SELECT 1', team_key='test', view_name='V_TEST')
+
+    # Row read from PostgreSQL 2 seconds before it expires
+    pool.snowflake_results[key] = ({'data': [1]}, 1, 2.0)
+    assert manager.get_snowflake_result('SELECT 1', 'test', 'V_TEST') == {'data': [1]}
+    assert l1._entries[key][1] - time.monotonic() <= 2.0
+
+    # Result written with a TTL shorter than the L1 default
+    manager.set_snowflake_result('SELECT 2', 'test', 'V_TEST', {'data': [2]}, ttl_hours=0.01, row_count=1)
+    key = manager._generate_snowflake_cache_key('SELECT 2', team_key='test', view_name='V_TEST')
+    assert l1._entries[key][1] - time.monotonic() <= 36
+    print("✅ L1 Snowflake entries expire with their PostgreSQL rows")
+
+
+if __name__ == "__main__":
+    setup_module(None)
+    test_l1_serves_repeat_lookups()
+    test_batch_uses_l1_for_known_names()
+    test_flush_batches_hit_counts_and_stats()
+    test_stats_include_unflushed_counts()
+    test_batch_upsert_is_one_statement()
+    test_l1_never_outlives_snowflake_rows()
+    teardown_module(None)
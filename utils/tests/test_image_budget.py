@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Offline test: slide pictures are resampled for their placed size and counted per deck
+"""
+
+import sys
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from utils.image_budget import ImageBudget, add_picture, budget_context, fit_image
+
+
+def _png(size, mode='RGB', color=(0, 43, 92)) -> BytesIO:
+    buffer = BytesIO()
+    Image.new(mode, size, color).save(buffer, format='PNG')
+    buffer.seek(0)
+    return buffer
+
+
+def test_downsampled_to_placed_size():
+    # A 12" wheel rendered at 300 dpi, placed at 5.5"
+    data = _png((3600, 3600)).getvalue()
+    encoded, pixels = fit_image(data, 5.5, dpi=220)
+    assert pixels == (1210, 1210)
+    assert Image.open(BytesIO(encoded)).size == (1210, 1210)
+
+    # Small logos are never upsampled
+    small = _png((60, 60)).getvalue()
+    assert fit_image(small, 0.5, 0.5, dpi=220)[1] == (60, 60)
+    print("✅ Images resampled to the target DPI at their placed size")
+
+
+def test_photo_flattened_to_jpeg():
+    photo = Image.merge('RGB', [Image.effect_noise((1024, 1024), 64)] * 3).convert('RGBA')
+    photo.putpixel((0, 0), (200, 30, 30, 0))
+    buffer = BytesIO()
+    photo.save(buffer, format='PNG')
+    data = buffer.getvalue()
+
+    encoded, _ = fit_image(data, 5.0, 5.0, photo=True)
+    image = Image.open(BytesIO(encoded))
+    assert image.format == 'JPEG'
+    assert min(image.getpixel((0, 0))) > 200  # transparent corner becomes (near) slide background
+    print("✅ Photos embedded as JPEG on the slide background")
+
+
+def test_deck_budget_counts_unique_images():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    budget = ImageBudget(budget_bytes=1)
+    with budget_context(budget):
+        for left in (0, 2, 4):
+            add_picture(slide.shapes, _png((400, 400)), Inches(left), Inches(1), width=Inches(1), name='logo')
+
+    summary = budget.summary()
+    assert summary['placements'] == 3 and summary['images'] == 1
+    assert summary['largest'][0]['pixels'] == (220, 220)
+    assert budget.over_budget
+
+    try:
+        add_picture(slide.shapes, _png((10, 10)), Inches(0), Inches(0))
+        assert False, "a placed size is required"
+    except ValueError:
+        pass
+    print("✅ Deck budget counts each embedded image once")
+
+
+if __name__ == "__main__":
+    test_downsampled_to_placed_size()
+    test_photo_flattened_to_jpeg()
+    test_deck_budget_counts_unique_images()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Offline test: logo lookups go through a shared filename index instead of stat probes
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unicodedata
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import utils.logo_manager as logo_module
+from utils.logo_manager import LogoManager, get_logo_index, get_logo_manager
+
+
+def _logo(directory: Path, filename: str):
+    Image.new('RGBA', (200, 100), (200, 16, 46, 255)).save(directory / filename)
+
+
+def test_lookups_hit_the_index():
+    with tempfile.TemporaryDirectory() as tmp:
+        logo_dir = Path(tmp)
+        _logo(logo_dir, 'dave_&_busters.png')
+        _logo(logo_dir, 'Chick-fil-A.PNG')
+        _logo(logo_dir, unicodedata.normalize('NFD', 'eōs_fitness') + '.png')  # as macOS stores it
+        _logo(logo_dir, 'oreilly_auto_parts.png')
+
+        manager = LogoManager(logo_dir)
+        with mock.patch.object(Path, 'exists', side_effect=AssertionError("no per-name probing")):
+            assert manager._find_logo_file("Dave & Buster's").name == 'dave_&_busters.png'
+            assert manager._find_logo_file('chick-fil-a').name == 'Chick-fil-A.PNG'  # casefolded
+            assert manager._find_logo_file('EōS Fitness') is not None  # unicode-normalized
+            assert manager._find_logo_file("O'Reilly") is not None  # alias
+            assert manager._find_logo_file('Unknown Brand') is None
+        assert manager.index.generation == 1  # built once
+    print("✅ Logo lookups are index hits (casefolded, normalized, aliased)")
+
+
+def test_index_follows_directory_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        logo_dir = Path(tmp)
+        _logo(logo_dir, 'nike.png')
+        manager = LogoManager(logo_dir)
+
+        assert manager.get_logo('Lululemon') is None
+        generation = manager.index.generation
+
+        _logo(logo_dir, 'lululemon.png')
+        stat = os.stat(logo_dir)
+        os.utime(logo_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))  # coarse-mtime filesystems
+
+        assert manager.get_logo('Lululemon') is not None  # cached miss dropped with the old index
+        assert manager.index.generation == generation + 1
+    print("✅ Directory mtime change rebuilds the index")
+
+
+def test_shared_across_callers():
+    with tempfile.TemporaryDirectory() as tmp:
+        assert get_logo_manager(Path(tmp)) is get_logo_manager(Path(tmp))
+        assert LogoManager(Path(tmp)).index is get_logo_index(Path(tmp))
+    print("✅ One LogoManager and index per directory")
+
+
+def test_logo_cache_is_bounded():
+    with tempfile.TemporaryDirectory() as tmp:
+        logo_dir = Path(tmp)
+        _logo(logo_dir, 'nike.png')
+        with mock.patch.object(logo_module, 'LOGO_CACHE_MAX_ENTRIES', 50):
+            manager = LogoManager(logo_dir)
+
+        threads = [threading.Thread(target=lambda i=i: [manager.get_logo(f'Unknown {i}-{j}') for j in range(100)])
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(manager._logo_cache) == 50  # user-supplied misses can't grow it without bound
+        assert manager.get_logo('Nike') is not None and manager.get_logo('Nike') is manager.get_logo('Nike')
+    print("✅ Logo cache is a bounded LRU shared safely across threads")
+
+
+if __name__ == "__main__":
+    test_lookups_hit_the_index()
+    test_index_follows_directory_changes()
+    test_shared_across_callers()
+    test_logo_cache_is_bounded()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Offline test for concurrent OpenAI batch dispatch in MerchantNameStandardizer
+Uses a fake client instead of the OpenAI API
+"""
+
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from utils.merchant_name_standardizer import MerchantNameStandardizer, TokenBucket
+
+
+class FakeCompletions:
+    """Title-cases names; fails every call for batches containing a poisoned name"""
+
+    def __init__(self, delay: float = 0.05, poisoned: str = None):
+        self.delay = delay
+        self.poisoned = poisoned
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, model, messages, **kwargs):
+        names = re.findall(r'^- (.*)$', messages[-1]['content'].split('Rules:')[0], re.M)
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.poisoned in names:
+                raise RuntimeError("simulated API failure")
+            content = json.dumps({name: f"Std {name.title()}" for name in names})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        finally:
+            self.in_flight -= 1
+
+
+def _make_standardizer(completions: FakeCompletions, max_concurrent_batches: int = 4):
+    standardizer = MerchantNameStandardizer(
+        cache_enabled=False,
+        client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+        max_concurrent_batches=max_concurrent_batches
+    )
+    standardizer._retry_delay = lambda error, attempt: 0
+    return standardizer
+
+
+def test_batches_run_concurrently():
+    completions = FakeCompletions(delay=0.1)
+    standardizer = _make_standardizer(completions, max_concurrent_batches=4)
+    names = [f"MERCHANT {i}" for i in range(150)]
+
+    start = time.time()
+    results = asyncio.run(standardizer.standardize_merchants(names))
+    elapsed = time.time() - start
+
+    assert completions.calls == 10
+    assert completions.max_in_flight == 4
+    assert results == {name: f"Std {name.title()}" for name in names}
+    assert list(results) == names
+    print(f"✅ 10 batches in {elapsed:.2f}s with 4 in flight")
+
+
+def test_failed_batch_falls_back():
+    completions = FakeCompletions(poisoned="MCDONALD'S")
+    standardizer = _make_standardizer(completions)
+    names = [f"MERCHANT {i}" for i in range(20)] + ["MCDONALD'S"]
+
+    results = asyncio.run(standardizer.standardize_merchants(names))
+
+    # First batch succeeds, second retried 3 times then formatted locally
+    assert completions.calls == 1 + 3
+    assert results["MERCHANT 0"] == "Std Merchant 0"
+    assert results["MERCHANT 19"] == "Merchant 19"
+    assert results["MCDONALD'S"] == "McDonald's"
+    print("✅ Failed batch degrades to _fallback_format")
+
+
+def test_token_bucket_reserves_budget():
+    bucket = TokenBucket(per_minute=60, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    delay = bucket.reserve()
+    assert 0.9 < delay <= 1.0
+    print("✅ Token bucket delays requests beyond its budget")
+
+
+if __name__ == "__main__":
+    test_batches_run_concurrently()
+    test_failed_batch_falls_back()
+    test_token_bucket_reserves_budget()
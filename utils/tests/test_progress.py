@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Offline test: per-build progress reporters stay isolated across concurrent builds
+"""
+
+import contextvars
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from utils.progress import ProgressReporter, progress_context, report_progress
+
+
+def _build(name: str, received: dict, barrier: threading.Barrier):
+    """A fake build: reports from its own thread and from analysis workers"""
+    reporter = ProgressReporter(lambda progress, message: received[name].append((progress, message)), job_id=name)
+    with progress_context(reporter):
+        barrier.wait()  # both builds active at once
+        report_progress(10, f"{name} started")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(contextvars.copy_context().run, report_progress, 50, f"{name} category {i}")
+                       for i in range(3)]
+            for future in futures:
+                future.result()
+        report_progress(90, f"{name} saved")
+
+
+def test_concurrent_builds_keep_their_progress():
+    received = {'job_a': [], 'job_b': []}
+    barrier = threading.Barrier(2)
+    threads = [threading.Thread(target=_build, args=(name, received, barrier)) for name in received]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name, updates in received.items():
+        assert len(updates) == 5
+        assert all(message.startswith(name) for _, message in updates)
+    print("✅ Concurrent builds never receive each other's progress")
+
+
+def test_no_reporter_outside_build():
+    with mock.patch.object(ProgressReporter, 'update') as update:
+        report_progress(5, "logged only")  # must not raise
+    update.assert_not_called()
+    print("✅ Progress outside a build is only logged")
+
+
+if __name__ == "__main__":
+    test_concurrent_builds_keep_their_progress()
+    test_no_reporter_outside_build()
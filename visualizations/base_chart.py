@@ -4,13 +4,63 @@ Base class for all chart/visualization components
 """
 
 import matplotlib.pyplot as plt
+from io import BytesIO
 from pathlib import Path
 from typing import Optional, Dict, Any
 import logging
 
+from utils.image_budget import TARGET_IMAGE_DPI
+
 logger = logging.getLogger(__name__)
 
 
+def placement_dpi(figure_width: float, placed_width: Optional[float], default: int = 300,
+                  target_dpi: int = TARGET_IMAGE_DPI) -> int:
+    """
+    Render DPI that gives target_dpi pixels per inch once the figure is placed on a slide
+
+    Args:
+        figure_width: Figure width in inches
+        placed_width: Width of the picture on the slide in inches (None = unknown)
+        default: DPI to use when the placement is unknown
+        target_dpi: Pixels per inch wanted at the placed size (default TARGET_IMAGE_DPI)
+
+    Returns:
+        DPI for savefig
+    """
+    if not placed_width:
+        return default
+    return max(1, round(target_dpi * placed_width / figure_width))
+
+
+def render_figure(fig: plt.Figure, output_path: Optional[Path] = None, **savefig_kwargs) -> BytesIO:
+    """
+    Render a figure to an in-memory PNG and close it
+
+    Args:
+        fig: Matplotlib figure to render
+        output_path: Optional file to also write the PNG to (debugging only)
+        **savefig_kwargs: Passed to fig.savefig (dpi, bbox_inches, ...)
+
+    Returns:
+        BytesIO positioned at the start of the PNG data
+    """
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format='png', **savefig_kwargs)
+    finally:
+        plt.close(fig)
+
+    if output_path is not None:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_bytes(buffer.getvalue())
+        logger.debug(f"Chart copy written to {output_path}")
+
+    buffer.seek(0)
+    return buffer
+
+
 class BaseChart:
     """Base class for all visualizations"""
 
@@ -9,12 +9,14 @@ import matplotlib.patches as patches
 from matplotlib.patches import Rectangle
 import numpy as np
 import pandas as pd
+from io import BytesIO
 from pathlib import Path
 from typing import Dict, Optional, List, Tuple
 import matplotlib.font_manager as fm
 import os
 
 from utils.font_manager import font_manager  # Added font manager import
+from .base_chart import render_figure, placement_dpi
 
 
 class CommunityIndexChart:
@@ -41,21 +43,20 @@ class CommunityIndexChart:
 
     def create(self, data: pd.DataFrame,
                output_path: Optional[Path] = None,
-               title: Optional[str] = None) -> Path:
+               title: Optional[str] = None,
+               placed_width: Optional[float] = None) -> BytesIO:
         """
         Create community index chart
 
         Args:
             data: DataFrame with columns 'Community', 'Audience_Pct', and 'Composite_Index'
-            output_path: Where to save the chart
+            output_path: Optional file to also write the PNG to (debugging only)
             title: Optional title for the chart
+            placed_width: Width of the chart on the slide in inches (sets the render DPI)
 
         Returns:
-            Path to saved chart
+            In-memory PNG of the chart
         """
-        if output_path is None:
-            output_path = Path('community_index_chart.png')
-
         # Sort data by Audience_Pct descending
         data = data.sort_values('Audience_Pct', ascending=True)  # Ascending for bottom-to-top display
 
@@ -163,14 +164,12 @@ class CommunityIndexChart:
                            prop={'family': self.font_family, 'weight': 'bold', 'size': 15})
 
         # Adjust layout
-        plt.tight_layout()
-
-        # Save
-        plt.savefig(output_path, dpi=300, bbox_inches='tight',
-                    facecolor='white', edgecolor='none')
-        plt.close()
+        fig.tight_layout()
 
-        return output_path
+        # Render
+        figure_width = fig.get_size_inches()[0]
+        return render_figure(fig, output_path, dpi=placement_dpi(figure_width, placed_width), bbox_inches='tight',
+                             facecolor='white', edgecolor='none')
 
 
 def create_community_chart_from_ranker(merchant_ranker,
@@ -203,9 +202,13 @@ def create_community_chart_from_ranker(merchant_ranker,
         'COMPOSITE_INDEX': 'Composite_Index'
     })
 
+    if output_path is None:
+        output_path = Path('community_index_chart.png')
+
     # Create chart
     chart = CommunityIndexChart(team_colors)
-    return chart.create(data, output_path)
+    chart.create(data, output_path)
+    return output_path
 
 
 # Standalone test function
@@ -238,7 +241,8 @@ def test_community_index_chart():
     }
 
     chart = CommunityIndexChart(team_colors)
-    output_path = chart.create(mock_data, 'test_community_index_chart.png')
+    output_path = Path('test_community_index_chart.png')
+    chart.create(mock_data, output_path)
 
     print(f"Created test chart: {output_path}")
     return output_path
@@ -285,7 +289,8 @@ def test_with_real_data(team_key: str = 'utah_jazz'):
 
         # Create chart
         chart = CommunityIndexChart(team_config.get('colors'))
-        output_path = chart.create(data, f'{team_key}_community_index_chart.png')
+        output_path = Path(f'{team_key}_community_index_chart.png')
+        chart.create(data, output_path)
 
         print(f"\nChart saved to: {output_path}")
         return output_path
@@ -4,18 +4,25 @@ Fixed demographic visualization with proper text scaling and correct aspect rati
 Matches PowerPoint placeholder dimensions exactly
 UPDATED: Uses team_config to display short team names in gender chart
 UPDATED: Now uses font_manager for consistent font handling
+UPDATED: render_demographic_charts renders each chart once, sized for its slide placement
 """
 
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import numpy as np
 import pandas as pd
+from io import BytesIO
 from typing import Dict, List, Tuple, Optional, Any
 from pathlib import Path
 import matplotlib.font_manager as fm
 import os
 
 from utils.font_manager import font_manager  # Added font manager import
+from utils.image_budget import TARGET_IMAGE_DPI
+from .base_chart import render_figure, placement_dpi
+
+# Pixels per inch of each chart at its placed size (defaults to the deck-wide image DPI)
+DEMOGRAPHIC_CHART_DPI = int(os.getenv('DEMOGRAPHIC_CHART_DPI', str(TARGET_IMAGE_DPI)))
 
 
 class DemographicCharts:
@@ -586,6 +593,85 @@ class DemographicCharts:
 
         return output_path
 
+    def _create_chart(self, demo_type: str, demo_data: Dict[str, Any]) -> Optional[plt.Figure]:
+        """Create the figure for one demographic (None if the chart type is not supported)"""
+        data_dict = demo_data['data']
+
+        if demo_data['chart_type'] == 'grouped_bar':
+            if isinstance(data_dict, dict) and all(isinstance(v, dict) for v in data_dict.values()):
+                df = pd.DataFrame(data_dict)
+
+                # Ensure categories are in the correct order
+                if 'categories' in demo_data:
+                    existing_categories = [cat for cat in demo_data['categories'] if cat in df.index]
+                    if existing_categories:
+                        df = df.reindex(existing_categories)
+
+            # Create appropriate chart with correct aspect ratio
+            if demo_type == 'generation':
+                return self.create_generation_chart(df)
+            elif demo_type == 'income':
+                return self.create_income_chart(df)
+            elif demo_type == 'occupation':
+                return self.create_occupation_chart(df)
+            elif demo_type == 'children':
+                return self.create_children_chart(df)
+            elif demo_type == 'ethnicity':
+                return self.create_ethnicity_chart(df)
+            return self.create_grouped_bar_chart(df, chart_type=demo_type)
+
+        elif demo_data['chart_type'] == 'pie' and demo_type == 'gender':
+            # Use horizontal bars for gender
+            return self.create_gender_chart(data_dict)
+
+        return None
+
+    def render_demographic_charts(self, demographic_data: Dict[str, Any],
+                                  target_sizes: Optional[Dict[str, Tuple[float, float]]] = None,
+                                  output_dir: Optional[Path] = None) -> Dict[str, BytesIO]:
+        """
+        Render every demographic chart once to an in-memory PNG
+
+        Each figure is rendered at a DPI that gives DEMOGRAPHIC_CHART_DPI pixels per inch
+        at its placed width on the slide, then closed before the next chart is created.
+
+        Args:
+            demographic_data: Processed demographic data
+            target_sizes: Placed (width, height) in inches keyed by chart name ('gender_chart', ...);
+                charts without an entry are rendered at their figure size
+            output_dir: Optional directory to also write each PNG to (debugging only)
+
+        Returns:
+            PNG buffers keyed by chart name
+        """
+        target_sizes = target_sizes or {}
+        rendered = {}
+
+        for demo_type, demo_data in demographic_data.get('demographics', {}).items():
+            chart_name = f'{demo_type}_chart'
+            try:
+                fig = self._create_chart(demo_type, demo_data)
+                if fig is None:
+                    continue
+
+                figure_width = fig.get_size_inches()[0]
+                placed_width = target_sizes.get(chart_name, (figure_width, None))[0]
+                dpi = placement_dpi(figure_width, placed_width, target_dpi=DEMOGRAPHIC_CHART_DPI)
+
+                rendered[chart_name] = render_figure(
+                    fig,
+                    Path(output_dir) / f'{chart_name}.png' if output_dir else None,
+                    dpi=dpi,
+                    bbox_inches='tight',
+                    facecolor='white',
+                    edgecolor='none',
+                    pad_inches=0.05 if demo_type == 'gender' else 0.1
+                )
+            except Exception as e:
+                print(f"Error rendering {demo_type} chart: {str(e)}")
+
+        return rendered
+
     def create_all_demographic_charts(self, demographic_data: Dict[str, Any],
                                       output_dir: Optional[Path] = None) -> Dict[str, plt.Figure]:
         """Create all demographic charts with correct PowerPoint aspect ratios"""
@@ -594,37 +680,8 @@ class DemographicCharts:
 
         for demo_type, demo_data in demographics.items():
             try:
-                data_dict = demo_data['data']
-
-                if demo_data['chart_type'] == 'grouped_bar':
-                    if isinstance(data_dict, dict) and all(isinstance(v, dict) for v in data_dict.values()):
-                        df = pd.DataFrame(data_dict)
-
-                        # Ensure categories are in the correct order
-                        if 'categories' in demo_data:
-                            existing_categories = [cat for cat in demo_data['categories'] if cat in df.index]
-                            if existing_categories:
-                                df = df.reindex(existing_categories)
-
-                    # Create appropriate chart with correct aspect ratio
-                    if demo_type == 'generation':
-                        fig = self.create_generation_chart(df)
-                    elif demo_type == 'income':
-                        fig = self.create_income_chart(df)
-                    elif demo_type == 'occupation':
-                        fig = self.create_occupation_chart(df)
-                    elif demo_type == 'children':
-                        fig = self.create_children_chart(df)
-                    elif demo_type == 'ethnicity':
-                        fig = self.create_ethnicity_chart(df)
-                    else:
-                        fig = self.create_grouped_bar_chart(df, chart_type=demo_type)
-
-                    charts[demo_type] = fig
-
-                elif demo_data['chart_type'] == 'pie' and demo_type == 'gender':
-                    # Use horizontal bars for gender
-                    fig = self.create_gender_chart(data_dict)
+                fig = self._create_chart(demo_type, demo_data)
+                if fig is not None:
                     charts[demo_type] = fig
 
             except Exception as e:
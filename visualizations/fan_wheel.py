@@ -10,13 +10,14 @@ from matplotlib.patches import Wedge, Circle, Polygon
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
+from io import BytesIO
 from pathlib import Path
 import logging
 from typing import Dict, Optional, List, Tuple
 import pandas as pd
 
-from .base_chart import BaseChart
-from utils.logo_manager import LogoManager
+from .base_chart import BaseChart, render_figure, placement_dpi
+from utils.logo_manager import get_logo_manager
 from utils.font_manager import font_manager  # Added font manager import
 
 logger = logging.getLogger(__name__)
@@ -54,8 +55,8 @@ class FanWheel(BaseChart):
         self.enable_logos = enable_logos
         self.logo_size = (120, 120)  # Size for logos in pixels
 
-        # Initialize logo manager if enabled
-        self.logo_manager = LogoManager(logo_dir) if enable_logos else None
+        # Shared logo manager (one filename index per process) if enabled
+        self.logo_manager = get_logo_manager(logo_dir) if enable_logos else None
 
         # Load arrow logo during initialization
         self.arrow_logo = self._load_arrow_logo()
@@ -95,21 +96,20 @@ class FanWheel(BaseChart):
 
     def create(self, wheel_data: pd.DataFrame,
                output_path: Optional[Path] = None,
-               team_logo: Optional[Image.Image] = None) -> Path:
+               team_logo: Optional[Image.Image] = None,
+               placed_width: Optional[float] = None) -> BytesIO:
         """
         Create fan wheel visualization with minimal whitespace
 
         Args:
             wheel_data: DataFrame with columns: COMMUNITY, MERCHANT, behavior, PERC_INDEX
-            output_path: Where to save the visualization
+            output_path: Optional file to also write the PNG to (debugging only)
             team_logo: Optional PIL Image of team logo
+            placed_width: Width of the wheel on the slide in inches (sets the render DPI)
 
         Returns:
-            Path to saved visualization
+            In-memory PNG of the visualization
         """
-        if output_path is None:
-            output_path = Path(f'{self.team_short.lower()}_fan_wheel.png')
-
         # Create figure with higher DPI if logos are enabled
         dpi = 150 if self.enable_logos else 100
         fig = plt.figure(figsize=(12, 12), facecolor='white', dpi=dpi)
@@ -124,6 +124,7 @@ class FanWheel(BaseChart):
 
         num_items = len(wheel_data)
         if num_items == 0:
+            plt.close(fig)
             raise ValueError("No data provided for fan wheel")
 
         angle_step = 360 / num_items
@@ -144,14 +145,14 @@ class FanWheel(BaseChart):
         self._add_segment_content(ax, wheel_data, angle_step)
 
         # Save with improved bbox settings to minimize whitespace
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight',
-                    facecolor='white', edgecolor='none',
-                    pad_inches=0.05)  # REDUCED padding from default
-        plt.close()
+        fig.tight_layout()
+        figure_width = fig.get_size_inches()[0]
+        buffer = render_figure(fig, output_path, dpi=placement_dpi(figure_width, placed_width), bbox_inches='tight',
+                               facecolor='white', edgecolor='none',
+                               pad_inches=0.05)  # REDUCED padding from default
 
-        logger.info(f"Fan wheel saved to {output_path}")
-        return output_path
+        logger.info(f"Fan wheel rendered ({buffer.getbuffer().nbytes / 1024:.0f} KB)")
+        return buffer
 
     def _draw_wedges(self, ax, num_items: int, angle_step: float):
         """Draw the wedge segments"""
@@ -624,5 +625,9 @@ def create_fan_wheel_from_data(merchant_ranker, team_config: Dict[str, any],
     # Create fan wheel with logo support
     fan_wheel = FanWheel(team_config, enable_logos=enable_logos)
 
+    if output_path is None:
+        output_path = Path(f'{fan_wheel.team_short.lower()}_fan_wheel.png')
+
     # No team logo for now
-    return fan_wheel.create(wheel_data, output_path, team_logo=None)
\ No newline at end of file
+    fan_wheel.create(wheel_data, output_path, team_logo=None)
+    return output_path
\ No newline at end of file
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Offline test: charts render to in-memory PNG buffers, safely from concurrent jobs
+"""
+
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+from PIL import Image
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from visualizations.community_index_chart import CommunityIndexChart
+
+MOCK_DATA = pd.DataFrame({
+    'Community': ['Live Entertainment Seekers', 'College Sports', 'Gambler', 'Theme Parkers', 'Movie Buffs'],
+    'Audience_Pct': [71, 36, 28, 27, 22],
+    'Composite_Index': [798, 364, 283, 270, 221]
+})
+
+
+def _render(primary: str):
+    chart = CommunityIndexChart({'primary': primary, 'secondary': '#FFC000'})
+    return primary, chart.create(MOCK_DATA)
+
+
+def test_concurrent_renders_stay_isolated():
+    colors = ['#002B5C', '#003594', '#0085CA', '#CE1141'] * 2
+
+    with tempfile.TemporaryDirectory() as cwd:
+        previous = os.getcwd()
+        os.chdir(cwd)
+        try:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(_render, colors))
+            assert os.listdir(cwd) == []  # nothing written to the working directory
+        finally:
+            os.chdir(previous)
+
+    images = {}
+    for primary, buffer in results:
+        assert buffer.tell() == 0
+        image = Image.open(buffer)
+        assert image.format == 'PNG'
+        images.setdefault(primary, set()).add(image.convert('RGB').tobytes())
+
+    # Same input renders the same image; different jobs never see each other's chart
+    assert all(len(renders) == 1 for renders in images.values())
+    assert len({next(iter(renders)) for renders in images.values()}) == 4
+    print("✅ Concurrent charts rendered in memory without collisions")
+
+
+def test_debug_copy_written_on_request():
+    with tempfile.TemporaryDirectory() as charts_dir:
+        output_path = Path(charts_dir) / 'job_1' / 'community_chart.png'
+        buffer = CommunityIndexChart().create(MOCK_DATA, output_path)
+
+        assert output_path.read_bytes() == buffer.getvalue()
+    print("✅ Debug copy matches the in-memory chart")
+
+
+if __name__ == "__main__":
+    test_concurrent_renders_stay_isolated()
+    test_debug_copy_written_on_request()
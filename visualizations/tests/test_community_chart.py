@@ -43,7 +43,8 @@ def test_chart_formatting():
     }
 
     chart = CommunityIndexChart(jazz_colors)
-    output_path = chart.create(mock_data, 'test_jazz_community_chart.png')
+    output_path = Path('test_jazz_community_chart.png')
+    chart.create(mock_data, output_path)
     print(f"✓ Created: {output_path}")
 
     # Test 2: Dallas Cowboys colors
@@ -54,7 +55,8 @@ def test_chart_formatting():
     }
 
     chart = CommunityIndexChart(cowboys_colors)
-    output_path = chart.create(mock_data, 'test_cowboys_community_chart.png')
+    output_path = Path('test_cowboys_community_chart.png')
+    chart.create(mock_data, output_path)
     print(f"✓ Created: {output_path}")
 
     # Test 3: Custom colors
@@ -65,15 +67,17 @@ def test_chart_formatting():
     }
 
     chart = CommunityIndexChart(custom_colors)
-    output_path = chart.create(mock_data, 'test_custom_community_chart.png')
+    output_path = Path('test_custom_community_chart.png')
+    chart.create(mock_data, output_path)
     print(f"✓ Created: {output_path}")
 
     # Test 4: With title
     print("\nGenerating chart with title...")
     chart = CommunityIndexChart(jazz_colors)
-    output_path = chart.create(
+    output_path = Path('test_titled_community_chart.png')
+    chart.create(
         mock_data,
-        'test_titled_community_chart.png',
+        output_path,
         title='Top Fan Communities by Index Score'
     )
     print(f"✓ Created: {output_path}")
@@ -85,7 +89,8 @@ def test_chart_formatting():
     scaled_data['Audience_Pct'] = scaled_data['Audience_Pct'] / 2  # Smaller percentages
 
     chart = CommunityIndexChart(jazz_colors)
-    output_path = chart.create(scaled_data, 'test_scaled_community_chart.png')
+    output_path = Path('test_scaled_community_chart.png')
+    chart.create(scaled_data, output_path)
     print(f"✓ Created: {output_path}")
 
     print("\n✅ All test charts generated successfully!")
@@ -126,7 +131,8 @@ def test_font_variations():
 
     # Generate one chart with current settings
     chart = CommunityIndexChart({'primary': '#4472C4', 'secondary': '#FFC000'})
-    output_path = chart.create(mock_data, 'test_font_check.png')
+    output_path = Path('test_font_check.png')
+    chart.create(mock_data, output_path)
     print(f"\n✓ Created font test chart: {output_path}")
 
 
@@ -152,7 +158,8 @@ if __name__ == "__main__":
         })
 
         chart = CommunityIndexChart({'primary': '#4472C4', 'secondary': '#FFC000'})
-        output_path = chart.create(mock_data, 'quick_test.png')
+        output_path = Path('quick_test.png')
+        chart.create(mock_data, output_path)
         print(f"Created quick test: {output_path}")
     else:
         test_chart_formatting()
\ No newline at end of file
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Offline test: demographic charts render once each, in memory, at their placed size
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from PIL import Image
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from visualizations import demographic_charts
+from visualizations.demographic_charts import DemographicCharts
+from slide_generators.demographics_slide import chart_sizes
+
+COMMUNITIES = ['Utah Jazz Fans', 'Local Gen Pop (Excl. Jazz)', 'NBA Fans']
+MOCK_DATA = {
+    'demographics': {
+        'gender': {
+            'chart_type': 'pie',
+            'data': {community: {'Male': 55.0, 'Female': 45.0} for community in COMMUNITIES}
+        },
+        'income': {
+            'chart_type': 'grouped_bar',
+            'categories': ['< $50K', '$50K - $100K', '> $100K'],
+            'data': {community: {'< $50K': 30.0, '$50K - $100K': 40.0, '> $100K': 30.0}
+                     for community in COMMUNITIES}
+        },
+        'children': {
+            'chart_type': 'grouped_bar',
+            'data': {community: {'No Children': 60.0, 'Has Children': 40.0} for community in COMMUNITIES}
+        }
+    }
+}
+
+
+def test_each_chart_rendered_once_and_closed():
+    charter = DemographicCharts(team_config={'team_name_short': 'Jazz'})
+    saves = []
+    original_render = demographic_charts.render_figure
+
+    def counting_render(fig, output_path=None, **kwargs):
+        saves.append(kwargs['dpi'])
+        return original_render(fig, output_path, **kwargs)
+
+    with tempfile.TemporaryDirectory() as cwd:
+        previous = os.getcwd()
+        os.chdir(cwd)
+        demographic_charts.render_figure = counting_render
+        try:
+            charts = charter.render_demographic_charts(MOCK_DATA, target_sizes=chart_sizes())
+            assert os.listdir(cwd) == []  # nothing written to disk
+        finally:
+            demographic_charts.render_figure = original_render
+            os.chdir(previous)
+
+    assert sorted(charts) == ['children_chart', 'gender_chart', 'income_chart']
+    assert len(saves) == 3  # one render per chart
+    assert plt.get_fignums() == []  # every figure released
+
+    for buffer in charts.values():
+        assert Image.open(buffer).format == 'PNG'
+    print("✅ Each demographic chart rendered once and its figure closed")
+
+
+def test_dpi_follows_placed_width():
+    charter = DemographicCharts(team_config={'team_name_short': 'Jazz'})
+    gender_only = {'demographics': {'gender': MOCK_DATA['demographics']['gender']}}
+
+    placed = charter.render_demographic_charts(gender_only, target_sizes={'gender_chart': (1.5, 2.5)})
+    doubled = charter.render_demographic_charts(gender_only, target_sizes={'gender_chart': (3.0, 5.0)})
+
+    placed_width = Image.open(placed['gender_chart']).width
+    doubled_width = Image.open(doubled['gender_chart']).width
+    assert abs(doubled_width - 2 * placed_width) <= 2
+    print("✅ Chart resolution scales with its placed size")
+
+
+def test_chart_dpi_override():
+    charter = DemographicCharts(team_config={'team_name_short': 'Jazz'})
+    gender_only = {'demographics': {'gender': MOCK_DATA['demographics']['gender']}}
+    sizes = {'gender_chart': (1.5, 2.5)}
+
+    with mock.patch.object(demographic_charts, 'DEMOGRAPHIC_CHART_DPI', 150):
+        low = charter.render_demographic_charts(gender_only, target_sizes=sizes)
+    with mock.patch.object(demographic_charts, 'DEMOGRAPHIC_CHART_DPI', 300):
+        high = charter.render_demographic_charts(gender_only, target_sizes=sizes)
+
+    assert abs(Image.open(high['gender_chart']).width - 2 * Image.open(low['gender_chart']).width) <= 2
+    print("✅ DEMOGRAPHIC_CHART_DPI sets the charts' resolution")
+
+
+if __name__ == "__main__":
+    test_each_chart_rendered_once_and_closed()
+    test_dpi_follows_placed_width()
+    test_chart_dpi_override()
@@ -137,8 +137,8 @@ def test_basic_fan_wheel():
         output_path = Path('test_outputs/test_fan_wheel_basic.png')
         output_path.parent.mkdir(exist_ok=True)
 
-        result = fan_wheel.create(wheel_data, output_path)
-        print(f"✓ Fan wheel created successfully: {result}")
+        fan_wheel.create(wheel_data, output_path)
+        print(f"✓ Fan wheel created successfully: {output_path}")
         return True
     except Exception as e:
         print(f"✗ Fan wheel creation failed: {e}")
@@ -235,8 +235,8 @@ def test_custom_logo():
         output_path = Path('test_outputs/test_fan_wheel_custom_logo.png')
         output_path.parent.mkdir(exist_ok=True)
 
-        result = fan_wheel.create(wheel_data, output_path, team_logo=custom_logo)
-        print(f"✓ Fan wheel with custom logo created: {result}")
+        fan_wheel.create(wheel_data, output_path, team_logo=custom_logo)
+        print(f"✓ Fan wheel with custom logo created: {output_path}")
         return True
     except Exception as e:
         print(f"✗ Custom logo fan wheel failed: {e}")
@@ -128,7 +128,8 @@ def test_fan_wheel_creation():
 
         # Create visualization
         output_path = Path('test_fan_wheel_fonts.png')
-        result_path = fan_wheel.create(test_data, output_path)
+        fan_wheel.create(test_data, output_path)
+        result_path = output_path
 
         if result_path.exists():
             file_size = result_path.stat().st_size / 1024  # KB